@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Deterministic generator of synthetic EDI 837P/837I files for benchmarks
+
+The same options and seed always produce the same file, so timings from different
+runs and branches are measured on identical input.
+"""
+
+import argparse
+import random
+from dataclasses import dataclass
+from decimal import Decimal
+
+VERSIONS = {
+    'P': '005010X222A1',
+    'I': '005010X223A2',
+}
+
+FIRST_NAMES = ['JOHN', 'MARY', 'ALICE', 'ROBERT', 'LINDA', 'JAMES', 'PATRICIA', 'DAVID', 'SUSAN', 'MARIA']
+LAST_NAMES = ['SMITH', 'JOHNSON', 'WILLIAMS', 'BROWN', 'JONES', 'GARCIA', 'MILLER', 'DAVIS', 'LOPEZ', 'WILSON']
+CITIES = [('SPRINGFIELD', 'IL', '62701'), ('PEORIA', 'IL', '61602'), ('CHICAGO', 'IL', '60601'),
+          ('MADISON', 'WI', '53703'), ('COLUMBUS', 'OH', '43215'), ('AUSTIN', 'TX', '78701')]
+PAYERS = [('ACME INSURANCE', 'PAYER01'), ('MEDICARE', 'PAYER02'), ('BLUE PLAN', 'PAYER03'),
+          ('STATE MEDICAID', 'PAYER04'), ('UNITED HEALTH', 'PAYER05')]
+ICD10_CODES = ['E119', 'I10', 'M545', 'J069', 'R0789', 'Z0000', 'K219', 'F419', 'N390', 'E785', 'J449', 'M1990']
+PROCEDURE_CODES = ['99213', '99214', '80053', '85025', '93000', '96372', '36415', '71046', '97110', '90471']
+REVENUE_CODES = ['0250', '0300', '0301', '0450', '0636', '0730', '0320', '0942']
+PLACES_OF_SERVICE = ['11', '21', '22', '23']
+ADJUSTMENT_REASONS = ['45', '1', '2', '3', '96', '253']
+TAXONOMY_CODES = ['207Q00000X', '207R00000X', '282N00000X', '261QM1300X']
+
+
+@dataclass
+class GeneratorOptions:
+    """Shape of a generated file; counts below the billing provider are per parent loop"""
+    kind: str = 'P'
+    billing_providers: int = 1
+    subscribers: int = 10
+    claims: int = 2
+    service_lines: int = 3
+    secondary_payers: int = 0
+    hi_codes: int = 4
+    dependent_ratio: float = 0.3
+    seed: int = 837
+
+
+@dataclass
+class GeneratedFile:
+    content: str
+    segments: int
+    claims: int
+    service_lines: int
+
+
+def generate_837(options: GeneratorOptions) -> GeneratedFile:
+    """Build one interchange holding a single 837 transaction set"""
+    if options.kind not in VERSIONS:
+        raise ValueError(f"Unknown 837 kind {options.kind!r}, expected one of {sorted(VERSIONS)}")
+
+    rng = random.Random(options.seed)
+    version = VERSIONS[options.kind]
+    body = [
+        f'ST*837*0001*{version}',
+        'BHT*0019*00*BATCH0001*20240101*1200*CH',
+        'NM1*41*2*SYNTHETIC SUBMITTER*****46*SUBMIT01',
+        'PER*IC*EDI DESK*TE*5550100000*FX*5550100001',
+        'NM1*40*2*SYNTHETIC RECEIVER*****46*RECEIVE01',
+    ]
+
+    hl_id = 0
+    claim_count = 0
+    line_count = 0
+    for provider_number in range(options.billing_providers):
+        hl_id += 1
+        provider_hl = hl_id
+        city, state, zipcode = rng.choice(CITIES)
+        body += [
+            f'HL*{provider_hl}**20*1',
+            f'PRV*BI*PXC*{rng.choice(TAXONOMY_CODES)}',
+            f'NM1*85*2*PROVIDER GROUP {provider_number + 1}*****XX*{1000000000 + provider_number}',
+            f'N3*{100 + provider_number} MAIN ST',
+            f'N4*{city}*{state}*{zipcode}',
+            f'REF*EI*{900000000 + provider_number}',
+            'PER*IC*BILLING OFFICE*TE*5550200000*FX*5550200001',
+        ]
+
+        for subscriber_number in range(options.subscribers):
+            hl_id += 1
+            subscriber_hl = hl_id
+            has_dependent = rng.random() < options.dependent_ratio
+            member_id = f'MEM{provider_number:03d}{subscriber_number:06d}'
+            payer_name, payer_id = rng.choice(PAYERS)
+            body += [
+                f'HL*{subscriber_hl}*{provider_hl}*22*{1 if has_dependent else 0}',
+                f'SBR*P*{"" if has_dependent else "18"}*GRP{rng.randint(100, 999)}**CI****CI',
+            ]
+            body += _person(rng, 'IL', member_id)
+            body.append(f'NM1*PR*2*{payer_name}*****PI*{payer_id}')
+
+            if has_dependent:
+                hl_id += 1
+                body += [f'HL*{hl_id}*{subscriber_hl}*23*0', 'PAT*19']
+                body += _person(rng, 'QC', None)
+
+            for _ in range(options.claims):
+                claim_count += 1
+                claim_id = f'CLM{claim_count:09d}'
+                claim_segments, lines = _claim(rng, options, claim_id)
+                body += claim_segments
+                line_count += lines
+
+    segment_count = len(body) + 1
+    body.append(f'SE*{segment_count}*0001')
+
+    isa = (
+        'ISA*00*          *00*          *ZZ*SUBMITTERID    *ZZ*RECEIVERID     '
+        '*240101*1200*^*00501*000000001*0*P*:'
+    )
+    segments = [isa, f'GS*HC*SUBMITTER*RECEIVER*20240101*1200*1*X*{version}'] + body + ['GE*1*1', 'IEA*1*000000001']
+    return GeneratedFile('~\n'.join(segments) + '~\n', len(segments), claim_count, line_count)
+
+
+def _person(rng, entity_code, member_id):
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    city, state, zipcode = rng.choice(CITIES)
+    name = f'NM1*{entity_code}*1*{last_name}*{first_name}'
+    if member_id:
+        name += f'****MI*{member_id}'
+    birth_date = f'{rng.randint(1940, 2015)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}'
+    return [
+        name,
+        f'N3*{rng.randint(1, 9999)} ELM ST',
+        f'N4*{city}*{state}*{zipcode}',
+        f'DMG*D8*{birth_date}*{rng.choice("MF")}',
+    ]
+
+
+def _claim(rng, options, claim_id):
+    institutional = options.kind == 'I'
+    month = rng.randint(1, 12)
+    day = rng.randint(1, 20)
+    service_date = f'2024{month:02d}{day:02d}'
+
+    lines = []
+    charges = []
+    for line_number in range(1, options.service_lines + 1):
+        charge = Decimal(rng.randint(1000, 50000)) / 100
+        units = rng.randint(1, 4)
+        charges.append(charge)
+        procedure = rng.choice(PROCEDURE_CODES)
+        if institutional:
+            service = f'SV2*{rng.choice(REVENUE_CODES)}*HC:{procedure}*{charge}*UN*{units}'
+        else:
+            pointers = ':'.join(str(p) for p in range(1, min(options.hi_codes, 4) + 1)) or '1'
+            service = f'SV1*HC:{procedure}*{charge}*UN*{units}***{pointers}'
+        lines += [f'LX*{line_number}', service, f'DTP*472*D8*2024{month:02d}{day + line_number % 5:02d}']
+
+    total = sum(charges, Decimal('0'))
+    place_of_service = rng.choice(PLACES_OF_SERVICE)
+    facility_qualifier = 'A' if institutional else 'B'
+    segments = [f'CLM*{claim_id}*{total}***{place_of_service}:{facility_qualifier}:1*Y*A*Y*Y']
+    if institutional:
+        segments.append(f'DTP*434*RD8*{service_date}-2024{month:02d}{day + 3:02d}')
+    segments.append(f'REF*D9*CLR{claim_id[3:]}')
+
+    codes = rng.sample(ICD10_CODES, min(options.hi_codes, len(ICD10_CODES)))
+    if codes:
+        segments.append('HI*' + '*'.join(
+            f'{"ABK" if position == 0 else "ABF"}:{code}' for position, code in enumerate(codes)
+        ))
+
+    if institutional:
+        segments += [f'NM1*71*1*{rng.choice(LAST_NAMES)}*{rng.choice(FIRST_NAMES)}****XX*{rng.randint(1000000000, 1999999999)}',
+                     f'PRV*AT*PXC*{rng.choice(TAXONOMY_CODES)}']
+    else:
+        segments += [f'NM1*82*1*{rng.choice(LAST_NAMES)}*{rng.choice(FIRST_NAMES)}****XX*{rng.randint(1000000000, 1999999999)}',
+                     f'PRV*PE*PXC*{rng.choice(TAXONOMY_CODES)}']
+
+    city, state, zipcode = rng.choice(CITIES)
+    segments += [
+        f'NM1*77*2*FACILITY {rng.randint(1, 50)}*****XX*{rng.randint(2000000000, 2999999999)}',
+        f'N3*{rng.randint(1, 999)} OAK ST',
+        f'N4*{city}*{state}*{zipcode}',
+    ]
+
+    for _ in range(options.secondary_payers):
+        adjustment = (total * Decimal(rng.randint(5, 40)) / 100).quantize(Decimal('0.01'))
+        payer_name, payer_id = rng.choice(PAYERS)
+        segments += [
+            f'SBR*S*18*GRP{rng.randint(100, 999)}**CI****CI',
+            f'CAS*CO*{rng.choice(ADJUSTMENT_REASONS)}*{adjustment}',
+            f'AMT*D*{total - adjustment}',
+            f'NM1*IL*1*{rng.choice(LAST_NAMES)}*{rng.choice(FIRST_NAMES)}****MI*OTH{rng.randint(100000, 999999)}',
+            f'NM1*PR*2*{payer_name}*****PI*{payer_id}',
+        ]
+
+    return segments + lines, options.service_lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('output', help='path of the 837 file to write')
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    generated = generate_837(options_from_arguments(args))
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(generated.content)
+    print(f"✅ {args.output} written with {generated.claims} claims, "
+          f"{generated.service_lines} service lines and {generated.segments} segments")
+
+
+def add_generator_arguments(parser, kind='P'):
+    parser.add_argument('--kind', choices=sorted(VERSIONS), default=kind, help='837P professional or 837I institutional')
+    parser.add_argument('--billing-providers', type=int, default=1)
+    parser.add_argument('--subscribers', type=int, default=10, help='subscribers per billing provider')
+    parser.add_argument('--claims', type=int, default=2, help='claims per subscriber')
+    parser.add_argument('--service-lines', type=int, default=3, help='service lines per claim')
+    parser.add_argument('--secondary-payers', type=int, default=0, help='SBR/CAS/AMT other payer loops per claim')
+    parser.add_argument('--hi-codes', type=int, default=4, help='diagnosis codes in each HI segment')
+    parser.add_argument('--dependent-ratio', type=float, default=0.3,
+                        help='share of subscribers with a separate patient (HL 23) loop')
+    parser.add_argument('--seed', type=int, default=837)
+
+
+def options_from_arguments(args):
+    return GeneratorOptions(
+        kind=args.kind,
+        billing_providers=args.billing_providers,
+        subscribers=args.subscribers,
+        claims=args.claims,
+        service_lines=args.service_lines,
+        secondary_payers=args.secondary_payers,
+        hi_codes=args.hi_codes,
+        dependent_ratio=args.dependent_ratio,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark both EDI 837 parser stacks on a synthetic or given file
+
+Each stack runs in a fresh process so its peak RSS is measured on its own. Stage
+timings are the best of --repeat runs; nothing is downloaded, the input is either
+generated locally or passed with --file.
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import warnings
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIRECTORY))
+sys.path.insert(0, BENCHMARK_DIRECTORY)
+
+from generate_837 import add_generator_arguments, generate_837, options_from_arguments
+from edi_837_parser.mapped_reader import iter_mapped_segments
+
+STACKS = ('business', 'package')
+
+
+def timed(repeat, function, *args):
+    """Return (best seconds, result of the last call)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def count_segments(segments):
+    return sum(1 for _ in segments)
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where the resource module is missing"""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes everywhere else
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def benchmark_business(file_path, repeat, stages, result):
+    # the script reports progress and segment errors on stdout, keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        import extract_edi_837_business_format as business
+
+        parser = business.EDI837BusinessParser()
+        stages['tokenize'], _ = timed(repeat, lambda: count_segments(parser.read_segments(file_path)))
+        stages['parse_edi_file'], edi_data = timed(repeat, parser.parse_edi_file, file_path)
+        stages['convert_to_business_format'], _ = timed(repeat, parser.convert_to_business_format, edi_data)
+
+        if result.get('handler_profile') is not None:
+            # a separate parse, so the timer calls do not inflate the stage timings above
+            profile = parser.profile_handlers()
+            parser.parse_edi_file(file_path)
+            result['handler_profile'] = profile.report()
+
+
+def benchmark_package(file_path, repeat, stages, result):
+    from edi_837_parser.transaction_set.transaction_set import TransactionSet
+    from edi_837_parser.transaction_set.transaction_sets import TransactionSets
+
+    stages['tokenize'], _ = timed(repeat, lambda: count_segments(iter_mapped_segments(file_path)))
+    stages['TransactionSet.build'], transaction_set = timed(repeat, TransactionSet.build, file_path)
+    stages['TransactionSets.to_dataframe'], _ = timed(repeat, TransactionSets([transaction_set]).to_dataframe)
+
+
+def run_stack(stack, file_path, repeat, profile_handlers=False):
+    """Time one stack's stages in the current process; a failing stage ends the stack's run"""
+    # unhandled identifier warnings would flood the report, they are still raised and filtered
+    warnings.simplefilter('ignore')
+    benchmark = benchmark_business if stack == 'business' else benchmark_package
+    result = {'stack': stack, 'stages': {}, 'error': None}
+    if profile_handlers:
+        result['handler_profile'] = []
+    try:
+        benchmark(file_path, repeat, result['stages'], result)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['peak_rss_bytes'] = peak_rss_bytes()
+    return result
+
+
+def run_isolated(stack, file_path, repeat, profile_handlers=False):
+    # spawn rather than fork so the child does not inherit the parent's memory
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_stack, stack, file_path, repeat, profile_handlers).result()
+
+
+def describe_file(file_path):
+    segments = 0
+    claims = 0
+    for segment in iter_mapped_segments(file_path):
+        segments += 1
+        if segment[0] == 'CLM':
+            claims += 1
+    return {'path': file_path, 'bytes': os.path.getsize(file_path), 'segments': segments, 'claims': claims}
+
+
+def print_report(file_info, results):
+    print(f"\n📄 {file_info['path']}: {file_info['bytes'] / 1e6:.1f} MB, "
+          f"{file_info['segments']:,} segments, {file_info['claims']:,} claims")
+    print(f"\n{'stack':<10} {'stage':<30} {'seconds':>9} {'segments/s':>13} {'claims/s':>11}")
+    for result in results:
+        for stage, seconds in result['stages'].items():
+            segments_per_second = file_info['segments'] / seconds if seconds else 0
+            claims_per_second = file_info['claims'] / seconds if seconds else 0
+            print(f"{result['stack']:<10} {stage:<30} {seconds:>9.3f} {segments_per_second:>13,.0f} {claims_per_second:>11,.0f}")
+        if result['error']:
+            print(f"{result['stack']:<10} ❌ stopped after {len(result['stages'])} stages: {result['error']}")
+
+    print()
+    for result in results:
+        peak = result['peak_rss_bytes']
+        peak = f"{peak / 2 ** 20:.1f} MB" if peak is not None else 'not available on this platform'
+        print(f"{result['stack']:<10} peak RSS {peak}")
+
+    for result in results:
+        if result.get('handler_profile'):
+            print(f"\n{result['stack']} parse_edi_file handlers:")
+            for line in result['handler_profile']:
+                print(f"  {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--file', help='benchmark an existing 837 file instead of generating one')
+    parser.add_argument('--stack', choices=STACKS + ('both',), default='both')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per stage, the best is reported')
+    parser.add_argument('--json', help='also write the results to this JSON file')
+    parser.add_argument('--keep', help='save the generated file to this path')
+    parser.add_argument('--profile-handlers', action='store_true',
+                        help='also report the time spent per segment handler of parse_edi_file')
+    # the package stack reads SV2 service lines only, so an 837I is the file both stacks can run
+    add_generator_arguments(parser, kind='I')
+    args = parser.parse_args()
+
+    stacks = STACKS if args.stack == 'both' else (args.stack,)
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = args.file
+        if not file_path:
+            options = options_from_arguments(args)
+            file_path = args.keep or os.path.join(directory, f'synthetic_837{options.kind}.txt')
+            start = time.perf_counter()
+            generated = generate_837(options)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(generated.content)
+            print(f"Generated 837{options.kind} in {time.perf_counter() - start:.2f}s")
+
+        file_info = describe_file(file_path)
+        results = [run_isolated(stack, file_path, args.repeat, args.profile_handlers) for stack in stacks]
+
+    print_report(file_info, results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'file': file_info, 'repeat': args.repeat, 'results': results}, f, indent=2)
+        print(f"✅ Results saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,3 +24,62 @@ MAX_FILES = 1000
 
 # File extensions to look for
 EDI_FILE_EXTENSIONS = ('.d', '.edi', '.txt', '.x12')
+
+# Number of worker processes used to parse and convert EDI files
+# (1 processes files one at a time, None uses one process per CPU core)
+WORKERS = 1
+
+# Format of the claims, claim detail and company setup outputs: 'csv' or 'parquet'
+# (parquet requires pyarrow: pip install pyarrow)
+OUTPUT_FORMAT = 'csv'
+
+# Read, parse and write files as an asyncio pipeline: files are read in threads, parsed in
+# WORKERS processes and written as they come back, all at the same time, so reads from slow
+# (e.g. NFS mounted) storage overlap with parsing. PIPELINE_QUEUE_SIZE files at most wait
+# between two stages, which keeps memory flat
+ASYNC_PIPELINE = False
+PIPELINE_QUEUE_SIZE = 4
+
+# Format of the business format claims: 'json' writes edi_837_business_format.json as one
+# array once every file is processed, 'ndjson' writes edi_837_business_format.ndjson with
+# one claim per line as each file's claims are converted
+BUSINESS_FORMAT_OUTPUT = 'json'
+
+# Compression of the NDJSON output: None, 'gzip' (.ndjson.gz) or 'zstd' (.ndjson.zst,
+# requires zstandard: pip install zstandard)
+NDJSON_COMPRESSION = None
+
+# Write the business format JSON without indentation or spaces after separators
+COMPACT_JSON = False
+
+# Rows buffered per Parquet row group
+PARQUET_ROW_GROUP_SIZE = 50000
+
+# Directory of the processing manifest. Files whose path, size, mtime and content hash
+# are unchanged reuse the claims cached there instead of being parsed again. The cache
+# holds converted claims, patient data included, so it is off by default: set a directory
+# with access restricted like the EDI files', e.g. MANIFEST_DIRECTORY = '.edi_837_manifest'
+# (None parses every file on every run)
+MANIFEST_DIRECTORY = None
+
+# Watch mode (python watch_edi_837.py): EDI_DIRECTORY is watched and each file is converted
+# once it is completely written. Claims are appended to CSV and NDJSON outputs in
+# WATCH_OUTPUT_DIRECTORY that roll over every WATCH_ROLL_FORMAT period (strftime format)
+WATCH_OUTPUT_DIRECTORY = 'edi_837_watch_output'
+
+# 'inotify', 'poll' or 'auto' (inotify where available); poll directories on network mounts
+WATCH_METHOD = 'auto'
+WATCH_POLL_SECONDS = 5
+
+# Seconds a scanned file's size and mtime must stay unchanged before it is converted
+WATCH_SETTLE_SECONDS = 2
+WATCH_ROLL_FORMAT = '%Y%m%d'
+
+# Parse service (python parse_service.py): POST raw X12 to http://HOST:PORT/parse for its
+# business format claims. PARSE_SERVICE_WORKERS processes parse (None is one per CPU core),
+# requests beyond PARSE_SERVICE_MAX_CONCURRENT are answered 503 and larger bodies 413
+PARSE_SERVICE_HOST = '127.0.0.1'
+PARSE_SERVICE_PORT = 8837
+PARSE_SERVICE_WORKERS = None
+PARSE_SERVICE_MAX_CONCURRENT = 8
+PARSE_SERVICE_MAX_BODY_BYTES = 50 * 1024 * 1024
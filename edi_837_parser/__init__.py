@@ -1,36 +1,69 @@
 import os
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, List, Optional, Tuple
 from warnings import warn
 
+from edi_837_parser.claim_index import ClaimIndex, get_claim
 from edi_837_parser.transaction_set.transaction_set import TransactionSet
 from edi_837_parser.transaction_set.transaction_sets import TransactionSets
 
 
-def parse(path: str, debug: bool = False) -> TransactionSets:
+def parse(path: str, debug: bool = False, workers: Optional[int] = 1, lazy: bool = False) -> TransactionSets:
+	"""build the transaction sets for a file or a directory of files
+
+	With workers other than 1 the files of a directory are built in a process pool
+	(None uses one process per CPU core); the result keeps the directory order either way.
+	With lazy, element values are only parsed when they are first read.
+	"""
 	if path[0] == '~':
 		path = os.path.expanduser(path)
 
 	transaction_sets = []
 	if os.path.isdir(path):
 		files = _find_edi_837_files(path)
-		for file in files:
-			file_path = f'{path}/{file}'
-			if debug:
-				transaction_set = TransactionSet.build(file_path)
-				transaction_sets.append(transaction_set)
-			else:
-				try:
-					transaction_set = TransactionSet.build(file_path)
-					transaction_sets.append(transaction_set)
-				except Exception as e:
-					warn(f'Failed to build a transaction set from {file_path} with error: {e}')
+		file_paths = [f'{path}/{file}' for file in files]
+		build = partial(_build_transaction_set, debug=debug, lazy=lazy)
+
+		if workers == 1 or len(file_paths) <= 1:
+			results = map(build, file_paths)
+			transaction_sets = _collect_transaction_sets(file_paths, results)
+		else:
+			with ProcessPoolExecutor(max_workers=workers) as executor:
+				results = executor.map(build, file_paths)
+				transaction_sets = _collect_transaction_sets(file_paths, results)
 	else:
-		transaction_set = TransactionSet.build(path)
+		transaction_set = TransactionSet.build(path, lazy)
 		transaction_sets.append(transaction_set)
 
 	return TransactionSets(transaction_sets)
 
 
+def _build_transaction_set(
+		file_path: str,
+		debug: bool = False,
+		lazy: bool = False,
+) -> Tuple[Optional[TransactionSet], Optional[Exception]]:
+	if debug:
+		return TransactionSet.build(file_path, lazy), None
+
+	try:
+		return TransactionSet.build(file_path, lazy), None
+	except Exception as e:
+		return None, e
+
+
+def _collect_transaction_sets(file_paths: List[str], results: Iterable) -> List[TransactionSet]:
+	transaction_sets = []
+	for file_path, (transaction_set, error) in zip(file_paths, results):
+		if error is None:
+			transaction_sets.append(transaction_set)
+		else:
+			warn(f'Failed to build a transaction set from {file_path} with error: {error}')
+
+	return transaction_sets
+
+
 def _find_edi_837_files(path: str) -> List[str]:
 	files = []
 	for file in os.listdir(path):
@@ -0,0 +1,286 @@
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+from warnings import warn
+
+from edi_837_parser.diagnostics import Diagnostics
+from edi_837_parser.loops.claim import Claim as ClaimLoop
+from edi_837_parser.transaction_set.transaction_set import TransactionSet
+from edi_837_parser.tokenizer import CHUNK_SIZE, HEADER_SEARCH_LIMIT, Delimiters, read_delimiters, tokenize
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.idx'
+
+# segments whose offsets are recorded; SE, GE and IEA only close the region before them
+BOUNDARY_IDENTIFIERS = {b'ISA', b'GS', b'ST', b'HL', b'CLM', b'SE', b'GE', b'IEA'}
+
+
+class ClaimIndex:
+	"""byte offsets of the ISA/GS/ST/HL/CLM boundaries of an 837 file
+
+	Every indexed segment is stored with the offset of the next boundary, so the region
+	it opens can be read back with one seek. Transactions are [offset, header end, SE
+	offset, SE end], hierarchies are [offset, end, transaction, parent hierarchy, level]
+	and claims are [offset, end, hierarchy, claim id], with positions into those lists.
+	"""
+
+	def __init__(
+			self,
+			file_path: str,
+			size: int,
+			mtime_ns: int,
+			delimiters: Delimiters,
+			interchanges: List[int] = None,
+			groups: List[int] = None,
+			transactions: List[list] = None,
+			hierarchies: List[list] = None,
+			claims: List[list] = None,
+	):
+		self.file_path = file_path
+		self.size = size
+		self.mtime_ns = mtime_ns
+		self.delimiters = delimiters
+		self.interchanges = interchanges if interchanges else []
+		self.groups = groups if groups else []
+		self.transactions = transactions if transactions else []
+		self.hierarchies = hierarchies if hierarchies else []
+		self.claims = claims if claims else []
+		self._claim_positions = None
+
+	def __repr__(self):
+		return f'ClaimIndex({self.file_path!r}, claims={len(self.claims)})'
+
+	@classmethod
+	def build(cls, file_path: str) -> 'ClaimIndex':
+		"""scan the file once, recording boundary offsets without parsing any loops"""
+		stat = os.stat(file_path)
+		with open(file_path, 'rb') as f:
+			# latin-1 maps bytes to characters one to one, keeping offsets in bytes
+			delimiters = read_delimiters(f.read(HEADER_SEARCH_LIMIT).decode('latin-1'))
+			if delimiters is None:
+				raise ValueError(f'No ISA header found in {file_path}')
+
+			index = ClaimIndex(file_path, stat.st_size, stat.st_mtime_ns, delimiters)
+			f.seek(0)
+			index._scan(_iter_segment_offsets(f, delimiters.segment.encode('latin-1')))
+
+		return index
+
+	@classmethod
+	def load(cls, file_path: str, index_path: Optional[str] = None) -> Optional['ClaimIndex']:
+		"""read a sidecar index, returning None when it is missing or the file has changed"""
+		index_path = index_path or file_path + INDEX_SUFFIX
+		try:
+			with open(index_path, 'r', encoding='utf-8') as f:
+				data = json.load(f)
+		except (OSError, ValueError):
+			return None
+
+		stat = os.stat(file_path)
+		if (
+				data.get('version') != INDEX_VERSION
+				or data['size'] != stat.st_size
+				or data['mtime_ns'] != stat.st_mtime_ns
+		):
+			return None
+
+		return ClaimIndex(
+			file_path,
+			data['size'],
+			data['mtime_ns'],
+			Delimiters(*data['delimiters']),
+			data['interchanges'],
+			data['groups'],
+			data['transactions'],
+			data['hierarchies'],
+			data['claims'],
+		)
+
+	@classmethod
+	def open(cls, file_path: str, index_path: Optional[str] = None) -> 'ClaimIndex':
+		"""load the sidecar index, building and saving it first when it is missing or stale"""
+		index = cls.load(file_path, index_path)
+		if index is None:
+			index = cls.build(file_path)
+			index.save(index_path)
+
+		return index
+
+	def save(self, index_path: Optional[str] = None) -> str:
+		index_path = index_path or self.file_path + INDEX_SUFFIX
+		data = {
+			'version': INDEX_VERSION,
+			'size': self.size,
+			'mtime_ns': self.mtime_ns,
+			'delimiters': list(self.delimiters),
+			'interchanges': self.interchanges,
+			'groups': self.groups,
+			'transactions': self.transactions,
+			'hierarchies': self.hierarchies,
+			'claims': self.claims,
+		}
+
+		temp_path = index_path + '.tmp'
+		with open(temp_path, 'w', encoding='utf-8') as f:
+			json.dump(data, f, separators=(',', ':'))
+		os.replace(temp_path, index_path)
+
+		return index_path
+
+	def find(self, claim_id: str) -> List[int]:
+		"""positions in claims of every claim with the CLM01 claim submitter identifier"""
+		if self._claim_positions is None:
+			self._claim_positions = {}
+			for position, claim in enumerate(self.claims):
+				self._claim_positions.setdefault(claim[3], []).append(position)
+
+		return self._claim_positions.get(claim_id, [])
+
+	def get_claim(self, claim_id: str, diagnostics: Diagnostics = None) -> Optional[ClaimLoop]:
+		"""parse the first claim with the claim id, or None when the file has no such claim"""
+		positions = self.find(claim_id)
+		if not positions:
+			return None
+
+		return self.read_claim(positions[0], diagnostics)
+
+	def read_claim(self, position: int, diagnostics: Diagnostics = None) -> ClaimLoop:
+		"""parse one claim from its transaction header, enclosing HL loops and its own segments
+
+		Sibling subscribers and claims are never read, so the cost does not depend on the
+		size of the file. Skipped segments are counted into diagnostics when given,
+		otherwise summarized in one warning.
+		"""
+		offset, end, hierarchy, claim_id = self.claims[position]
+
+		chain = []
+		while hierarchy is not None:
+			chain.append(self.hierarchies[hierarchy])
+			hierarchy = self.hierarchies[hierarchy][3]
+		chain.reverse()
+
+		transaction = self.transactions[chain[0][2]] if chain else self._enclosing_transaction(offset)
+		regions = [(transaction[0], transaction[1])]
+		regions.extend((hl[0], hl[1]) for hl in chain)
+		regions.append((offset, end))
+		# every loop terminates at SE, so the transaction trailer closes the claim loop
+		regions.append((transaction[2], transaction[3]))
+
+		with open(self.file_path, 'rb') as f:
+			content = self.delimiters.segment.join(_read_regions(f, regions))
+
+		collector = diagnostics if diagnostics is not None else Diagnostics(self.file_path)
+		segments = tokenize(content, self.delimiters)
+		for key, value in TransactionSet.iter_loops(segments, diagnostics=collector, component=self.delimiters.component):
+			if key == 'claim' and value.claim.marker == claim_id:
+				if diagnostics is None and collector.unhandled:
+					warn(collector.summary())
+				return value
+
+		raise ValueError(f'Claim {claim_id} not found at offset {offset} of {self.file_path}')
+
+	def _enclosing_transaction(self, offset: int) -> list:
+		enclosing = self.transactions[0]
+		for transaction in self.transactions:
+			if transaction[0] > offset:
+				break
+			enclosing = transaction
+
+		return enclosing
+
+	def _scan(self, segments: Iterator[Tuple[int, bytes]]) -> None:
+		element = self.delimiters.element.encode('latin-1')
+		# entries waiting for the offset of the next boundary to be their end
+		open_entries = []
+		hierarchy_positions: Dict[bytes, int] = {}
+		current_hierarchy = None
+		transaction = None
+
+		for offset, segment in segments:
+			identifier = segment.split(element, 1)[0]
+			if identifier not in BOUNDARY_IDENTIFIERS:
+				continue
+
+			for entry, end_position in open_entries:
+				entry[end_position] = offset
+			open_entries = []
+
+			if identifier == b'CLM':
+				elements = segment.split(element, 2)
+				claim = [offset, None, current_hierarchy, elements[1].decode() if len(elements) > 1 else '']
+				self.claims.append(claim)
+				open_entries.append((claim, 1))
+
+			elif identifier == b'HL':
+				elements = segment.split(element)
+				elements += [b''] * (4 - len(elements))
+				hierarchy = [offset, None, transaction, hierarchy_positions.get(elements[2]), elements[3].decode()]
+				hierarchy_positions[elements[1]] = current_hierarchy = len(self.hierarchies)
+				self.hierarchies.append(hierarchy)
+				open_entries.append((hierarchy, 1))
+
+			elif identifier == b'ST':
+				# HL ids are only unique within a transaction set
+				hierarchy_positions = {}
+				current_hierarchy = None
+				transaction = len(self.transactions)
+				self.transactions.append([offset, None, None, None])
+				open_entries.append((self.transactions[-1], 1))
+
+			elif identifier == b'SE':
+				if self.transactions:
+					self.transactions[-1][2] = offset
+					open_entries.append((self.transactions[-1], 3))
+
+			elif identifier == b'GS':
+				self.groups.append(offset)
+
+			elif identifier == b'ISA':
+				self.interchanges.append(offset)
+
+		for entry, end_position in open_entries:
+			entry[end_position] = self.size
+
+		for transaction in self.transactions:
+			if transaction[1] is None:
+				transaction[1] = self.size
+			if transaction[2] is None:
+				transaction[2] = transaction[3] = self.size
+
+
+def get_claim(path: str, claim_id: str, index_path: Optional[str] = None) -> Optional[ClaimLoop]:
+	"""look up one claim by CLM01 through the file's sidecar index, building the index if needed"""
+	if path[0] == '~':
+		path = os.path.expanduser(path)
+
+	return ClaimIndex.open(path, index_path).get_claim(claim_id)
+
+
+def _iter_segment_offsets(file, terminator: bytes, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[int, bytes]]:
+	"""yield (offset, segment) for the stripped segments of a binary file read in chunks"""
+	offset = 0
+	buffer = b''
+	while True:
+		chunk = file.read(chunk_size)
+		if chunk:
+			# the last piece may be a partial segment, carry it into the next chunk
+			*segments, buffer = (buffer + chunk).split(terminator)
+		else:
+			segments, buffer = [buffer], b''
+
+		for segment in segments:
+			stripped = segment.lstrip()
+			if stripped:
+				# whitespace after a terminator belongs to the segment that follows it
+				yield offset + len(segment) - len(stripped), stripped.rstrip()
+			offset += len(segment) + len(terminator)
+
+		if not chunk:
+			break
+
+
+def _read_regions(file, regions: List[Tuple[int, int]]) -> Iterator[str]:
+	for start, end in regions:
+		if start < end:
+			file.seek(start)
+			yield file.read(end - start).decode()
@@ -0,0 +1,63 @@
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+from typing import Tuple, Union
+
+# distinct dates kept per function; a file repeats a few hundred service and birth dates
+DATE_CACHE_SIZE = 4096
+
+# an RD8 period, CCYYMMDD-CCYYMMDD
+DateRange = namedtuple('DateRange', 'start end')
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(value: str) -> Union[datetime, DateRange, str]:
+	"""a D8 date or RD8 range as datetimes, anything else is returned unchanged
+
+	Ten character values are read as YYMMDDHHMM.
+	"""
+	if len(value) == 8:
+		return datetime(int(value[:4]), int(value[4:6]), int(value[6:]))
+
+	elif len(value) == 17 and value[8] == '-':
+		return DateRange(parse_date(value[:8]), parse_date(value[9:]))
+
+	elif len(value) == 10:
+		year, month, day, hour, minute = [int(value[i:i + 2]) for i in range(0, len(value), 2)]
+		return datetime(2000 + year, month, day, hour, minute)
+
+	return value
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def iso_date_range(value: str) -> Tuple[str, str]:
+	"""(from, to) as YYYY-MM-DD for a D8 date or RD8 range, a D8 date being both; ('', '') otherwise"""
+	if value and len(value) == 8:
+		date = f'{value[:4]}-{value[4:6]}-{value[6:8]}'
+		return date, date
+
+	elif value and len(value) == 17 and value[8] == '-':
+		return iso_date_range(value[:8])[0], iso_date_range(value[9:])[0]
+
+	return '', ''
+
+
+def iso_date(value: str) -> str:
+	"""YYYY-MM-DD for a D8 date, the start of an RD8 range, or ''"""
+	return iso_date_range(value)[0]
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def us_date(value: str) -> str:
+	"""MM/DD/YYYY for a D8 date, anything else is returned unchanged"""
+	if not value or len(value) != 8:
+		return value
+
+	return f'{value[4:6]}/{value[6:8]}/{value[:4]}'
+
+
+def clear_date_caches() -> None:
+	"""drop the memoized dates, e.g. between runs of a long lived process"""
+	parse_date.cache_clear()
+	iso_date_range.cache_clear()
+	us_date.cache_clear()
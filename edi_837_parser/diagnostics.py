@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from typing import ContextManager, Dict, Iterator, List, Optional, Tuple
+
+
+class Diagnostics:
+	"""counts of the segments the loop builders did not handle, per loop and identifier
+
+	Recording is one dict update, the messages are only formatted when a summary is asked
+	for, so files full of K3/PWK/CN1 segments cost no more to parse than any other.
+	"""
+
+	def __init__(self, file_path: Optional[str] = None):
+		self.file_path = file_path
+		# (loop, identifier) -> segments skipped
+		self.unhandled: Dict[Tuple[str, str], int] = {}
+
+	def __repr__(self):
+		return f'Diagnostics({self.file_path!r}, unhandled={self.total()})'
+
+	def record_unhandled(self, loop: str, identifier: str) -> None:
+		key = (loop, identifier)
+		self.unhandled[key] = self.unhandled.get(key, 0) + 1
+
+	def merge(self, other: 'Diagnostics') -> 'Diagnostics':
+		"""add the counts of another collector to this one"""
+		for key, count in other.unhandled.items():
+			self.unhandled[key] = self.unhandled.get(key, 0) + count
+
+		return self
+
+	def total(self) -> int:
+		return sum(self.unhandled.values())
+
+	def summary(self, limit: int = 10) -> str:
+		"""one line naming the most skipped identifiers and the loops they were skipped in"""
+		counts = sorted(self.unhandled.items(), key=lambda item: (-item[1], item[0]))
+		details = ', '.join(f'{identifier} in {loop} loop x{count}' for (loop, identifier), count in counts[:limit])
+		if len(counts) > limit:
+			details += f', {len(counts) - limit} more'
+
+		source = f' in {self.file_path}' if self.file_path else ''
+		return f'{self.total()} segments not handled{source}: {details}'
+
+
+# collector of the file being built, loops report to whichever is active
+_active = Diagnostics()
+
+
+def record_unhandled(loop: str, identifier: str) -> None:
+	"""count a segment a loop builder skipped"""
+	_active.record_unhandled(loop, identifier)
+
+
+def current_diagnostics() -> Diagnostics:
+	"""the active collector, outside collect_diagnostics it holds everything parsed by this process"""
+	return _active
+
+
+@contextmanager
+def collecting(diagnostics: Diagnostics) -> Iterator[Diagnostics]:
+	"""make the collector the active one, e.g. while one loop of a streamed file is built"""
+	global _active
+	previous = _active
+	_active = diagnostics
+	try:
+		yield diagnostics
+	finally:
+		_active = previous
+
+
+def collect_diagnostics(file_path: Optional[str] = None) -> ContextManager[Diagnostics]:
+	"""make a fresh collector the active one while a file is built"""
+	return collecting(Diagnostics(file_path))
+
+
+def summarize(diagnostics: List[Diagnostics], limit: int = 10) -> str:
+	"""a report of per file summaries followed by the counts over all of them"""
+	lines = [d.summary(limit) for d in diagnostics if d.unhandled]
+	if len(lines) > 1:
+		total = Diagnostics()
+		for d in diagnostics:
+			total.merge(d)
+		lines.append(f'all files: {total.summary(limit)}')
+
+	return '\n'.join(lines)
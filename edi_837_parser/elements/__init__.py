@@ -1,16 +1,30 @@
 from abc import ABC, abstractmethod
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
 
 
 class Element(ABC):
+	# while True, deferrable elements store assigned values raw and parse them on first access
+	lazy = False
+	# True for elements whose parsed value is never a str other than the raw value itself,
+	# so a str found in the slot can always be parsed (again) safely
+	deferrable = False
 
 	def __set_name__(self, owner, name):
 		self.private_name = '_' + name
 
 	def __get__(self, obj, obj_type=None):
-		return getattr(obj, self.private_name)
+		value = getattr(obj, self.private_name)
+		if type(value) is str and self.deferrable:
+			value = self.parser(value)
+			setattr(obj, self.private_name, value)
+
+		return value
 
 	def __set__(self, obj, value):
-		value = self.parser(value)
+		if not (Element.lazy and self.deferrable):
+			value = self.parser(value)
 		setattr(obj, self.private_name, value)
 
 	@abstractmethod
@@ -18,11 +32,94 @@ class Element(ABC):
 		pass
 
 
-class Code:
-
-	def __init__(self, code: str, description: str):
-		self.code = code
-		self.description = description
+class Code(namedtuple('Code', 'code description')):
+	"""a code and its description; immutable, since a CodeRegistry shares one per code"""
+	__slots__ = ()
 
 	def __str__(self) -> str:
-		return str(self.__dict__)
+		return str(self._asdict())
+
+
+@contextmanager
+def lazy_decoding(enabled: bool = True) -> Iterator[None]:
+	"""store element values raw while segments are built and parse each on its first access
+
+	Fields that are never read are never parsed, so a job reading only claim ids and
+	amounts skips the date and code parsing of every other segment. Parse errors and
+	unknown codes are then reported when a value is first read.
+	"""
+	previous = Element.lazy
+	Element.lazy = enabled
+	try:
+		yield
+	finally:
+		Element.lazy = previous
+
+
+# every code table, so unknown codes can be reported across them
+_registries = []
+# table -> code -> times parsed, for tables that do not have a CodeRegistry
+_unknown_counts = {}
+
+
+def record_unknown_code(table: str, code: str) -> bool:
+	"""count a code missing from a table without a CodeRegistry, True the first time it is seen"""
+	counts = _unknown_counts.setdefault(table, {})
+	count = counts.get(code, 0)
+	counts[code] = count + 1
+	return count == 0
+
+
+def unknown_codes() -> Dict[Tuple[str, str], int]:
+	"""counts of the unknown codes parsed by this process, keyed by (table, code)"""
+	codes = {}
+	for table, counts in _unknown_counts.items():
+		codes.update(((table, code), count) for code, count in counts.items())
+	for registry in _registries:
+		codes.update(((registry.table, code), count) for code, count in registry.unknown.items())
+
+	return codes
+
+
+def reset_unknown_codes() -> None:
+	_unknown_counts.clear()
+	for registry in _registries:
+		registry.unknown.clear()
+
+
+class CodeRegistry:
+	"""a code table indexed once, handing out one shared, immutable Code per code
+
+	Codes missing from the table are counted in unknown instead of being reported on
+	every segment, see unknown_codes.
+	"""
+
+	def __init__(self, table: str, descriptions: Dict[str, str]):
+		self.table = table
+		self.descriptions = descriptions
+		# code -> times parsed, for codes missing from the table
+		self.unknown = {}
+		self._codes = {code: Code(code, description) for code, description in descriptions.items()}
+		self._unknown_codes = {}
+		_registries.append(self)
+
+	def code(self, value: str) -> Code:
+		code = self._codes.get(value)
+		if code is None:
+			self.unknown[value] = self.unknown.get(value, 0) + 1
+			code = self._unknown_codes.get(value)
+			if code is None:
+				code = self._unknown_codes[value] = Code(value, None)
+
+		return code
+
+	def describe(self, value: str) -> str:
+		"""the description of a code, or the code itself when the table does not have it"""
+		description = self.descriptions.get(value)
+		if description is None:
+			# None is an element the segment left out, not a code
+			if value is not None:
+				self.unknown[value] = self.unknown.get(value, 0) + 1
+			return value
+
+		return description
@@ -1,4 +1,4 @@
-from edi_837_parser.elements import Element, Code
+from edi_837_parser.elements import Element, Code, CodeRegistry
 
 # https://x12.org/codes/claim-adjustment-group-codes
 adjustment_group_codes = {
@@ -9,9 +9,11 @@ adjustment_group_codes = {
 	'PI': 'payor initiated reduction',
 }
 
+_registry = CodeRegistry('AdjustmentGroupCode', adjustment_group_codes)
+
 
 class AdjustmentGroupCode(Element):
+	deferrable = True
 
 	def parser(self, value: str) -> Code:
-		description = adjustment_group_codes.get(value, None)
-		return Code(value, description)
+		return _registry.code(value)
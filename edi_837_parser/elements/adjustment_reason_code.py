@@ -1,4 +1,4 @@
-from edi_837_parser.elements import Element, Code
+from edi_837_parser.elements import Element, Code, CodeRegistry
 
 # https://x12.org/codes/claim-adjustment-reason-codes
 adjustment_reason_codes = {
@@ -25,9 +25,11 @@ adjustment_reason_codes = {
 	'272': 'Coverage/program guidelines were not met.',
 }
 
+_registry = CodeRegistry('AdjustmentReasonCode', adjustment_reason_codes)
+
 
 class AdjustmentReasonCode(Element):
+	deferrable = True
 
 	def parser(self, value: str) -> Code:
-		description = adjustment_reason_codes.get(value, None)
-		return Code(value, description)
+		return _registry.code(value)
@@ -1,4 +1,4 @@
-from edi_837_parser.elements import Element
+from edi_837_parser.elements import Element, CodeRegistry
 
 # https://ushik.ahrq.gov/ViewItemDetails?system=mdr&itemKey=133081000
 amount_qualifiers = {
@@ -8,8 +8,10 @@ amount_qualifiers = {
 	'EAF': 'other patient payer liability'
 }
 
+_registry = CodeRegistry('AmountQualifier', amount_qualifiers)
+
 
 class AmountQualifier(Element):
 
 	def parser(self, value: str) -> str:
-		return amount_qualifiers.get(value, value)
+		return _registry.describe(value)
@@ -3,7 +3,7 @@ from enum import Enum, auto
 from warnings import warn
 
 
-from edi_837_parser.elements import Element
+from edi_837_parser.elements import Element, record_unknown_code
 
 
 class PayerClassification(Enum):
@@ -17,7 +17,7 @@ class PayerClassification(Enum):
 		return str(self.name).lower()
 
 
-@dataclass
+@dataclass(frozen=True)
 class Status:
 	"""
 	Attributes:
@@ -43,16 +43,23 @@ _REGISTRY = [
 ]
 
 
+_STATUSES = {status.code: status for status in _REGISTRY}
+# statuses are frozen, so every unknown code shares one
+_UNCATEGORIZED = Status('code', 'uncategorized', PayerClassification.UNKNOWN)
+
+
 def _lookup_status(code: str) -> Status:
-	status = [s for s in _REGISTRY if s.code == code]
-	if len(status) == 0:
-		warn(f'ClaimStatus: Code {code} does not match a status in the edi-835-parser claim status registry.')
-		return Status('code', 'uncategorized', PayerClassification.UNKNOWN)
+	status = _STATUSES.get(code)
+	if status is None:
+		if record_unknown_code('ClaimStatus', code):
+			warn(f'ClaimStatus: Code {code} does not match a status in the edi-835-parser claim status registry.')
+		return _UNCATEGORIZED
 
-	return status[0]
+	return status
 
 
 class ClaimStatus(Element):
+	deferrable = True
 
 	def parser(self, value: str) -> Status:
 		return _lookup_status(value)
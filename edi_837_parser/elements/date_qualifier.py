@@ -1,4 +1,4 @@
-from edi_837_parser.elements import Element
+from edi_837_parser.elements import Element, CodeRegistry
 
 # https://ediacademy.com/blog/x12-date-time-qualifiers/
 date_qualifiers = {
@@ -10,8 +10,10 @@ date_qualifiers = {
 	'233': 'claim statement period end',
 }
 
+_registry = CodeRegistry('DateQualifier', date_qualifiers)
+
 
 class DateQualifier(Element):
 
 	def parser(self, value: str) -> str:
-		return date_qualifiers.get(value, value)
+		return _registry.describe(value)
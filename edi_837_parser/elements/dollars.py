@@ -1,10 +1,12 @@
 from typing import Optional
 
 from edi_837_parser.elements import Element
+from edi_837_parser.money import Money
 
 
 class Dollars(Element):
+	deferrable = True
 
-	def parser(self, value: str) -> Optional[float]:
+	def parser(self, value: str) -> Optional[Money]:
 		if value != '':
-			return float(value)
+			return Money.parse(value)
@@ -1,4 +1,4 @@
-from edi_837_parser.elements import Element
+from edi_837_parser.elements import Element, CodeRegistry
 
 # https://ediacademy.com/blog/x12-n101-entity-identifier-codes/
 entity_codes = {
@@ -8,8 +8,10 @@ entity_codes = {
 	'85': 'billing provider'
 }
 
+_registry = CodeRegistry('EntityCode', entity_codes)
+
 
 class EntityCode(Element):
 
 	def parser(self, value: str) -> str:
-		return entity_codes.get(value, value)
+		return _registry.describe(value)
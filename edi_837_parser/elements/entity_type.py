@@ -1,4 +1,4 @@
-from edi_837_parser.elements import Element
+from edi_837_parser.elements import Element, CodeRegistry
 
 # https://magnacare.com/wp-content/uploads/pdf/MagnacareCompanionGuide_835_5010A1.pdf
 entity_types = {
@@ -6,8 +6,10 @@ entity_types = {
 	'2': 'entity',
 }
 
+_registry = CodeRegistry('EntityType', entity_types)
+
 
 class EntityType(Element):
 
 	def parser(self, value: str) -> str:
-		return entity_types.get(value, value)
+		return _registry.describe(value)
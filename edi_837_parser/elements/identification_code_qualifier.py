@@ -1,4 +1,4 @@
-from edi_837_parser.elements import Element
+from edi_837_parser.elements import Element, CodeRegistry
 
 # https://ushik.ahrq.gov/dr.ui.drValueDomain_View?system=mdr&ValueDomainID=4933000&CallingRoutine=$CallingRoutine$&OrganizationID=3&RecordOffset=11&Referer=ValueDomain
 identification_code_qualifiers = {
@@ -9,8 +9,10 @@ identification_code_qualifiers = {
 
 }
 
+_registry = CodeRegistry('IdentificationCodeQualifier', identification_code_qualifiers)
+
 
 class IdentificationCodeQualifier(Element):
 
 	def parser(self, value: str) -> str:
-		return identification_code_qualifiers.get(value, value)
+		return _registry.describe(value)
@@ -4,6 +4,7 @@ from edi_837_parser.elements import Element
 
 
 class Integer(Element):
+	deferrable = True
 
 	def parser(self, value: str) -> Optional[Union[int, str]]:
 		if value == '':
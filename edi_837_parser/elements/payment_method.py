@@ -1,4 +1,4 @@
-from edi_837_parser.elements import Element
+from edi_837_parser.elements import Element, CodeRegistry
 
 payment_methods = {
 	'ACH': 'automatic deposit',
@@ -6,9 +6,11 @@ payment_methods = {
 	'NON': 'no payment'
 }
 
+_registry = CodeRegistry('PaymentMethod', payment_methods)
+
 
 class PaymentMethod(Element):
 
 	def parser(self, value: str) -> str:
 		value = value.strip()
-		return payment_methods.get(value, value)
+		return _registry.describe(value)
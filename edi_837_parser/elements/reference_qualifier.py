@@ -1,4 +1,4 @@
-from edi_837_parser.elements import Element, Code
+from edi_837_parser.elements import Element, Code, CodeRegistry
 
 # https://ushik.ahrq.gov/ViewItemDetails?&system=sdo&itemKey=133213000
 reference_qualifiers = {
@@ -9,9 +9,11 @@ reference_qualifiers = {
 	'LU': 'location number'
 }
 
+_registry = CodeRegistry('ReferenceQualifier', reference_qualifiers)
+
 
 class ReferenceQualifier(Element):
+	deferrable = True
 
 	def parser(self, value: str) -> Code:
-		description = reference_qualifiers.get(value, None)
-		return Code(value, description)
+		return _registry.code(value)
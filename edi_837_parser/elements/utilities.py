@@ -1,11 +1,33 @@
-from typing import List
+from typing import Iterator, List, Optional
 from collections import defaultdict
+from contextlib import contextmanager
 
+# the ISA16 component separator of the file whose segments are being built, None to guess
+_component_separator = None
 
-def split_element(segment: str) -> List[str]:
-    """different payers use different characters to delineate sub-elements"""
-    delim = _identify_delim(segment)
-    return segment.split(delim)
+
+@contextmanager
+def component_separator(separator: str) -> Iterator[None]:
+    """split composite elements on the interchange's component separator while segments are built"""
+    global _component_separator
+    previous = _component_separator
+    _component_separator = separator
+    try:
+        yield
+    finally:
+        _component_separator = previous
+
+
+def split_element(segment: str, separator: Optional[str] = None) -> List[str]:
+    """split a composite element on the component separator
+
+    Without one, given or set by component_separator, it is guessed per value, as
+    different payers use different characters to delineate sub-elements.
+    """
+    separator = separator or _component_separator
+    if separator is None:
+        separator = _identify_delim(segment)
+    return segment.split(separator)
 
 
 def _identify_delim(segment: str) -> str:
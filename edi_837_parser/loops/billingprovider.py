@@ -1,5 +1,4 @@
 from typing import Iterator, Tuple, Optional, List
-from warnings import warn
 from edi_837_parser.segments.claim import Claim as ClaimSegment
 from edi_837_parser.segments.billingprovider import Billingprovider as BillingproviderSegment
 from edi_837_parser.segments.entity import Entity as EntitySegment
@@ -11,6 +10,7 @@ from edi_837_parser.segments.dept_contact_information import Dept_Contact_Inform
 
 
 from edi_837_parser.segments.utilities import find_identifier
+from edi_837_parser.diagnostics import record_unhandled
 
 
 class Billingprovider:
@@ -90,8 +90,7 @@ class Billingprovider:
 
 				else:
 					segment = None
-					message = f'Identifier: {identifier} not handled in billingprovider loop.'
-					# warn(message)
+					record_unhandled('billingprovider', identifier)
 
 			except StopIteration:
 				return billingprovider, None, None
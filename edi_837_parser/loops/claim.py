@@ -1,5 +1,4 @@
 from typing import Iterator, Tuple, Optional, List
-from warnings import warn
 
 from edi_837_parser.segments.claim import Claim as ClaimSegment
 from edi_837_parser.segments.entity import Entity as EntitySegment
@@ -18,6 +17,7 @@ from edi_837_parser.loops.subscriber import Subscriber as SubscriberLoop
 from edi_837_parser.segments.patient import Patient as PatientSegment
 from edi_837_parser.segments.billingprovider import Billingprovider as BillingproviderSegment
 from edi_837_parser.segments.utilities import split_segment  
+from edi_837_parser.diagnostics import record_unhandled
 
 
 class Claim:
@@ -25,6 +25,7 @@ class Claim:
 	terminating_identifiers = [
 		ClaimSegment.identification,
 		PatientSegment.identification,
+		'HL',
 		'SE'
 	]
 
@@ -97,7 +98,6 @@ class Claim:
 	def build(cls, segment: str, segments: Iterator[str]) -> Tuple['Claim', Optional[Iterator[str]], Optional[str]]:
 		claim = Claim()
 		claim.claim = ClaimSegment(segment)
-		identifier2=split_segment(segment)
 		# print(claim)
 		segment = segments.__next__()
 		# print("hello")
@@ -163,9 +163,8 @@ class Claim:
 					return claim, segments, segment
 
 				else:
-					message = f'Identifier: {identifier} not handled in claim loop.'
 					segment = None
-					warn(message)
+					record_unhandled('claim', identifier)
 
 			except StopIteration:
 				return claim, None, None
@@ -1,5 +1,4 @@
 from typing import Iterator, Tuple, Optional, List
-from warnings import warn
 from edi_837_parser.segments.claim import Claim as ClaimSegment
 from edi_837_parser.segments.patient import Patient as PatientSegment
 from edi_837_parser.segments.entity import Entity as EntitySegment
@@ -10,6 +9,7 @@ from edi_837_parser.segments.demographic_information import Demographic_informat
 
 
 from edi_837_parser.segments.utilities import find_identifier
+from edi_837_parser.diagnostics import record_unhandled
 
 
 class Patient:
@@ -85,8 +85,7 @@ class Patient:
 
 				else:
 					segment = None
-					message = f'Identifier: {identifier} not handled in patientloop.'
-					# warn(message)
+					record_unhandled('patient', identifier)
 
 			except StopIteration:
 				return patient, None, None
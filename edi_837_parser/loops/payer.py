@@ -1,5 +1,4 @@
 from typing import Iterator, Tuple, Optional, List
-from warnings import warn
 from edi_837_parser.segments.claim import Claim as ClaimSegment
 from edi_837_parser.segments.subscriber import Subscriber as SubscriberSegment
 from edi_837_parser.segments.entity import Entity as EntitySegment
@@ -14,6 +13,7 @@ from edi_837_parser.segments.dept_contact_information import Dept_Contact_Inform
 
 from edi_837_parser.segments.date import Date as DateSegment
 from edi_837_parser.segments.utilities import find_identifier
+from edi_837_parser.diagnostics import record_unhandled
 
 
 class Payer:
@@ -106,12 +106,8 @@ class Payer:
 					return payer, segments, segment
 
 				else:
-					if identifier=='DTP':
-						print(payer.entities.segment)
-						print('seg',segment)
 					segment = None
-					message = f'Identifier: {identifier} not handled in payerloop.'
-					warn(message)
+					record_unhandled('payer', identifier)
 
 			except StopIteration:
 				return payer, None, None
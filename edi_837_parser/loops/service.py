@@ -1,5 +1,4 @@
 from typing import Tuple, Iterator, Optional, List
-from warnings import warn
 
 from edi_837_parser.segments.service import Service as ServiceSegment
 from edi_837_parser.segments.claim import Claim as ClaimSegment
@@ -13,6 +12,7 @@ from edi_837_parser.segments.drug_identification import Drug_Identification as D
 from edi_837_parser.segments.drug_quantity import Drug_Quantity as Drug_QuantitySegment
 
 from edi_837_parser.segments.utilities import find_identifier
+from edi_837_parser.diagnostics import record_unhandled
 
 
 class Service:
@@ -90,8 +90,7 @@ class Service:
 					return service, segment, segments
 
 				else:
-					message = f'Identifier: {identifier} not handled in service loop.'
-					warn(message)
+					record_unhandled('service', identifier)
 
 			except StopIteration:
 				return service, None, None
@@ -1,5 +1,4 @@
 from typing import Iterator, Tuple, Optional, List
-from warnings import warn
 from edi_837_parser.segments.claim import Claim as ClaimSegment
 from edi_837_parser.segments.subscriber import Subscriber as SubscriberSegment
 from edi_837_parser.segments.entity import Entity as EntitySegment
@@ -7,6 +6,7 @@ from edi_837_parser.segments.amount import Amount as AmountSegmant
 from edi_837_parser.segments.service_adjustment import ServiceAdjustment as ServiceAdjustmentSegment
 from edi_837_parser.loops.payer import Payer as PayerLoop
 from edi_837_parser.segments.utilities import find_identifier
+from edi_837_parser.diagnostics import record_unhandled
 
 
 class Subscriber:
@@ -73,8 +73,7 @@ class Subscriber:
 
 				else:
 					segment = None
-					message = f'Identifier: {identifier} not handled in subscriber loop.'
-					warn(message)
+					record_unhandled('subscriber', identifier)
 
 			except StopIteration:
 				return subscriber, None, None
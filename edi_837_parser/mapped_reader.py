@@ -0,0 +1,107 @@
+import mmap
+from typing import Container, Iterator, List, Optional, Tuple
+
+from edi_837_parser.tokenizer import CHUNK_SIZE, HEADER_SEARCH_LIMIT, Delimiters, read_delimiters, tokenize
+
+
+def map_file(file_path: str) -> Optional[mmap.mmap]:
+	"""map a file read only, or None when it is empty
+
+	The mapping stays valid after the file is closed and is released once nothing refers
+	to it any more.
+	"""
+	with open(file_path, 'rb') as f:
+		try:
+			return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		except ValueError:
+			# an empty file cannot be mapped
+			return None
+
+
+def read_mapped_delimiters(buffer) -> Optional[Delimiters]:
+	# latin-1 maps bytes to characters one to one, so the delimiters come back unchanged
+	return read_delimiters(buffer[:HEADER_SEARCH_LIMIT].decode('latin-1'))
+
+
+def iter_windows(buffer, terminator: bytes, window_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+	"""yield the mapped bytes in windows that each end just after a segment terminator
+
+	The terminators are found on the mapping itself, so no partial segment is carried from
+	one window into the next and each byte is copied out of the mapping once.
+	"""
+	size = len(buffer)
+	start = 0
+	while start < size:
+		limit = start + window_size
+		if limit >= size:
+			end = size
+		else:
+			end = buffer.rfind(terminator, start, limit)
+			if end == -1:
+				# a single segment longer than the window
+				end = buffer.find(terminator, limit)
+				end = size if end == -1 else end
+			end += len(terminator)
+
+		yield buffer[start:end]
+		start = end
+
+
+def tokenize_mapped(
+		buffer,
+		delimiters: Delimiters,
+		encoding: str = 'utf-8',
+		errors: str = 'strict',
+		window_size: int = CHUNK_SIZE,
+		segment_ids: Optional[Container[str]] = None,
+) -> Iterator[List[str]]:
+	"""tokenize a mapping one window at a time, so only the current window is ever decoded
+
+	With segment_ids only segments with one of those identifiers are split into elements,
+	every other segment is dropped on its identifier alone.
+	"""
+	terminator = delimiters.segment
+	element = delimiters.element
+	for window in iter_windows(buffer, terminator.encode('latin-1'), window_size):
+		for segment in window.decode(encoding, errors).split(terminator):
+			segment = segment.strip()
+			if not segment:
+				continue
+
+			if '\n' in segment:
+				segment = segment.replace('\n', '')
+
+			if segment_ids is not None:
+				end = segment.find(element)
+				if (segment[:end] if end != -1 else segment) not in segment_ids:
+					continue
+
+			yield segment.split(element)
+
+
+def iter_mapped_segments(file_path: str, encoding: str = 'utf-8', errors: str = 'strict') -> Iterator[List[str]]:
+	"""tokenize a file through a read only mapping instead of reading it into a str
+
+	Files without an interchange header have no terminator to scan for, those are decoded
+	whole and their delimiters guessed per segment.
+	"""
+	_, segments = map_segments(file_path, encoding, errors)
+	yield from segments
+
+
+def map_segments(
+		file_path: str,
+		encoding: str = 'utf-8',
+		errors: str = 'strict',
+) -> Tuple[Optional[Delimiters], Iterator[List[str]]]:
+	"""the delimiters of a file's ISA header, None without one, and its segments as
+	iter_mapped_segments yields them"""
+	buffer = map_file(file_path)
+	if buffer is None:
+		return None, iter(())
+
+	delimiters = read_mapped_delimiters(buffer)
+	if delimiters is None:
+		return None, tokenize(buffer[:].decode(encoding, errors))
+
+	return delimiters, tokenize_mapped(buffer, delimiters, encoding, errors)
@@ -0,0 +1,139 @@
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache, total_ordering
+from typing import Iterable
+
+# amounts are held as integer counts of 10 ** -MONEY_SCALE dollars
+MONEY_SCALE = 6
+UNITS_PER_DOLLAR = 10 ** MONEY_SCALE
+# distinct raw amounts whose formatted text is kept by format_money
+MONEY_CACHE_SIZE = 4096
+
+_PADDING = ['0' * (MONEY_SCALE - decimals) for decimals in range(MONEY_SCALE + 1)]
+
+
+@total_ordering
+class Money:
+	"""an exact monetary amount stored as an integer number of millionths of a dollar
+
+	Sums never drift the way floats do, and the integer units can be put in an int64
+	column as they are. str() gives up to six decimals with trailing zeros removed, the
+	way the business format has always written amounts. Amounts compare with ints and
+	Decimals exactly and with floats as float(amount), the way the float amounts they
+	replace did, so checks like amount == 0 keep working.
+	"""
+	__slots__ = ('units',)
+
+	def __init__(self, units: int = 0):
+		self.units = units
+
+	@classmethod
+	def parse(cls, value: str) -> 'Money':
+		"""read an X12 decimal such as 125.25, -10 or .5, raising ValueError when it is not one"""
+		return cls(_parse_units(value))
+
+	@classmethod
+	def total(cls, amounts: Iterable['Money']) -> 'Money':
+		"""exact sum of amounts, None entries are skipped"""
+		return cls(sum(amount.units for amount in amounts if amount is not None))
+
+	def to_decimal(self) -> Decimal:
+		return Decimal(self.units).scaleb(-MONEY_SCALE)
+
+	def __float__(self) -> float:
+		return self.units / UNITS_PER_DOLLAR
+
+	def __str__(self) -> str:
+		units = self.units
+		if not units % UNITS_PER_DOLLAR:
+			return str(units // UNITS_PER_DOLLAR)
+
+		sign = '-' if units < 0 else ''
+		text = str(abs(units)).rjust(MONEY_SCALE + 1, '0')
+		return f"{sign}{text[:-MONEY_SCALE]}.{text[-MONEY_SCALE:].rstrip('0')}"
+
+	# written wherever a float amount used to appear, e.g. in dicts of amounts
+	__repr__ = __str__
+
+	def __hash__(self) -> int:
+		# equal to the hash of the int or Decimal the amount equals
+		if not self.units % UNITS_PER_DOLLAR:
+			return hash(self.units // UNITS_PER_DOLLAR)
+		return hash(self.to_decimal())
+
+	def __bool__(self) -> bool:
+		return self.units != 0
+
+	def __eq__(self, other) -> bool:
+		if isinstance(other, Money):
+			return self.units == other.units
+		if isinstance(other, float):
+			return float(self) == other
+		if isinstance(other, int):
+			return self.units == other * UNITS_PER_DOLLAR
+		if isinstance(other, Decimal):
+			return self.to_decimal() == other
+		return NotImplemented
+
+	def __lt__(self, other) -> bool:
+		if isinstance(other, Money):
+			return self.units < other.units
+		if isinstance(other, float):
+			return float(self) < other
+		if isinstance(other, int):
+			return self.units < other * UNITS_PER_DOLLAR
+		if isinstance(other, Decimal):
+			return self.to_decimal() < other
+		return NotImplemented
+
+	def __add__(self, other) -> 'Money':
+		if isinstance(other, Money):
+			return Money(self.units + other.units)
+		# so sum() can start from 0
+		if other == 0:
+			return self
+		return NotImplemented
+
+	__radd__ = __add__
+
+	def __sub__(self, other) -> 'Money':
+		if isinstance(other, Money):
+			return Money(self.units - other.units)
+		return NotImplemented
+
+	def __neg__(self) -> 'Money':
+		return Money(-self.units)
+
+	def __reduce__(self):
+		return Money, (self.units,)
+
+
+@lru_cache(maxsize=MONEY_CACHE_SIZE)
+def format_money(value: str) -> str:
+	"""the text of a raw amount as str(Money) writes it, memoized as amounts repeat"""
+	return str(Money.parse(value))
+
+
+def _parse_units(value: str) -> int:
+	# the usual form, an optional sign, digits and at most MONEY_SCALE decimals, is read with a
+	# single int() of the digits padded to MONEY_SCALE decimals
+	whole, _, fraction = value.partition('.')
+	if (
+			len(fraction) <= MONEY_SCALE
+			and (fraction.isdecimal() or (not fraction and whole[-1:].isdecimal()))
+			and '_' not in value
+	):
+		try:
+			return int(whole + fraction + _PADDING[len(fraction)])
+		except ValueError:
+			pass
+
+	# exponents, more decimals than MONEY_SCALE or surrounding spaces; rounded half to even
+	# like the '.6f' formatting the business format used
+	try:
+		# Decimal, like int, would read 1_000 as a thousand
+		if '_' in value:
+			raise ValueError
+		amount = Decimal(value.strip())
+		return int(amount.scaleb(MONEY_SCALE).to_integral_value())
+	except (InvalidOperation, ValueError, OverflowError):
+		raise ValueError(f'{value!r} is not a monetary amount') from None
@@ -1,9 +1,10 @@
 from edi_837_parser.elements.identifier import Identifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Address:
 	identification = 'N3'
+	__slots__ = ('segment', '_identifier', 'address')
 
 	identifier = Identifier()
 
@@ -15,7 +16,7 @@ class Address:
 		self.address = segment[1]
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
@@ -1,11 +1,12 @@
 from edi_837_parser.elements.identifier import Identifier
 from edi_837_parser.elements.dollars import Dollars
 from edi_837_parser.elements.amount_qualifier import AmountQualifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Amount:
 	identification = 'AMT'
+	__slots__ = ('segment', '_identifier', '_qualifier', '_amount')
 
 	identifier = Identifier()
 	qualifier = AmountQualifier()
@@ -20,7 +21,7 @@ class Amount:
 		self.amount = segment[2]
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
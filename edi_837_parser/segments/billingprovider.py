@@ -1,12 +1,12 @@
 from edi_837_parser.elements.identifier import Identifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Billingprovider:
 	identification='PRV'
+	__slots__ = ('segment', '_identifier', 'type', 'taxonomy_code')
 
 	identifier = Identifier()
-	taxonomy_code = ''
 
 	def __init__(self, segment: str):
 		self.segment = segment
@@ -21,7 +21,7 @@ class Billingprovider:
 
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
@@ -1,9 +1,10 @@
 from edi_837_parser.elements.identifier import Identifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class City_information:
 	identification = 'N4'
+	__slots__ = ('segment', '_identifier', 'city', 'state', 'zipcode')
 
 	identifier = Identifier()
 
@@ -18,7 +19,7 @@ class City_information:
 		
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
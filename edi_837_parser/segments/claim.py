@@ -1,11 +1,13 @@
 from edi_837_parser.elements.identifier import Identifier
 from edi_837_parser.elements.claim_status import ClaimStatus
 from edi_837_parser.elements.dollars import Dollars
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.elements.utilities import split_element
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Claim:
 	identification = 'CLM'
+	__slots__ = ('segment', '_identifier', 'marker', '_charge_amount', '_status', '_paid_amount', 'facility_code')
 
 	identifier = Identifier()
 	status = ClaimStatus()
@@ -21,11 +23,13 @@ class Claim:
 		self.charge_amount = segment[2]
 		self.status = segment[3]
 		self.paid_amount = segment[4]
+		# CLM05-1, the place of service; in an 837I the first two digits of the type of bill
+		self.facility_code = split_element(segment[5])[0] if len(segment) > 5 and segment[5] else None
 		
 		
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
@@ -1,11 +1,12 @@
 from edi_837_parser.elements.identifier import Identifier
 from edi_837_parser.elements.date import Date as DateElement
 from edi_837_parser.elements.date_qualifier import DateQualifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Date:
 	identification = 'DTP'
+	__slots__ = ('segment', '_identifier', '_qualifier', '_date')
 
 	identifier = Identifier()
 	date = DateElement()
@@ -19,7 +20,7 @@ class Date:
 		self.date = segment[3]
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
@@ -1,11 +1,12 @@
 from edi_837_parser.elements.identifier import Identifier
 from edi_837_parser.elements.date import Date as DateElement
 from edi_837_parser.elements.date_qualifier import DateQualifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Demographic_information:
 	identification = 'DMG'
+	__slots__ = ('segment', '_identifier', '_qualifier', '_date', 'gender_code')
 
 	identifier = Identifier()
 	date = DateElement()
@@ -21,7 +22,7 @@ class Demographic_information:
 		self.gender_code=segment[3]
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
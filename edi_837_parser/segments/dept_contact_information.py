@@ -1,9 +1,10 @@
 from edi_837_parser.elements.identifier import Identifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Dept_Contact_Information:
 	identification = 'PER'
+	__slots__ = ('segment', '_identifier', 'department', 'telephonenumber', 'fxnumber')
 
 	identifier = Identifier()
 
@@ -22,7 +23,7 @@ class Dept_Contact_Information:
 		
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
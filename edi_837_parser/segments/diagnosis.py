@@ -1,11 +1,12 @@
 from edi_837_parser.elements.identifier import Identifier
 from edi_837_parser.elements.claim_status import ClaimStatus
 from edi_837_parser.elements.dollars import Dollars
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Diagnosis:
 	identification = 'HI'
+	__slots__ = ('segment', '_identifier', 'diagnosis_codes')
 
 	identifier = Identifier()
 
@@ -17,7 +18,7 @@ class Diagnosis:
 		self.diagnosis_codes = segment[1:]
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
@@ -1,10 +1,11 @@
 from edi_837_parser.elements.identifier import Identifier
 from edi_837_parser.elements.dollars import Dollars
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Drug_Quantity:
 	identification = 'CTP'
+	__slots__ = ('segment', '_identifier', 'drug_unit', 'meas_code')
 
 	identifier = Identifier()
 
@@ -17,7 +18,7 @@ class Drug_Quantity:
 		self.meas_code=segment[5]
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
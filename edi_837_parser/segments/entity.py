@@ -2,11 +2,15 @@ from edi_837_parser.elements.identifier import Identifier
 from edi_837_parser.elements.entity_code import EntityCode
 from edi_837_parser.elements.entity_type import EntityType
 from edi_837_parser.elements.identification_code_qualifier import IdentificationCodeQualifier
-from edi_837_parser.segments.utilities import split_segment, get_element
+from edi_837_parser.segments.utilities import split_segment, get_element, slot_items
 
 
 class Entity:
 	identification = 'NM1'
+	__slots__ = (
+		'segment', '_identifier', '_entity', '_type', 'last_name', 'first_name',
+		'_identification_code_qualifier', 'identification_code',
+	)
 
 	identifier = Identifier()
 	entity = EntityCode()
@@ -27,7 +31,7 @@ class Entity:
 			self.identification_code = get_element(segment, 9)
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 	@property
 	def name(self) -> str:
@@ -1,9 +1,10 @@
 from edi_837_parser.elements.identifier import Identifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Note:
 	identification = 'NTE'
+	__slots__ = ('segment', '_identifier', 'referencecode', 'note_text')
 
 	identifier = Identifier()
 
@@ -16,7 +17,7 @@ class Note:
 		self.note_text = segment[2]
 
 	def __repr__(self) -> str:
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 
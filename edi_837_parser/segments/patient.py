@@ -1,12 +1,11 @@
 from edi_837_parser.elements.identifier import Identifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Patient:
 	identification = 'PAT'
-	print("hi pat")
+	__slots__ = ('segment', '_identifier', 'relationship_code')
 	identifier = Identifier()
-	relationship_code = ''
 
 	def __init__(self, segment: str):
 		self.segment = segment
@@ -17,7 +16,7 @@ class Patient:
 		self.relationship_code = segment[1]
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
@@ -1,10 +1,11 @@
 from edi_837_parser.elements.identifier import Identifier
 from edi_837_parser.elements.reference_qualifier import ReferenceQualifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Reference:
 	identification = 'REF'
+	__slots__ = ('segment', '_identifier', '_qualifier', 'value')
 
 	identifier = Identifier()
 	qualifier = ReferenceQualifier()
@@ -19,7 +20,7 @@ class Reference:
 		self.value = segment[2]
 
 	def __repr__(self) -> str:
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 	def __str__(self) -> str:
 		return f'{self.qualifier}: {self.value}'
@@ -4,11 +4,12 @@ from edi_837_parser.elements.service_code import ServiceCode
 from edi_837_parser.elements.service_qualifier import ServiceQualifer
 from edi_837_parser.elements.service_modifier import ServiceModifier
 from edi_837_parser.elements.integer import Integer
-from edi_837_parser.segments.utilities import split_segment, get_element
+from edi_837_parser.segments.utilities import split_segment, get_element, slot_items
 
 
 class Service:
 	identification = 'LX'
+	__slots__ = ('segment', '_identifier', '_assigned_number')
 
 	identifier = Identifier()
 	assigned_number = Integer()
@@ -21,7 +22,7 @@ class Service:
 		self.assigned_number = segment[1]
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
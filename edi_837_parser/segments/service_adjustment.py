@@ -2,11 +2,14 @@ from edi_837_parser.elements.identifier import Identifier
 from edi_837_parser.elements.dollars import Dollars
 from edi_837_parser.elements.adjustment_group_code import AdjustmentGroupCode
 from edi_837_parser.elements.adjustment_reason_code import AdjustmentReasonCode
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class ServiceAdjustment:
 	identification = 'CAS'
+	__slots__ = (
+		'segment', '_identifier', 'adjustment_group_code', 'reason_code_amount', '_group_code', '_reason_code', '_amount',
+	)
 
 	identifier = Identifier()
 	group_code = AdjustmentGroupCode()
@@ -31,7 +34,7 @@ class ServiceAdjustment:
 
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
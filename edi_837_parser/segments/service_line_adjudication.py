@@ -1,10 +1,13 @@
 from edi_837_parser.elements.identifier import Identifier
 from edi_837_parser.elements.dollars import Dollars
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Service_Line_Adjudication:
 	identification = 'SVD'
+	__slots__ = (
+		'segment', '_identifier', 'identification_code', '_service_line_paid_amount', 'procedure_code', 'description', 'unit_count',
+	)
 
 	identifier = Identifier()
 	# qualifier = AmountQualifier()
@@ -22,7 +25,7 @@ class Service_Line_Adjudication:
 		self.unit_count = segment[5]
 
 	def __repr__(self):
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 if __name__ == '__main__':
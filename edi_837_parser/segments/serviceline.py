@@ -1,9 +1,12 @@
 from edi_837_parser.elements.identifier import Identifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Serviceline:
 	identification = 'SV2'
+	__slots__ = (
+		'segment', '_identifier', 'revenuecode', 'procedurecode', 'chargeamount', 'measurementcode', 'unitdays',
+	)
 
 	identifier = Identifier()
 
@@ -20,7 +23,7 @@ class Serviceline:
 		
 
 	def __repr__(self) -> str:
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 
@@ -1,9 +1,10 @@
 from edi_837_parser.elements.identifier import Identifier
-from edi_837_parser.segments.utilities import split_segment
+from edi_837_parser.segments.utilities import split_segment, slot_items
 
 
 class Subscriber:
 	identification = 'SBR'
+	__slots__ = ('segment', '_identifier', 'sequencecode', 'ppolicynumber', 'filingindicator')
 
 	identifier = Identifier()
 
@@ -17,7 +18,7 @@ class Subscriber:
 		self.filingindicator = segment[3]
 
 	def __repr__(self) -> str:
-		return '\n'.join(str(item) for item in self.__dict__.items())
+		return '\n'.join(str(item) for item in slot_items(self))
 
 
 
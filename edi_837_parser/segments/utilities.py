@@ -1,8 +1,12 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 
 def split_segment(segment: str) -> List[str]:
     """Different payers use different characters to delineate elements"""
+    # segments from the tokenizer are already split
+    if not isinstance(segment, str):
+        return segment
+
     asterisk = '*'
     pipe = '|'
     newline = '\n'
@@ -22,7 +26,8 @@ def split_segment(segment: str) -> List[str]:
 
 
 def find_identifier(segment) -> str:
-	segment = split_segment(segment)
+	if isinstance(segment, str):
+		segment = split_segment(segment)
 	return segment[0]
 
 def get_element(segment: List[str], index: int, default=None) -> Optional[str]:
@@ -31,3 +36,16 @@ def get_element(segment: List[str], index: int, default=None) -> Optional[str]:
 		element = segment[index]
 
 	return element
+
+
+def slot_items(obj) -> Iterator[Tuple[str, object]]:
+	"""(name, value) of the slots set on a segment, what __dict__.items() gave before segments had slots
+
+	Element descriptors keep their parsed value in the slot named after them with a leading
+	underscore, and slots a segment left unset are skipped.
+	"""
+	for name in obj.__slots__:
+		try:
+			yield name, getattr(obj, name)
+		except AttributeError:
+			continue
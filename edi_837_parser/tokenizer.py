@@ -0,0 +1,65 @@
+from collections import namedtuple
+from typing import Iterable, Iterator, List, Optional
+
+from edi_837_parser.segments.utilities import split_segment
+
+Delimiters = namedtuple('Delimiters', 'element component segment')
+
+ISA_ELEMENT_COUNT = 16
+DEFAULT_TERMINATOR = '~'
+CHUNK_SIZE = 1024 * 1024
+HEADER_SEARCH_LIMIT = 64 * 1024
+
+
+def read_delimiters(content: str) -> Optional[Delimiters]:
+	"""read the element, component and segment terminators from the ISA header
+
+	ISA16 is the component separator and the character that follows it terminates the
+	segment, so counting element separators also works for headers that are not padded
+	to the fixed 106 characters.
+	"""
+	start = content.find('ISA')
+	if start == -1 or len(content) < start + 4:
+		return None
+
+	element = content[start + 3]
+	position = start + 3
+	for _ in range(ISA_ELEMENT_COUNT - 1):
+		position = content.find(element, position + 1)
+		if position == -1:
+			return None
+
+	if len(content) < position + 3:
+		return None
+
+	return Delimiters(element, content[position + 1], content[position + 2])
+
+
+def tokenize(content: str, delimiters: Optional[Delimiters] = None) -> Iterator[List[str]]:
+	"""split a file into segments once, yielding each segment as a list of elements"""
+	if delimiters is None:
+		delimiters = read_delimiters(content)
+
+	terminator = delimiters.segment if delimiters else DEFAULT_TERMINATOR
+	yield from _split_elements(content.split(terminator), delimiters)
+
+
+def _split_elements(segments: Iterable[str], delimiters: Optional[Delimiters]) -> Iterator[List[str]]:
+	# without an interchange header fall back to guessing the delimiters per segment
+	if delimiters is None:
+		for segment in segments:
+			segment = segment.strip()
+			if segment:
+				yield split_segment(segment)
+		return
+
+	element = delimiters.element
+	for segment in segments:
+		segment = segment.strip()
+		if not segment:
+			continue
+
+		if '\n' in segment:
+			segment = segment.replace('\n', '')
+
+		yield segment.split(element)
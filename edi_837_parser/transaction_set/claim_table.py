@@ -0,0 +1,164 @@
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+import pandas as pd
+
+from edi_837_parser.dates import DateRange
+from edi_837_parser.loops.claim import Claim as ClaimLoop
+from edi_837_parser.money import Money
+
+# grouping keys of ClaimTable.totals_by and the columns they read
+GROUP_COLUMNS = {
+	'payer': 'payer_id',
+	'billing_npi': 'billing_npi',
+	'place_of_service': 'place_of_service',
+	'service_month': 'service_month',
+}
+
+PAYER_PAID_QUALIFIER = 'other amount paid'
+
+
+class ClaimTable:
+	"""one row per claim with the columns the claim reports aggregate over
+
+	Amounts are int64 Money units, so sums over any grouping are exact and run as
+	vectorized pandas operations instead of Python loops over the claim objects.
+	"""
+
+	def __init__(self, frame: pd.DataFrame):
+		self.frame = frame
+
+	def __len__(self) -> int:
+		return len(self.frame)
+
+	def __repr__(self):
+		return f'ClaimTable(claims={len(self)})'
+
+	@classmethod
+	def from_claims(cls, claims: Iterable[Tuple[str, ClaimLoop]]) -> 'ClaimTable':
+		"""build the table from (file path, claim) pairs, walking every claim once"""
+		columns = {name: [] for name in (
+			'file_path', 'claim_id', 'charge_units', 'paid_units', 'patient_key',
+			'billing_npi', 'payer_id', 'payer_name', 'place_of_service', 'service_month',
+		)}
+
+		for file_path, claim in claims:
+			payer_id, payer_name = _payer(claim)
+			columns['file_path'].append(file_path)
+			columns['claim_id'].append(claim.claim.marker)
+			columns['charge_units'].append(_units(claim.claim.charge_amount))
+			columns['paid_units'].append(_paid_units(claim))
+			columns['patient_key'].append(_patient_key(claim))
+			columns['billing_npi'].append(_billing_npi(claim))
+			columns['payer_id'].append(payer_id)
+			columns['payer_name'].append(payer_name)
+			columns['place_of_service'].append(_place_of_service(claim))
+			columns['service_month'].append(_service_month(claim))
+
+		frame = pd.DataFrame(columns)
+		frame['charge_units'] = frame['charge_units'].astype('int64')
+		frame['paid_units'] = frame['paid_units'].astype('int64')
+		return cls(frame)
+
+	def sum_charges(self) -> Money:
+		return Money(int(self.frame['charge_units'].sum()))
+
+	def sum_payments(self) -> Money:
+		return Money(int(self.frame['paid_units'].sum()))
+
+	def count_distinct(self, column: str) -> int:
+		"""distinct values of a column, claims without one are not counted"""
+		return int(self.frame[column].nunique(dropna=True))
+
+	def totals_by(self, by: str) -> pd.DataFrame:
+		"""claims, charges and payments per payer, billing_npi, place_of_service or service_month
+
+		The amount columns hold Money, the summing itself is done on the int64 units.
+		"""
+		if by not in GROUP_COLUMNS:
+			raise ValueError(f'Cannot group claims by {by!r}, expected one of {sorted(GROUP_COLUMNS)}')
+
+		column = GROUP_COLUMNS[by]
+		grouped = self.frame.groupby(column, sort=True, dropna=False)
+		totals = grouped.agg(
+			claims=('claim_id', 'size'),
+			charge_units=('charge_units', 'sum'),
+			paid_units=('paid_units', 'sum'),
+		)
+		if by == 'payer':
+			totals.insert(0, 'payer_name', grouped['payer_name'].first())
+
+		totals['charge_amount'] = [Money(int(units)) for units in totals.pop('charge_units')]
+		totals['paid_amount'] = [Money(int(units)) for units in totals.pop('paid_units')]
+		return totals
+
+
+def _units(amount: Optional[Money]) -> int:
+	return amount.units if amount is not None else 0
+
+
+def _paid_units(claim: ClaimLoop) -> int:
+	# CLM has no paid amount in an 837, what payers paid is in the other subscriber AMT*D
+	if claim.claim.paid_amount is not None:
+		return claim.claim.paid_amount.units
+
+	if not claim.subscriber_other:
+		return 0
+
+	return sum(
+		amount.amount.units for amount in claim.subscriber_other.amount
+		if amount.qualifier == PAYER_PAID_QUALIFIER and amount.amount is not None
+	)
+
+
+def _patient_key(claim: ClaimLoop) -> Optional[str]:
+	# the subscriber is the patient unless a patient loop names a dependent
+	member_id = None
+	if claim.subscriber:
+		for payer in claim.subscriber.payer:
+			if payer.tag == 'subscriber':
+				member_id = payer.entities.identification_code
+
+	entities = claim.patient.entities if claim.patient else []
+	if not entities:
+		return member_id
+
+	patient = entities[0]
+	birth_date = claim.patient.demographic_information.date if claim.patient.demographic_information else None
+	return f'{member_id}|{patient.last_name}|{patient.first_name}|{birth_date}'
+
+
+def _billing_npi(claim: ClaimLoop) -> Optional[str]:
+	if not claim.billingprovider:
+		return None
+
+	for entity in claim.billingprovider.entities:
+		if entity.entity == 'billing provider':
+			return entity.identification_code
+
+
+def _payer(claim: ClaimLoop) -> Tuple[Optional[str], Optional[str]]:
+	if claim.subscriber:
+		for payer in claim.subscriber.payer:
+			if payer.tag == 'payer':
+				return payer.entities.identification_code, payer.entities.last_name
+
+	return None, None
+
+
+def _place_of_service(claim: ClaimLoop) -> Optional[str]:
+	# split on the file's component separator when the claim was built
+	return claim.claim.facility_code
+
+
+def _service_month(claim: ClaimLoop) -> Optional[str]:
+	"""YYYY-MM of the claim's service date, statement period start or first service line date"""
+	dates = [d.date for d in claim.dates if d.qualifier in ('service', '434')]
+	if not dates:
+		dates = [d.date for service in claim.services for d in service.dates if d.qualifier == 'service']
+
+	for date in dates:
+		if isinstance(date, DateRange):
+			date = date.start
+		if isinstance(date, datetime):
+			return f'{date.year:04d}-{date.month:02d}'
@@ -0,0 +1,218 @@
+from typing import Iterator, Optional, Tuple
+
+from edi_837_parser.dates import DateRange
+from edi_837_parser.loops.billingprovider import Billingprovider as BillingproviderLoop
+from edi_837_parser.loops.claim import Claim as ClaimLoop
+from edi_837_parser.loops.service import Service as ServiceLoop
+from edi_837_parser.money import Money
+
+
+class ServiceProjection:
+	"""builds the flattened service rows of TransactionSet.serialize_service
+
+	A row is the claim's fields, the service's fields and the billing provider's fields.
+	The claim part is computed once per claim and the billing provider part once per
+	billing provider (HL 20) loop, so a claim's rows only differ in their service fields.
+	The rows of a claim share its diagnosis list and adjustment and amount dicts.
+	"""
+
+	def __init__(self):
+		self._billingprovider = None
+		self._billingprovider_fields = None
+
+	def iter_rows(self, claim: ClaimLoop) -> Iterator[Tuple[ServiceLoop, dict]]:
+		"""yield (service, row) for every service of the claim"""
+		if not claim.services:
+			return
+
+		head, tail = self.claim_fields(claim)
+		for service in claim.services:
+			row = head.copy()
+			_add_service_fields(row, service)
+			row.update(tail)
+			yield service, row
+
+	def row(self, claim: ClaimLoop, service: ServiceLoop) -> dict:
+		head, tail = self.claim_fields(claim)
+		row = head.copy()
+		_add_service_fields(row, service)
+		row.update(tail)
+		return row
+
+	def claim_fields(self, claim: ClaimLoop) -> Tuple[dict, dict]:
+		"""the fields before and after the service fields of a row, in column order"""
+		head = {'claim_id': claim.claim.marker}
+		_add_patient_fields(head, claim)
+
+		attending_firstname = ''
+		attending_lastname = ''
+		attending_identifier = ''
+		for entity in claim.entities:
+			if entity.entity == '71':
+				attending_firstname = entity.first_name
+				attending_lastname = entity.last_name
+				attending_identifier = entity.identification_code
+
+		diagnosis_codes = []
+		if claim.diagnosis:
+			for diagnosis in claim.diagnosis:
+				diagnosis_codes.extend(diagnosis.diagnosis_codes)
+
+		adjustments = {}
+		subscriber_amount = {}
+		subscriber_other = claim.subscriber_other
+		if subscriber_other:
+			for adjustment in subscriber_other.adjustments:
+				adjustments.update(adjustment.reason_code_amount)
+			for amount in subscriber_other.amount:
+				subscriber_amount[amount.qualifier] = _float_amount(amount.amount)
+
+		facility = claim.service_facility_location
+		facility_city = facility.city_information if facility else None
+		submitter = claim.submitter
+		receiver = claim.receiver
+
+		tail = {
+			'note': claim.note.note_text if claim.note else None,
+			'paid_amount': _float_amount(claim.claim.paid_amount),
+			'rendering_provider': claim.rendering_provider.name if claim.rendering_provider else None,
+			'payer_classification': str(claim.claim.status.payer_classification),
+			'diagnosis': diagnosis_codes,
+			'adjustments': adjustments,
+			'attending_provider_firstname': attending_firstname,
+			'attending_provider_lastname': attending_lastname,
+			'attending_provider_identifier': attending_identifier,
+			'attending_provider_taxonomy_code': claim.attending_provider_taxonomy.taxonomy_code if claim.attending_provider_taxonomy else None,
+			'service_facility_location': facility.entities.last_name if facility and facility.entities is not None else None,
+			'service_facility_location_address': facility.address.address if facility and facility.address is not None else None,
+			'service_facility_location_city': facility_city.city if facility_city is not None else None,
+			'service_facility_location_state': facility_city.state if facility_city is not None else None,
+			'service_facility_location_zipcode': facility_city.zipcode if facility_city is not None else None,
+			'submiiter_name': submitter.entities.last_name if submitter.entities else None,
+			'submiiter_identifier': submitter.entities.identification_code if submitter.entities is not None else None,
+			'submiiter_dept_telephone': submitter.dept_contact_information.telephonenumber if submitter.dept_contact_information is not None else None,
+			'submiiter_dept_fx': submitter.dept_contact_information.fxnumber if submitter.dept_contact_information is not None else None,
+			'receiver_name': receiver.entities.last_name if receiver.entities else None,
+			'receiver_identifier': receiver.entities.identification_code if receiver.entities is not None else None,
+		}
+		tail.update(self.billingprovider_fields(claim.billingprovider))
+		_add_other_subscriber_fields(tail, subscriber_other, subscriber_amount)
+
+		return head, tail
+
+	def billingprovider_fields(self, billingprovider: BillingproviderLoop) -> dict:
+		"""the billing provider fields, kept while consecutive claims share the loop"""
+		if billingprovider is not self._billingprovider:
+			self._billingprovider = billingprovider
+			self._billingprovider_fields = _billingprovider_fields(billingprovider)
+
+		return self._billingprovider_fields
+
+
+def _add_patient_fields(head: dict, claim: ClaimLoop):
+	patient = claim.patient
+	if patient is not None and patient.entities:
+		entity = patient.entities[0]
+		demographic_information = patient.demographic_information
+		address = patient.address[0] if patient.address else None
+		city_information = patient.city_information[0] if patient.city_information else None
+	else:
+		# without a patient (HL 23) loop the subscriber is the patient
+		subscriber = _subscriber_person(claim)
+		entity = subscriber.entities if subscriber else None
+		demographic_information = subscriber.demographic_information if subscriber else None
+		address = subscriber.address if subscriber else None
+		city_information = subscriber.city_information if subscriber else None
+
+	head['patient_firstname'] = entity.first_name if entity is not None else None
+	head['patient_lastname'] = entity.last_name if entity is not None else None
+	head['patient_dob'] = demographic_information.date if demographic_information is not None else None
+	head['patient_gender'] = demographic_information.gender_code if demographic_information is not None else None
+	head['patient_address'] = address.address if address is not None else None
+	head['patient_city'] = city_information.city if city_information is not None else None
+	head['patient_state'] = city_information.state if city_information is not None else None
+	head['patient_zipcode'] = city_information.zipcode if city_information is not None else None
+
+
+def _subscriber_person(claim: ClaimLoop):
+	# the NM1*IL loop of the claim's subscriber (2010BA)
+	if claim.subscriber:
+		for payer in claim.subscriber.payer:
+			if payer.tag == 'subscriber':
+				return payer
+
+
+def _float_amount(amount: Optional[Money]) -> Optional[float]:
+	# rows keep the float amounts they had before Money, so the amount columns stay float64
+	return float(amount) if amount is not None else None
+
+
+def _add_service_fields(row: dict, service: ServiceLoop):
+	# if the service doesn't have a start date assume the service and claim dates match
+	service_date = None
+	if service.dates and service.dates[0].qualifier == 'service':
+		service_date = service.dates[0].date
+		# an RD8 service period, the service date is its first day
+		if isinstance(service_date, DateRange):
+			service_date = service_date.start
+
+	serviceline = service.serviceline[0]
+	row['service_date'] = service_date
+	row['service_chargeamount'] = serviceline.chargeamount
+	row['service_revenue_code'] = serviceline.revenuecode
+	row['service_procedure_code'] = serviceline.procedurecode
+	row['service_measurement_code'] = serviceline.measurementcode
+	row['service_units'] = serviceline.unitdays
+	row['drug_identification_code'] = service.drug_identification.national_drug_code if service.drug_identification else None
+	row['drug_quantity'] = service.drug_quantity.drug_unit + " " + service.drug_quantity.meas_code if service.drug_quantity else None
+
+
+def _billingprovider_fields(billingprovider: BillingproviderLoop) -> dict:
+	name = ''
+	identification_code = ''
+	for entity in billingprovider.entities:
+		if entity.entity == 'billing provider':
+			name = entity.last_name
+			identification_code = entity.identification_code
+
+	city_information = billingprovider.city_information[0]
+	return {
+		'billingprovider_name': name,
+		'billingprovider_identfication_code': identification_code,
+		'billingprovider_taxonomy_code': billingprovider.billingprovider.taxonomy_code,
+		'billingprovider_dept_telephone': billingprovider.dept_contact_information.telephonenumber,
+		'billingprovider_dept_fx': billingprovider.dept_contact_information.fxnumber,
+		'billing_provider_city': city_information.city,
+		'billing_provider_state': city_information.state,
+		'billing_provider_zipcode': city_information.zipcode,
+		'billing_provider_address': billingprovider.address[0].address,
+	}
+
+
+def _add_other_subscriber_fields(tail: dict, subscriber_other, subscriber_amount: dict):
+	# payer[0] is the other subscriber (NM1*IL) and payer[1] the other payer (NM1*PR)
+	subscriber = None
+	payer = None
+	if subscriber_other:
+		if subscriber_other.payer[0].tag == 'subscriber':
+			subscriber = subscriber_other.payer[0]
+		if subscriber_other.payer[1].tag == 'payer':
+			payer = subscriber_other.payer[1]
+
+	subscriber_city = subscriber.city_information if subscriber else None
+	tail['subscriber(other)_first_name'] = subscriber.entities.first_name if subscriber else None
+	tail['subscriber(other)_last_name'] = subscriber.entities.last_name if subscriber else None
+	tail['subscriber(other)_identification_code'] = subscriber.entities.identification_code if subscriber else None
+	tail['subscriber(other)_address'] = subscriber.address.address if subscriber and subscriber.address is not None else None
+	tail['subscriber(other)_city'] = subscriber_city.city if subscriber_city is not None else None
+	tail['subscriber(other)_state'] = subscriber_city.state if subscriber_city is not None else None
+	tail['subscriber(other)_zipcode'] = subscriber_city.zipcode if subscriber_city is not None else None
+	tail['subscriber(other)_amount'] = subscriber_amount
+
+	payer_city = payer.city_information if payer else None
+	tail['payer(other)_name'] = payer.entities.last_name if payer else None
+	tail['payer(other)_identification_code'] = payer.entities.identification_code if payer else None
+	tail['payer(other)_address'] = payer.address.address if payer and payer.address is not None else None
+	tail['payer(other)_city'] = payer_city.city if payer_city is not None else None
+	tail['payer(other)_state'] = payer_city.state if payer_city is not None else None
+	tail['payer(other)_zipcode'] = payer_city.zipcode if payer_city is not None else None
@@ -1,9 +1,16 @@
-from typing import List, Iterator, Optional
+from typing import List, Iterator, Optional, Tuple
 from collections import namedtuple
+from contextlib import nullcontext
+from warnings import warn
 import pandas as pd
 from edi_837_parser.loops.claim import Claim as ClaimLoop
 from edi_837_parser.loops.service import Service as ServiceLoop
 from edi_837_parser.segments.utilities import find_identifier,split_segment
+from edi_837_parser.mapped_reader import map_segments
+from edi_837_parser.diagnostics import Diagnostics, collect_diagnostics, collecting
+from edi_837_parser.elements import lazy_decoding
+from edi_837_parser.elements.utilities import component_separator
+from edi_837_parser.transaction_set.projection import ServiceProjection
 from edi_837_parser.loops.patient import Patient as PatientLoop
 from edi_837_parser.loops.billingprovider import Billingprovider as BillingproviderLoop
 from edi_837_parser.loops.subscriber import Subscriber as SubscriberLoop
@@ -21,12 +28,14 @@ class TransactionSet:
 			patient:PatientLoop,
 			billingprovider:BillingproviderLoop,
 			subscriber:SubscriberLoop,
+			diagnostics: Diagnostics = None,
 	):
 		self.claims = claims
 		self.file_path = file_path
 		self.patient=patient
 		self.billingprovider=billingprovider
 		self.subscriber=subscriber
+		self.diagnostics = diagnostics if diagnostics else Diagnostics(file_path)
 
 	def __repr__(self):
 		return '\n'.join(str(item) for item in self.__dict__.items())
@@ -34,21 +43,14 @@ class TransactionSet:
 
 	def to_dataframe(self) -> pd.DataFrame:
 		"""flatten the remittance advice by service to a pandas DataFrame"""
-		data = []
-		# print("hello")
-		# print(self.claims[0])
-		cl=None
-		# print("length",len(self.patient))
+		return pd.DataFrame(list(self.iter_records()))
+
+	def iter_records(self) -> Iterator[dict]:
+		"""yield one flattened row per service"""
+		projection = ServiceProjection()
 		for claim in self.claims:
-			for service in claim.services:
-				datum = TransactionSet.serialize_service(
-					claim,
-					service,
-					self.patient,
-					self.billingprovider
-					
-			)
-				
+			for service, datum in projection.iter_rows(claim):
+
 				# for index, adjustment in enumerate(service.adjustments):
 				# 	datum[f'adj_{index}_group'] = adjustment.group_code.code
 				# 	datum[f'adj_{index}_code'] = adjustment.reason_code.code
@@ -62,10 +64,7 @@ class TransactionSet:
 				# 	datum[f'rem_{index}_qual'] = remark.qualifier.code
 				# 	datum[f'rem_{index}_code'] = remark.code.code
 
-				data.append(datum)
-		
-	
-		return pd.DataFrame(data)
+				yield datum
 
 	@staticmethod
 	def serialize_service(
@@ -74,150 +73,86 @@ class TransactionSet:
 			patient:PatientLoop,
 			billingprovider:BillingproviderLoop
 	) -> dict:
-		# if the service doesn't have a start date assume the service and claim dates match
-		servicedate = None
-		if service:
-			if service.dates and service.dates[0].qualifier=='service':
-			
-				servicedate = service.dates[0].date
-
-		# if the service doesn't have an end date assume the service and claim dates match
-		service_chargeamount = None
-		if service:
-			if service.serviceline:
-				service_chargeamount = service.serviceline[0].chargeamount
-
-		attendingprovider_fname=''
-		attendingprovider_lname=''
-		attendingprovider_identifier=''
-		billingprovider_name=''
-		billingprovider_identfication_code=''
-		subscriber_amount={}
-
-		for entity in claim.entities:
-			
-			if entity.entity=='71':
-				# print('hi')
-				
-				attendingprovider_fname=entity.first_name
-				attendingprovider_lname=entity.last_name
-				attendingprovider_identifier=entity.identification_code
-
-		for nm in claim.billingprovider.entities:
-			if nm.entity=='billing provider':
-				billingprovider_name=nm.last_name
-				billingprovider_identfication_code=nm.identification_code
-
-		diagnosis_codes = []
-
-		# Iterate over each object in claim.diagnosis list
-		if claim.diagnosis:
-			for diagnosis_obj in claim.diagnosis:
-				# Extract diagnosis codes list from the current object and concatenate it with all_diagnosis_codes
-				diagnosis_codes.extend(diagnosis_obj.diagnosis_codes)
-		adjustments={}
-		if claim.subscriber_other:
-			for adj in claim.subscriber_other.adjustments:
-				dictionary=adj.reason_code_amount
-				adjustments = {**adjustments, **dictionary}
-		
-		if claim.subscriber_other:
-			if len(claim.subscriber_other.amount)>0:
-				for amt in claim.subscriber_other.amount:
-					subscriber_amount[amt.qualifier]=amt.amount
-		
-
-		datum = {
-			'claim_id': claim.claim.marker,
-		
-			'patient_firstname': claim.patient.entities[0].first_name,
-			'patient_lastname': claim.patient.entities[0].last_name,
-			'patient_firstname': claim.patient.entities[0].first_name,
-			'patient_dob': claim.patient.demographic_information.date,
-			'patient_gender': claim.patient.demographic_information.gender_code,
-
-			'patient_address': claim.patient.address[0].address,
-			'patient_city': claim.patient.city_information[0].city,
-			'patient_state': claim.patient.city_information[0].state,
-			'patient_zipcode': claim.patient.city_information[0].zipcode,
-
-			# 'patient': claim.patient.name,
-			'service_date': servicedate,
-			'service_chargeamount': service_chargeamount,
-			'service_revenue_code':service.serviceline[0].revenuecode,
-			'service_procedure_code':service.serviceline[0].procedurecode,
-			'service_measurement_code':service.serviceline[0].measurementcode,
-			'service_units':service.serviceline[0].unitdays,
-			'drug_identification_code':service.drug_identification.national_drug_code if service.drug_identification else None,
-			'drug_quantity': service.drug_quantity.drug_unit +" "+service.drug_quantity.meas_code  if service.drug_quantity else None,
-			'note':claim.note.note_text if claim.note else None,
-
-			'paid_amount': claim.claim.paid_amount,
-			'rendering_provider': claim.rendering_provider.name if claim.rendering_provider else None,
-			'payer_classification': str(claim.claim.status.payer_classification),
-			'diagnosis':diagnosis_codes,
-			'adjustments':adjustments,
-			'attending_provider_firstname':attendingprovider_fname,
-			'attending_provider_lastname':attendingprovider_lname,
-			'attending_provider_identifier':attendingprovider_identifier,
-			'attending_provider_taxonomy_code':claim.attending_provider_taxonomy.taxonomy_code if claim.attending_provider_taxonomy else None,
-			'service_facility_location': claim.service_facility_location.entities.last_name if claim.service_facility_location and claim.service_facility_location.entities is not None else None,
-			'service_facility_location_address':claim.service_facility_location.address.address if claim.service_facility_location and claim.service_facility_location.address is not None else None,
-			'service_facility_location_city':claim.service_facility_location.city_information.city if claim.service_facility_location and claim.service_facility_location.city_information is not None else None,
-			'service_facility_location_state':claim.service_facility_location.city_information.state if claim.service_facility_location and claim.service_facility_location.city_information is not None else None,
-			'service_facility_location_zipcode':claim.service_facility_location.city_information.zipcode if claim.service_facility_location and claim.service_facility_location.city_information is not None else None,
-			'submiiter_name':claim.submitter.entities.last_name if claim.submitter.entities else None,
-			'submiiter_identifier':claim.submitter.entities.identification_code if claim.submitter.entities is not None else None,
-			'submiiter_dept_telephone':claim.submitter.dept_contact_information.telephonenumber if claim.submitter.dept_contact_information is not None else None,
-			'submiiter_dept_fx':claim.submitter.dept_contact_information.fxnumber if claim.submitter.dept_contact_information is not None else None,
-			'receiver_name':claim.receiver.entities.last_name if claim.receiver.entities else None,
-			'receiver_identifier':claim.receiver.entities.identification_code if claim.receiver.entities is not None else None,
-			'billingprovider_name':billingprovider_name,
-			'billingprovider_identfication_code':billingprovider_identfication_code,
-			'billingprovider_taxonomy_code':claim.billingprovider.billingprovider.taxonomy_code,
-			'billingprovider_dept_telephone':claim.billingprovider.dept_contact_information.telephonenumber,
-			'billingprovider_dept_fx':claim.billingprovider.dept_contact_information.fxnumber,
-			'billing_provider_city':claim.billingprovider.city_information[0].city,
-			'billing_provider_state':claim.billingprovider.city_information[0].state,
-			'billing_provider_zipcode':claim.billingprovider.city_information[0].zipcode,
-			'billing_provider_address':claim.billingprovider.address[0].address,
-			'subscriber(other)_first_name':claim.subscriber_other.payer[0].entities.first_name if (claim.subscriber_other and claim.subscriber_other.payer[0].tag=='subscriber') else None,
-			'subscriber(other)_last_name':claim.subscriber_other.payer[0].entities.last_name if claim.subscriber_other and claim.subscriber_other.payer[0].tag=='subscriber' else None,
-			'subscriber(other)_identification_code':claim.subscriber_other.payer[0].entities.identification_code if (claim.subscriber_other and claim.subscriber_other.payer[0].tag=='subscriber') else None,
-			'subscriber(other)_address':claim.subscriber_other.payer[0].address.address if (claim.subscriber_other and claim.subscriber_other.payer[0].tag=='subscriber' and claim.subscriber_other.payer[0].address is not None) else None,
-			'subscriber(other)_city':claim.subscriber_other.payer[0].city_information.city if (claim.subscriber_other and claim.subscriber_other.payer[0].tag=='subscriber' and claim.subscriber_other.payer[0].city_information is not None) else None,
-			'subscriber(other)_state':claim.subscriber_other.payer[0].city_information.state if (claim.subscriber_other and claim.subscriber_other.payer[0].tag=='subscriber' and claim.subscriber_other.payer[0].city_information is not None) else None,
-			'subscriber(other)_zipcode':claim.subscriber_other.payer[0].city_information.zipcode if (claim.subscriber_other and claim.subscriber_other.payer[0].tag=='subscriber' and claim.subscriber_other.payer[0].city_information is not None) else None,
-			'subscriber(other)_amount':subscriber_amount ,
-			'payer(other)_name':claim.subscriber_other.payer[1].entities.last_name  if (claim.subscriber_other and claim.subscriber_other.payer[1].tag=='payer') else None,
-			'payer(other)_identification_code':claim.subscriber_other.payer[1].entities.identification_code if (claim.subscriber_other and claim.subscriber_other.payer[1].tag=='payer') else None,
-			'payer(other)_address':claim.subscriber_other.payer[1].address.address if (claim.subscriber_other and claim.subscriber_other.payer[1].tag=='payer' and claim.subscriber_other.payer[1].address is not None) else None,
-			'payer(other)_city':claim.subscriber_other.payer[1].city_information.city if (claim.subscriber_other and claim.subscriber_other.payer[1].tag=='payer' and claim.subscriber_other.payer[1].city_information is not None) else None,
-			'payer(other)_state':claim.subscriber_other.payer[1].city_information.state if (claim.subscriber_other and claim.subscriber_other.payer[1].tag=='payer' and claim.subscriber_other.payer[1].city_information is not None) else None,
-			'payer(other)_zipcode':claim.subscriber_other.payer[1].city_information.zipcode if (claim.subscriber_other and claim.subscriber_other.payer[1].tag=='payer' and claim.subscriber_other.payer[1].city_information is not None) else None
-
-
-		}
-
-		return datum
+		"""the flattened row of one service; iter_records reuses the claim's part across its services"""
+		return ServiceProjection().row(claim, service)
 
 	@classmethod
-	def build(cls, file_path: str) -> 'TransactionSet':
+	def build(cls, file_path: str, lazy: bool = False) -> 'TransactionSet':
+		"""parse a file into its loops; with lazy, element values are parsed on first access"""
 		claims = []
-		organizations = []
 		patient=[]
 		billingprovider=[]
 		subscriber=[]
 
+		delimiters, segments = map_segments(file_path)
+		component = delimiters.component if delimiters else None
+		with collect_diagnostics(file_path) as diagnostics:
+			for key, value in cls.iter_loops(segments, lazy, component=component):
+				if key == 'claim':
+					claims.append(value)
+				elif key == 'patient':
+					patient.append(value)
+				elif key == 'billingprovider':
+					billingprovider.append(value)
+				elif key == 'subscriber':
+					subscriber.append(value)
+
+		# one warning per file instead of one per skipped segment
+		if diagnostics.unhandled:
+			warn(diagnostics.summary())
+
+		return TransactionSet(claims, file_path,patient,billingprovider,subscriber, diagnostics)
 
+	@classmethod
+	def iter_claims(cls, file_path: str, lazy: bool = False, diagnostics: Diagnostics = None) -> Iterator[ClaimLoop]:
+		"""stream the claims of a file without holding the file or earlier claims in memory
+
+		Each claim is yielded with its patient, billingprovider, subscriber, submitter and
+		receiver loops attached, the same context build() resolves. Skipped segments are
+		counted into diagnostics when given, otherwise summarized in one warning once the
+		file is read, like build() does.
+		"""
+		collector = diagnostics if diagnostics is not None else Diagnostics(file_path)
+		delimiters, segments = map_segments(file_path)
+		component = delimiters.component if delimiters else None
+		for key, value in cls.iter_loops(segments, lazy, collector, component):
+			if key == 'claim':
+				yield value
+
+		if diagnostics is None and collector.unhandled:
+			warn(collector.summary())
 
-		with open(file_path) as f:
-			file = f.read()
-		
-		segments = file.split('~')
-		segments = [segment.strip() for segment in segments]
-		
-		segments = iter(segments)
+	@staticmethod
+	def _decoding(lazy: bool):
+		# without lazy the caller's mode is kept, so an enclosing lazy_decoding() still applies
+		return lazy_decoding() if lazy else nullcontext()
+
+	@staticmethod
+	def _collecting(diagnostics: Optional[Diagnostics]):
+		# without a collector the caller's one is kept, so an enclosing collect_diagnostics() still applies
+		return collecting(diagnostics) if diagnostics is not None else nullcontext()
+
+	@staticmethod
+	def _components(component: Optional[str]):
+		# without the file's separator the caller's one is kept, or composites are guessed per value
+		return component_separator(component) if component is not None else nullcontext()
+
+	@classmethod
+	def iter_loops(
+			cls,
+			segments: Iterator[List[str]],
+			lazy: bool = False,
+			diagnostics: Diagnostics = None,
+			component: Optional[str] = None,
+	) -> Iterator[Tuple[str, object]]:
+		"""yield (key, loop) for every loop built from the segments, attaching the enclosing
+		context loops to each claim as it is produced
+
+		lazy decoding, the diagnostics collector and the ISA16 component separator
+		composite elements are split on are only switched on while a loop is built, never
+		across a yield, so segments the caller builds while this generator is suspended are
+		decoded and counted as usual.
+		"""
 		segment = None
 		pat=PatientLoop()
 		bp=BillingproviderLoop()
@@ -225,10 +160,10 @@ class TransactionSet:
 		submit=PayerLoop()
 		receive=PayerLoop()
 
-
 		while True:
-			response = cls.build_attribute(segment, segments)
-			
+			with cls._decoding(lazy), cls._collecting(diagnostics), cls._components(component):
+				response = cls.build_attribute(segment, segments)
+
 			segment = response.segment
 			segments = response.segments
 
@@ -236,47 +171,33 @@ class TransactionSet:
 			if response.segments is None:
 				break
 
-			if response.key == 'interchange':
-				interchange = response.value
-
-			if response.key == 'financial information':
-				financial_information = response.value
-
-			if response.key == 'organization':
-				organizations.append(response.value)
-
 			if response.key == 'claim':
-	
 				response.value.patient=pat
 				response.value.billingprovider=bp
 				response.value.subscriber=sub
 				response.value.submitter=submit
 				response.value.receiver=receive
 
-				claims.append(response.value)
-			if response.key == 'patient':
-				patient.append(response.value)
+			elif response.key == 'patient':
 				pat=response.value
-			if response.key == 'billingprovider':
-			
-				billingprovider.append(response.value)
+
+			elif response.key == 'billingprovider':
 				bp=response.value
-				
-			if response.key == 'subscriber':
-	
-				subscriber.append(response.value)
+
+			elif response.key == 'subscriber':
 				sub=response.value
-			
-			if response.key == 'submitter':
+				# a patient (HL 23) loop belongs to the subscriber before it, the claims of a
+				# new subscriber have no patient loop until one follows
+				pat=PatientLoop()
+
+			elif response.key == 'submitter':
 				submit=response.value
 
-			if response.key == 'receiver':
+			elif response.key == 'receiver':
 				receive=response.value
-	
 
-
-		
-		return TransactionSet(claims, file_path,patient,billingprovider,subscriber)
+			if response.key is not None:
+				yield response.key, response.value
 
 	@classmethod
 	def build_attribute(cls, segment: Optional[str], segments: Iterator[str]) -> BuildAttributeResponse:
@@ -1,7 +1,11 @@
-from typing import List, Iterable
+from itertools import islice
+from typing import List, Iterable, Iterator
 
 import pandas as pd
 
+from edi_837_parser.diagnostics import summarize
+from edi_837_parser.money import Money
+from edi_837_parser.transaction_set.claim_table import ClaimTable
 from edi_837_parser.transaction_set.transaction_set import TransactionSet
 
 
@@ -9,6 +13,7 @@ class TransactionSets:
 
 	def __init__(self, transaction_sets: List[TransactionSet]):
 		self.transaction_sets = transaction_sets
+		self._claim_table = None
 
 	def __iter__(self) -> Iterable[TransactionSet]:
 		yield from self.transaction_sets
@@ -20,12 +25,24 @@ class TransactionSets:
 		return '\n'.join(str(transaction_set) for transaction_set in self)
 
 	def to_dataframe(self) -> pd.DataFrame:
-		data = pd.DataFrame()
-		for transaction_set in self:
-			data = pd.concat([data, transaction_set.to_dataframe()])
+		data = pd.DataFrame(list(self.iter_records()))
 		data = TransactionSets.sort_columns(data)
 		return data
 
+	def iter_dataframes(self, chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+		"""yield the rows of to_dataframe in frames of at most chunk_size rows"""
+		records = self.iter_records()
+		while True:
+			chunk = list(islice(records, chunk_size))
+			if not chunk:
+				break
+
+			yield TransactionSets.sort_columns(pd.DataFrame(chunk))
+
+	def iter_records(self) -> Iterator[dict]:
+		for transaction_set in self:
+			yield from transaction_set.iter_records()
+
 	@staticmethod
 	def sort_columns(data: pd.DataFrame) -> pd.DataFrame:
 		substrings = ['adj', 'ref', 'rem']
@@ -37,12 +54,28 @@ class TransactionSets:
 		data = data[static_columns + variable_columns]
 		return data
 
-	def sum_payments(self) -> float:
-		amount = 0
-		for transaction_set in self:
-			amount += transaction_set.financial_information.amount_paid
+	def diagnostics_report(self, limit: int = 10) -> str:
+		"""the segments each file's loops did not handle, and the counts over all files"""
+		return summarize([transaction_set.diagnostics for transaction_set in self], limit)
 
-		return amount
+	def claim_table(self) -> ClaimTable:
+		"""the claims as columns, built on first use and shared by the aggregate methods below"""
+		if self._claim_table is None:
+			self._claim_table = ClaimTable.from_claims(
+				(transaction_set.file_path, claim)
+				for transaction_set in self
+				for claim in transaction_set.claims
+			)
+
+		return self._claim_table
+
+	def sum_charges(self) -> Money:
+		"""total of the CLM02 claim charge amounts"""
+		return self.claim_table().sum_charges()
+
+	def sum_payments(self) -> Money:
+		"""total of what other payers reported paying (AMT*D), or CLM04 where a claim has one"""
+		return self.claim_table().sum_payments()
 
 	def count_claims(self) -> int:
 		count = 0
@@ -52,11 +85,16 @@ class TransactionSets:
 		return count
 
 	def count_patients(self) -> int:
-		patients = []
-		for transaction_set in self:
-			for claim in transaction_set.claims:
-				patient = claim.patient
-				patients.append(patient.identification_code)
+		"""distinct patients, a subscriber's member id plus the name and birth date of a dependent"""
+		return self.claim_table().count_distinct('patient_key')
+
+	def count_providers(self) -> int:
+		"""distinct billing provider NPIs"""
+		return self.claim_table().count_distinct('billing_npi')
+
+	def count_payers(self) -> int:
+		return self.claim_table().count_distinct('payer_id')
 
-		patients = set(patients)
-		return len(patients)
\ No newline at end of file
+	def totals_by(self, by: str) -> pd.DataFrame:
+		"""claims, charges and payments grouped by payer, billing_npi, place_of_service or service_month"""
+		return self.claim_table().totals_by(by)
@@ -6,23 +6,109 @@ Includes dynamic parsing, CSV conversion, and comprehensive business format outp
 
 import os
 import json
+import time
 import uuid
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-from decimal import Decimal, ROUND_HALF_UP
 
 # Import configuration from config.py
 import config
+from edi_837_parser.dates import iso_date, iso_date_range, us_date
+from edi_837_parser.mapped_reader import map_file, read_mapped_delimiters, tokenize_mapped
+from edi_837_parser.money import format_money
+from manifest import ProcessingManifest
+from pipeline import iter_pipeline
+from output_writers import (
+    NDJSON_COMPRESSION_SUFFIXES, CSVRecordWriter, JSONArrayWriter, NDJSONWriter, ParquetRecordWriter,
+)
 
 # Use configuration from config.py
 EDI_DIRECTORY = config.EDI_DIRECTORY
 MAX_FILES = config.MAX_FILES
 EDI_FILE_EXTENSIONS = config.EDI_FILE_EXTENSIONS
+WORKERS = config.WORKERS
+OUTPUT_FORMAT = config.OUTPUT_FORMAT
+PARQUET_ROW_GROUP_SIZE = config.PARQUET_ROW_GROUP_SIZE
+MANIFEST_DIRECTORY = config.MANIFEST_DIRECTORY
+BUSINESS_FORMAT_OUTPUT = config.BUSINESS_FORMAT_OUTPUT
+NDJSON_COMPRESSION = config.NDJSON_COMPRESSION
+COMPACT_JSON = config.COMPACT_JSON
+ASYNC_PIPELINE = config.ASYNC_PIPELINE
+PIPELINE_QUEUE_SIZE = config.PIPELINE_QUEUE_SIZE
 
 # Debug: Print what we're reading from config
 print(f"DEBUG: Reading from config.py - EDI_DIRECTORY = {EDI_DIRECTORY}")
 
+class ParseState:
+    """Loops open at the current segment of a parse, shared by the segment handlers"""
+
+    def __init__(self, edi_data):
+        self.edi_data = edi_data
+        self.current_transaction = None
+        self.current_billing_provider = None
+        self.current_subscriber = None
+        self.current_claim = None
+        self.current_service_line = None
+
+
+class HandlerProfile:
+    """Calls and seconds spent per segment handler, collected by EDI837BusinessParser.profile_handlers()"""
+
+    def __init__(self):
+        self.calls = {}
+        self.seconds = {}
+
+    def record(self, segment_id, seconds):
+        self.calls[segment_id] = self.calls.get(segment_id, 0) + 1
+        self.seconds[segment_id] = self.seconds.get(segment_id, 0.0) + seconds
+
+    def report(self):
+        """One line per segment handler, most expensive first"""
+        lines = []
+        for segment_id in sorted(self.seconds, key=self.seconds.get, reverse=True):
+            calls = self.calls[segment_id]
+            seconds = self.seconds[segment_id]
+            lines.append(f"{segment_id:<5} {calls:>10,} calls {seconds:>9.3f}s {seconds / calls * 1e6:>8.1f}µs/call")
+        return lines
+
+
+# Segments that open the transaction, hierarchical level and claim loops every claim is built in
+CLAIM_STRUCTURE_SEGMENTS = frozenset({'ST', 'HL', 'CLM'})
+
+# Entity names with their addresses, references, contacts and demographics. Their handlers
+# attach each segment to the most recent entity, so they are only ever read together.
+ENTITY_SEGMENTS = frozenset({'NM1', 'N3', 'N4', 'REF', 'PRV', 'PER', 'DMG', 'SBR'})
+
+# Business format claim fields and the segments, besides CLAIM_STRUCTURE_SEGMENTS, they are
+# built from. LX opens the service lines, so service line segments are never mistaken for
+# claim ones.
+BUSINESS_FIELD_SEGMENTS = {
+    'id': frozenset(),
+    'objectType': frozenset(),
+    'patientControlNumber': frozenset(),
+    'chargeAmount': frozenset(),
+    'facilityCode': frozenset({'LX', 'SV1'}),
+    'placeOfServiceType': frozenset({'LX', 'SV1'}),
+    'frequencyCode': frozenset(),
+    'serviceDateFrom': frozenset({'DTP', 'LX'}),
+    'serviceDateTo': frozenset({'DTP', 'LX'}),
+    'subscriber': ENTITY_SEGMENTS,
+    'payer': ENTITY_SEGMENTS,
+    'providerSignatureIndicator': frozenset(),
+    'assignmentParticipationCode': frozenset(),
+    'assignmentCertificationIndicator': frozenset(),
+    'releaseOfInformationCode': frozenset(),
+    'originalReferenceNumber': frozenset({'BHT'}),
+    'billingProvider': ENTITY_SEGMENTS,
+    'providers': ENTITY_SEGMENTS,
+    'diags': frozenset({'HI'}),
+    'serviceLines': frozenset({'LX', 'SV1', 'DTP', 'HI'}),
+    'transaction': ENTITY_SEGMENTS | {'BHT'},
+}
+
+
 class EDI837BusinessParser:
     def __init__(self):
         # Lookup tables for business format conversion
@@ -261,18 +347,44 @@ class EDI837BusinessParser:
         self.PLACE_OF_SERVICE_SUBTYPE = "PLACE_OF_SERVICE"
         self.FREQUENCY_CODE_SUBTYPE = "FREQUENCY_CODE"
 
+        # Segment router for parse_edi_file, extend it with register_segment_handler()
+        self.segment_handlers = {
+            'ISA': self.handle_isa_segment,
+            'GS': self.handle_gs_segment,
+            'ST': self.handle_st_segment,
+            'BHT': self.handle_bht_segment,
+            'HL': self.handle_hl_segment,
+            'NM1': self.handle_nm1_segment,
+            'N3': self.handle_n3_segment,
+            'N4': self.handle_n4_segment,
+            'REF': self.handle_ref_segment,
+            'DMG': self.handle_dmg_segment,
+            'CLM': self.handle_clm_segment,
+            'DTP': self.handle_dtp_segment,
+            'HI': self.handle_hi_segment,
+            'LX': self.handle_lx_segment,
+            'SV1': self.handle_sv1_segment,
+            'SV2': self.handle_sv2_segment,
+            'SV3': self.handle_sv3_segment,
+            'PRV': self.handle_prv_segment,
+            'AMT': self.handle_amt_segment,
+            'QTY': self.handle_qty_segment,
+            'CAS': self.handle_cas_segment,
+            'NTE': self.handle_nte_segment,
+            'PER': self.handle_per_segment,
+            'SBR': self.handle_sbr_segment,
+        }
+        self.handler_profile = None
+
     def format_amount(self, amount_str):
         """Format monetary amount to preserve up to 6 decimal places without rounding"""
         if not amount_str or amount_str == "":
             return ""
         
         try:
-            # Convert to Decimal to preserve precision
-            decimal_amount = Decimal(str(amount_str))
-            # Format to string with up to 6 decimal places, removing trailing zeros
-            formatted = format(decimal_amount, '.6f').rstrip('0').rstrip('.')
-            return formatted
-        except (ValueError, TypeError):
+            # Exact fixed point, formatted with up to 6 decimal places and no trailing zeros
+            return format_money(amount_str)
+        except ValueError:
             return str(amount_str)
 
     def parse_isa_segment(self, elements):
@@ -588,15 +700,7 @@ class EDI837BusinessParser:
 
     def format_date(self, date_str):
         """Format date from YYYYMMDD to readable format"""
-        if not date_str or len(date_str) != 8:
-            return date_str
-        try:
-            year = date_str[:4]
-            month = date_str[4:6]
-            day = date_str[6:8]
-            return f"{month}/{day}/{year}"
-        except:
-            return date_str
+        return us_date(date_str)
 
     def format_time(self, time_str):
         """Format time from HHMM to readable format"""
@@ -625,31 +729,71 @@ class EDI837BusinessParser:
             return lookup_tables[code_type].get(code, code)
         return code
 
-    def convert_to_business_format(self, edi_data):
-        """Convert parsed EDI data to the specified JSON format"""
+    def convert_to_business_format(self, edi_data, fields=None):
+        """Convert parsed EDI data to the specified JSON format
+
+        With fields, a collection of BUSINESS_FIELD_SEGMENTS names, each claim only has
+        those fields and the nested objects of the others are never built.
+        """
         claims = []
+        wants = self.field_selector(fields)
         
         # Process transaction sets to extract claims
         for ts in edi_data.get("transaction_sets", []):
-            transaction_info = self.format_transaction_info(ts, edi_data)
+            if wants("transaction") or wants("originalReferenceNumber"):
+                transaction_info = self.format_transaction_info(ts, edi_data)
+            else:
+                transaction_info = {}
             
             # Process billing providers
             for bp in ts.get("billing_providers", []):
-                billing_provider = self.format_billing_provider(bp.get("provider_info", {}))
+                billing_provider = self.format_billing_provider(bp.get("provider_info", {})) if wants("billingProvider") else {}
                 
                 # Process subscribers
                 for sub in bp.get("subscribers", []):
-                    subscriber_info = self.format_subscriber_new(sub.get("subscriber_info", {}))
-                    payer_info = self.format_payer_new(sub.get("payer_info", {}))
+                    subscriber_info = self.format_subscriber_new(sub.get("subscriber_info", {})) if wants("subscriber") else {}
+                    payer_info = self.format_payer_new(sub.get("payer_info", {})) if wants("payer") else {}
                     
                     # Process claims
                     for claim in sub.get("claims", []):
-                        claim_obj = self.format_claim_new(claim, subscriber_info, payer_info, billing_provider, transaction_info, bp)
+                        claim_obj = self.format_claim_new(claim, subscriber_info, payer_info, billing_provider, transaction_info, bp, fields)
                         if claim_obj:
                             claims.append(claim_obj)
         
         return claims
 
+    def segments_for_fields(self, fields):
+        """The segment IDs the business format fields are built from, raising ValueError for unknown fields"""
+        unknown = [field for field in fields if field not in BUSINESS_FIELD_SEGMENTS]
+        if unknown:
+            raise ValueError(f"Unknown business format fields {unknown}, expected fields of {sorted(BUSINESS_FIELD_SEGMENTS)}")
+
+        segment_ids = set(CLAIM_STRUCTURE_SEGMENTS)
+        for field in fields:
+            segment_ids |= BUSINESS_FIELD_SEGMENTS[field]
+        return frozenset(segment_ids)
+
+    def extract_fields(self, file_path, fields):
+        """Claims of a file with only the given business format fields
+
+        Only the segments those fields are built from are split into elements and
+        handled, the tokenizer drops every other segment by its ID. A job that needs
+        claim IDs, charge amounts and procedure codes reads CLM, LX, SV1, DTP and HI and
+        skips the name, address, reference and payer segments altogether.
+        """
+        fields = tuple(fields)
+        edi_data = self.parse_edi_file(file_path, self.segments_for_fields(fields))
+        if not edi_data:
+            return []
+        return self.convert_to_business_format(edi_data, fields)
+
+    @staticmethod
+    def field_selector(fields):
+        """A predicate telling whether a business format field is wanted, every field when fields is None"""
+        if fields is None:
+            return lambda field: True
+        return frozenset(fields).__contains__
+
     def format_entity_info(self, entity_data):
         """Format entity information for business use"""
         if not entity_data:
@@ -875,11 +1019,13 @@ class EDI837BusinessParser:
         
         return payer
 
-    def format_claim_new(self, claim_data, subscriber_info, payer_info, billing_provider, transaction_info, bp):
-        """Format claim in new structure"""
+    def format_claim_new(self, claim_data, subscriber_info, payer_info, billing_provider, transaction_info, bp, fields=None):
+        """Format claim in new structure, with only the given fields when fields is set"""
         if not claim_data:
             return None
         
+        wants = self.field_selector(fields)
+        
         claim_info = claim_data.get("claim_info", {})
         
         # Get service dates - first try claim level, then use first service line date
@@ -889,21 +1035,18 @@ class EDI837BusinessParser:
         # Check claim-level dates first
         for date_info in claim_data.get("dates", []):
             if date_info.get("date_time_qualifier") == "472":  # Service date
-                service_date_from = self.format_date_iso(date_info.get("date_time_period", ""))
-                service_date_to = service_date_from
+                service_date_from, service_date_to = self.format_date_range_iso(date_info.get("date_time_period", ""))
                 break
             elif date_info.get("date_time_qualifier") == "454":  # Initial treatment date
                 if not service_date_from:
-                    service_date_from = self.format_date_iso(date_info.get("date_time_period", ""))
-                    service_date_to = service_date_from
+                    service_date_from, service_date_to = self.format_date_range_iso(date_info.get("date_time_period", ""))
         
         # If no claim-level dates, use first service line date
         if not service_date_from and claim_data.get("service_lines"):
             first_service_line = claim_data["service_lines"][0]
             for date_info in first_service_line.get("dates", []):
                 if date_info.get("date_time_qualifier") == "472":
-                    service_date_from = self.format_date_iso(date_info.get("date_time_period", ""))
-                    service_date_to = service_date_from
+                    service_date_from, service_date_to = self.format_date_range_iso(date_info.get("date_time_period", ""))
                     break
         
         # Get place of service from claim info first, then service lines
@@ -951,13 +1094,13 @@ class EDI837BusinessParser:
         }
         
         # Add providers
-        for provider in claim_data.get("providers", []):
+        for provider in claim_data.get("providers", []) if wants("providers") else ():
             provider_obj = self.format_provider_new(provider)
             if provider_obj:
                 claim["providers"].append(provider_obj)
         
-        # Add diagnosis codes
-        for diag_list in claim_data.get("diagnosis_codes", []):
+        # Add diagnosis codes, service lines refer to them too
+        for diag_list in claim_data.get("diagnosis_codes", []) if wants("diags") or wants("serviceLines") else ():
             if isinstance(diag_list, list):
                 for diag in diag_list:
                     diag_obj = self.format_diagnosis_new(diag)
@@ -965,11 +1108,14 @@ class EDI837BusinessParser:
                         claim["diags"].append(diag_obj)
         
         # Add service lines
-        for i, service_line in enumerate(claim_data.get("service_lines", []), 1):
+        for i, service_line in enumerate(claim_data.get("service_lines", []) if wants("serviceLines") else (), 1):
             service_obj = self.format_service_line_new(service_line, i, claim["diags"])
             if service_obj:
                 claim["serviceLines"].append(service_obj)
         
+        if fields is not None:
+            claim = {key: value for key, value in claim.items() if wants(key)}
+        
         return claim
 
     def format_provider_new(self, provider_data):
@@ -1089,7 +1235,11 @@ class EDI837BusinessParser:
         service_date_found = False
         for date_info in service_line_data.get("dates", []):
             if date_info.get("date_time_qualifier") == "472":  # Service date
-                service_line["serviceDateFrom"] = self.format_date_iso(date_info.get("date_time_period", ""))
+                date_from, date_to = self.format_date_range_iso(date_info.get("date_time_period", ""))
+                service_line["serviceDateFrom"] = date_from
+                # an RD8 service period also has an end date
+                if date_to != date_from:
+                    service_line["serviceDateTo"] = date_to
                 service_date_found = True
                 break
             elif date_info.get("date_time_qualifier") == "150":  # Service period start
@@ -1189,13 +1339,12 @@ class EDI837BusinessParser:
         return type_map.get(qualifier, qualifier)
 
     def format_date_iso(self, date_str):
-        """Format date to ISO format YYYY-MM-DD"""
-        if not date_str or len(date_str) != 8:
-            return ""
-        try:
-            return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-        except:
-            return ""
+        """Format date to ISO format YYYY-MM-DD, the first day of an RD8 range"""
+        return iso_date(date_str)
+
+    def format_date_range_iso(self, date_str):
+        """Format a D8 date or RD8 range to ISO (from, to); a single date is both"""
+        return iso_date_range(date_str)
 
     def format_time_iso(self, time_str):
         """Format time to ISO format HH:MM:SS"""
@@ -1211,26 +1360,45 @@ class EDI837BusinessParser:
             return f"{code[:3]}.{code[3:]}"
         return code
 
-    def parse_edi_file(self, file_path):
-        """Parse a single EDI file and return structured data"""
+    def read_segments(self, file_path, segment_ids=None, content=None):
+        """Return the segments of a file as lists of elements, or None when it has none
+
+        Files with an ISA header are memory mapped and tokenized one window at a time
+        instead of being read into a single string. content, the file's bytes when they
+        were already read, is tokenized in place of the mapping. With segment_ids only
+        segments with one of those IDs are returned.
+        """
+        buffer = map_file(file_path) if content is None else content or None
+        if buffer is None:
+            return None
+
+        delimiters = read_mapped_delimiters(buffer)
+        if delimiters:
+            return tokenize_mapped(buffer, delimiters, errors='ignore', segment_ids=segment_ids)
+
+        content = buffer[:].decode('utf-8', errors='ignore').strip()
+        if not content:
+            return None
+
+        # Without an ISA header try the common segment delimiters
+        segments = []
+        if '~' in content:
+            segments = [seg.strip() for seg in content.split('~') if seg.strip()]
+        else:
+            for delimiter in ['\n', '\r\n', '|']:
+                if delimiter in content:
+                    segments = [seg.strip() for seg in content.split(delimiter) if seg.strip()]
+                    break
+
+        elements = [segment.split('*') for segment in segments]
+        if segment_ids is not None:
+            elements = [segment for segment in elements if segment[0] in segment_ids]
+        return elements
+
+    def parse_edi_file(self, file_path, segment_ids=None, content=None):
+        """Parse a single EDI file and return structured data, reading only segment_ids when given"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                content = file.read().strip()
-            
-            if not content:
-                return None
-            
-            # Split into segments
-            segments = []
-            if '~' in content:
-                segments = [seg.strip() for seg in content.split('~') if seg.strip()]
-            else:
-                # Try other common delimiters
-                for delimiter in ['\n', '\r\n', '|']:
-                    if delimiter in content:
-                        segments = [seg.strip() for seg in content.split(delimiter) if seg.strip()]
-                        break
-            
+            segments = self.read_segments(file_path, segment_ids, content)
             if not segments:
                 return None
             
@@ -1246,313 +1414,24 @@ class EDI837BusinessParser:
                 "transaction_sets": []
             }
             
-            current_transaction = None
-            current_billing_provider = None
-            current_subscriber = None
-            current_claim = None
-            current_service_line = None
-            
-            for segment in segments:
-                if not segment:
-                    continue
-                
-                elements = segment.split('*')
+            state = ParseState(edi_data)
+            handlers = self.segment_handlers
+            profile = self.handler_profile
+
+            for elements in segments:
                 segment_id = elements[0]
-                
+                handler = handlers.get(segment_id)
+                if handler is None:
+                    continue
+
                 try:
-                    if segment_id == 'ISA':
-                        edi_data["interchange_header"] = self.parse_isa_segment(elements)
-                    
-                    elif segment_id == 'GS':
-                        edi_data["functional_group"] = self.parse_gs_segment(elements)
-                    
-                    elif segment_id == 'ST':
-                        current_transaction = {
-                            "transaction_set_header": self.parse_st_segment(elements),
-                            "beginning_hierarchical_transaction": {},
-                            "submitter": {},
-                            "receiver": {},
-                            "billing_providers": []
-                        }
-                        edi_data["transaction_sets"].append(current_transaction)
-                    
-                    elif segment_id == 'BHT' and current_transaction:
-                        current_transaction["beginning_hierarchical_transaction"] = self.parse_bht_segment(elements)
-                    
-                    elif segment_id == 'HL' and current_transaction:
-                        hl_data = self.parse_hl_segment(elements)
-                        level_code = hl_data.get("hierarchical_level_code", "")
-                        hierarchical_id = hl_data.get("hierarchical_id_number", "")
-                        parent_id = hl_data.get("hierarchical_parent_id_number", "")
-                        
-                        if level_code == "20":  # Loop 2000A - Billing Provider Level
-                            current_billing_provider = {
-                                "hierarchical_level": hl_data,
-                                "hierarchical_id": hierarchical_id,
-                                "provider_info": {},
-                                "subscribers": []
-                            }
-                            current_transaction["billing_providers"].append(current_billing_provider)
-                            current_subscriber = None
-                            current_claim = None
-                            current_service_line = None
-                        
-                        elif level_code == "22" and current_billing_provider:  # Loop 2000B - Subscriber Level
-                            current_subscriber = {
-                                "hierarchical_level": hl_data,
-                                "hierarchical_id": hierarchical_id,
-                                "parent_id": parent_id,
-                                "subscriber_info": {},
-                                "payer_info": {},
-                                "secondary_payers": [],  # For multiple payers
-                                "claims": []
-                            }
-                            current_billing_provider["subscribers"].append(current_subscriber)
-                            current_claim = None
-                            current_service_line = None
-                        
-                        elif level_code == "23" and current_subscriber:  # Loop 2000C - Patient Level (if different from subscriber)
-                            # Patient level - usually when patient is different from subscriber
-                            current_subscriber["patient_info"] = {
-                                "hierarchical_level": hl_data,
-                                "hierarchical_id": hierarchical_id,
-                                "parent_id": parent_id
-                            }
-                    
-                    elif segment_id == 'NM1' and current_transaction:
-                        nm1_data = self.parse_nm1_segment(elements)
-                        entity_code = nm1_data.get("entity_identifier_code", "")
-                        
-                        if entity_code == "41":  # Loop 1000A - Submitter
-                            current_transaction["submitter"] = nm1_data
-                        elif entity_code == "40":  # Loop 1000B - Receiver
-                            current_transaction["receiver"] = nm1_data
-                        elif entity_code == "85" and current_billing_provider:  # Loop 2010AA - Billing Provider
-                            current_billing_provider["provider_info"] = nm1_data
-                        elif entity_code == "87" and current_billing_provider:  # Loop 2010AB - Pay-to Provider
-                            current_billing_provider["pay_to_provider"] = nm1_data
-                        elif entity_code == "IL" and current_subscriber:  # Loop 2010BA - Subscriber
-                            # Check if this is for secondary payer
-                            if current_subscriber["secondary_payers"] and len(current_subscriber["secondary_payers"]) > 0:
-                                # This is for the most recent secondary payer
-                                current_subscriber["secondary_payers"][-1]["subscriber_info"].update(nm1_data)
-                            else:
-                                # Primary subscriber
-                                if "subscriber_info" not in current_subscriber:
-                                    current_subscriber["subscriber_info"] = {}
-                                current_subscriber["subscriber_info"].update(nm1_data)
-                        elif entity_code == "PR" and current_subscriber:  # Loop 2010BB - Payer
-                            # Check if this is for secondary payer
-                            if current_subscriber["secondary_payers"] and len(current_subscriber["secondary_payers"]) > 0:
-                                # This is for the most recent secondary payer
-                                current_subscriber["secondary_payers"][-1]["payer_info"] = nm1_data
-                            else:
-                                # Primary payer
-                                current_subscriber["payer_info"] = nm1_data
-                        elif entity_code == "QC" and current_subscriber:  # Loop 2010BC - Patient (if different from subscriber)
-                            if "patient_info" not in current_subscriber:
-                                current_subscriber["patient_info"] = {}
-                            current_subscriber["patient_info"]["patient_data"] = nm1_data
-                        elif entity_code in ["DN", "82", "77", "DQ", "85"] and current_claim:  # Loop 2310 - Various provider types
-                            provider_role_map = {
-                                "DN": "REFERRING_PROVIDER",      # Loop 2310A - Referring Provider
-                                "82": "RENDERING_PROVIDER",      # Loop 2310B - Rendering Provider  
-                                "77": "SERVICE_FACILITY", # Loop 2310C - Service Facility
-                                "DQ": "SUPERVISING_PROVIDER",    # Loop 2310D - Supervising Provider
-                                "85": "BILLING_PROVIDER"         # Loop 2310E - Billing Provider (if different)
-                            }
-                            provider_info = {
-                                "provider_role": provider_role_map.get(entity_code, ""),
-                                "provider_data": nm1_data,
-                                "address": {},
-                                "references": []
-                            }
-                            if "providers" not in current_claim:
-                                current_claim["providers"] = []
-                            current_claim["providers"].append(provider_info)
-                    
-                    elif segment_id == 'N3':
-                        n3_data = self.parse_n3_segment(elements)
-                        # Add address to the most recent entity
-                        if current_claim and "providers" in current_claim and current_claim["providers"]:
-                            if "address" not in current_claim["providers"][-1]:
-                                current_claim["providers"][-1]["address"] = {}
-                            current_claim["providers"][-1]["address"].update(n3_data)
-                        elif current_subscriber and "payer_info" in current_subscriber and current_subscriber["payer_info"] and "address" not in current_subscriber["payer_info"]:
-                            current_subscriber["payer_info"]["address"] = n3_data
-                        elif current_subscriber and "address" not in current_subscriber["subscriber_info"]:
-                            current_subscriber["subscriber_info"]["address"] = n3_data
-                        elif current_billing_provider and "address" not in current_billing_provider["provider_info"]:
-                            current_billing_provider["provider_info"]["address"] = n3_data
-                    
-                    elif segment_id == 'N4':
-                        n4_data = self.parse_n4_segment(elements)
-                        # Add geographic info to the most recent address
-                        if current_claim and "providers" in current_claim and current_claim["providers"]:
-                            if "address" not in current_claim["providers"][-1]:
-                                current_claim["providers"][-1]["address"] = {}
-                            current_claim["providers"][-1]["address"].update(n4_data)
-                        elif current_subscriber and "payer_info" in current_subscriber and current_subscriber["payer_info"] and "address" in current_subscriber["payer_info"]:
-                            current_subscriber["payer_info"]["address"].update(n4_data)
-                        elif current_subscriber and "address" in current_subscriber["subscriber_info"]:
-                            current_subscriber["subscriber_info"]["address"].update(n4_data)
-                        elif current_billing_provider and "address" in current_billing_provider["provider_info"]:
-                            current_billing_provider["provider_info"]["address"].update(n4_data)
-                    
-                    elif segment_id == 'REF':
-                        ref_data = self.parse_ref_segment(elements)
-                        # Add reference to appropriate entity
-                        if current_claim and "providers" in current_claim and current_claim["providers"]:
-                            if "references" not in current_claim["providers"][-1]:
-                                current_claim["providers"][-1]["references"] = []
-                            current_claim["providers"][-1]["references"].append(ref_data)
-                        elif current_billing_provider and ref_data.get("reference_identification_qualifier") in self.TAX_ID_QUALIFIERS:
-                            # Tax ID for billing provider
-                            current_billing_provider["provider_info"]["tax_identification_number"] = ref_data.get("reference_identification", "")
-                            current_billing_provider["provider_info"]["tax_identification_qualifier"] = ref_data.get("reference_identification_qualifier", "")
-                        elif current_subscriber:
-                            if "references" not in current_subscriber["subscriber_info"]:
-                                current_subscriber["subscriber_info"]["references"] = []
-                            current_subscriber["subscriber_info"]["references"].append(ref_data)
-                    
-                    elif segment_id == 'DMG' and current_subscriber:
-                        current_subscriber["subscriber_info"]["demographics"] = self.parse_dmg_segment(elements)
-                    
-                    elif segment_id == 'CLM' and current_subscriber:
-                        # Loop 2300 - Claim Information
-                        current_claim = {
-                            "claim_info": self.parse_clm_segment(elements),
-                            "dates": [],
-                            "diagnosis_codes": [],
-                            "service_lines": [],
-                            "providers": [],
-                            "references": [],
-                            "amounts": [],
-                            "notes": [],
-                            "adjustments": []
-                        }
-                        current_subscriber["claims"].append(current_claim)
-                        current_service_line = None
-                    
-                    elif segment_id == 'DTP':
-                        dtp_data = self.parse_dtp_segment(elements)
-                        if current_service_line:
-                            # Service line level date
-                            current_service_line["dates"].append(dtp_data)
-                        elif current_claim:
-                            # Claim level date
-                            current_claim["dates"].append(dtp_data)
-                        elif current_subscriber:
-                            # Subscriber level date (rare)
-                            if "dates" not in current_subscriber:
-                                current_subscriber["dates"] = []
-                            current_subscriber["dates"].append(dtp_data)
-                    
-                    elif segment_id == 'HI' and current_claim:
-                        current_claim["diagnosis_codes"].append(self.parse_hi_segment(elements))
-                    
-                    elif segment_id == 'LX' and current_claim:
-                        # Loop 2400 - Service Line Information
-                        lx_data = self.parse_lx_segment(elements)
-                        current_service_line = {
-                            "line_number": lx_data.get("assigned_number", ""),
-                            "service_info": {},
-                            "dates": [],
-                            "references": [],
-                            "amounts": [],
-                            "quantities": [],
-                            "adjustments": [],
-                            "notes": [],
-                            "providers": []  # Line-level providers
-                        }
-                        current_claim["service_lines"].append(current_service_line)
-                    
-                    elif segment_id == 'SV1' and current_service_line:
-                        # Professional Service - core of Loop 2400
-                        current_service_line["service_info"] = self.parse_sv1_segment(elements)
-                    
-                    elif segment_id == 'SV2' and current_service_line:
-                        # Institutional Service Line
-                        current_service_line["institutional_service_info"] = self.parse_sv2_segment(elements)
-                    
-                    elif segment_id == 'SV3' and current_service_line:
-                        # Dental Service
-                        current_service_line["dental_service_info"] = self.parse_sv3_segment(elements)
-                    
-                    elif segment_id == 'PRV':
-                        prv_data = self.parse_prv_segment(elements)
-                        # Add provider specialty info to the most recent provider
-                        if current_service_line and "providers" in current_service_line and current_service_line["providers"]:
-                            # Line-level provider
-                            current_service_line["providers"][-1]["provider_taxonomy"] = prv_data.get("reference_identification", "")
-                        elif current_claim and "providers" in current_claim and current_claim["providers"]:
-                            # Claim-level provider
-                            current_claim["providers"][-1]["provider_taxonomy"] = prv_data.get("reference_identification", "")
-                        elif current_billing_provider:
-                            # Billing provider level
-                            current_billing_provider["provider_info"]["provider_taxonomy"] = prv_data.get("reference_identification", "")
-                    
-                    elif segment_id == 'AMT':
-                        amt_data = self.parse_amt_segment(elements)
-                        if current_service_line:
-                            # Service line level amount
-                            current_service_line["amounts"].append(amt_data)
-                        elif current_claim:
-                            # Claim level amount
-                            current_claim["amounts"].append(amt_data)
-                    
-                    elif segment_id == 'QTY':
-                        qty_data = self.parse_qty_segment(elements)
-                        if current_service_line:
-                            # Service line level quantity
-                            current_service_line["quantities"].append(qty_data)
-                        elif current_claim:
-                            # Claim level quantity (rare)
-                            if "quantities" not in current_claim:
-                                current_claim["quantities"] = []
-                            current_claim["quantities"].append(qty_data)
-                    
-                    elif segment_id == 'CAS':
-                        cas_data = self.parse_cas_segment(elements)
-                        if current_service_line:
-                            # Service line level adjustment
-                            current_service_line["adjustments"].extend(cas_data)
-                        elif current_claim:
-                            # Claim level adjustment
-                            current_claim["adjustments"].extend(cas_data)
-                    
-                    elif segment_id == 'NTE':
-                        nte_data = self.parse_nte_segment(elements)
-                        if current_service_line:
-                            # Service line level note
-                            current_service_line["notes"].append(nte_data)
-                        elif current_claim:
-                            # Claim level note
-                            current_claim["notes"].append(nte_data)
-                    
-                    elif segment_id == 'PER':
-                        per_data = self.parse_per_segment(elements)
-                        # Add contact info to appropriate entity
-                        if current_billing_provider:
-                            current_billing_provider["provider_info"]["contact_info"] = per_data
-                        elif current_transaction and "submitter" in current_transaction:
-                            current_transaction["submitter"]["contact_info"] = per_data
-                    
-                    elif segment_id == 'SBR' and current_subscriber:
-                        sbr_data = self.parse_sbr_segment(elements)
-                        payer_sequence = sbr_data.get("payer_responsibility_sequence_number_code", "")
-                        
-                        if payer_sequence == "P":  # Primary payer
-                            current_subscriber["subscriber_info"].update(sbr_data)
-                        else:  # Secondary, Tertiary, etc.
-                            # Create secondary payer entry
-                            secondary_payer = {
-                                "payer_sequence": payer_sequence,
-                                "subscriber_info": sbr_data,
-                                "payer_info": {}
-                            }
-                            current_subscriber["secondary_payers"].append(secondary_payer)
-                
+                    if profile is None:
+                        handler(state, elements)
+                    else:
+                        started = time.perf_counter()
+                        handler(state, elements)
+                        profile.record(segment_id, time.perf_counter() - started)
+
                 except Exception as e:
                     print(f"Error processing segment {segment_id}: {str(e)}")
                     continue
@@ -1563,8 +1442,1066 @@ class EDI837BusinessParser:
             print(f"Error parsing file {file_path}: {str(e)}")
             return None
 
+    def register_segment_handler(self, segment_id, handler):
+        """Route segment_id to handler(state, elements), adding a segment or replacing a built-in one
+
+        Custom segments such as K3, PWK, CN1 or HCP plug in here; the handler reads the
+        open loops from state (current_claim, current_service_line, ...) and records what
+        it extracts on them.
+        """
+        self.segment_handlers[segment_id] = handler
+
+    def profile_handlers(self):
+        """Time every handler call of the following parses, returning the HandlerProfile that collects them"""
+        self.handler_profile = HandlerProfile()
+        return self.handler_profile
+
+    def handle_isa_segment(self, state, elements):
+        """Interchange Control Header"""
+        state.edi_data["interchange_header"] = self.parse_isa_segment(elements)
+
+    def handle_gs_segment(self, state, elements):
+        """Functional Group Header"""
+        state.edi_data["functional_group"] = self.parse_gs_segment(elements)
+
+    def handle_st_segment(self, state, elements):
+        """Transaction Set Header, opens a new transaction"""
+        state.current_transaction = {
+            "transaction_set_header": self.parse_st_segment(elements),
+            "beginning_hierarchical_transaction": {},
+            "submitter": {},
+            "receiver": {},
+            "billing_providers": []
+        }
+        state.edi_data["transaction_sets"].append(state.current_transaction)
+
+    def handle_bht_segment(self, state, elements):
+        """Beginning of Hierarchical Transaction"""
+        if not state.current_transaction:
+            return
+
+        state.current_transaction["beginning_hierarchical_transaction"] = self.parse_bht_segment(elements)
+
+    def handle_hl_segment(self, state, elements):
+        """Hierarchical Level, opens the billing provider, subscriber and patient loops"""
+        if not state.current_transaction:
+            return
+
+        hl_data = self.parse_hl_segment(elements)
+        level_code = hl_data.get("hierarchical_level_code", "")
+        hierarchical_id = hl_data.get("hierarchical_id_number", "")
+        parent_id = hl_data.get("hierarchical_parent_id_number", "")
+
+        if level_code == "20":  # Loop 2000A - Billing Provider Level
+            state.current_billing_provider = {
+                "hierarchical_level": hl_data,
+                "hierarchical_id": hierarchical_id,
+                "provider_info": {},
+                "subscribers": []
+            }
+            state.current_transaction["billing_providers"].append(state.current_billing_provider)
+            state.current_subscriber = None
+            state.current_claim = None
+            state.current_service_line = None
+
+        elif level_code == "22" and state.current_billing_provider:  # Loop 2000B - Subscriber Level
+            state.current_subscriber = {
+                "hierarchical_level": hl_data,
+                "hierarchical_id": hierarchical_id,
+                "parent_id": parent_id,
+                "subscriber_info": {},
+                "payer_info": {},
+                "secondary_payers": [],  # For multiple payers
+                "claims": []
+            }
+            state.current_billing_provider["subscribers"].append(state.current_subscriber)
+            state.current_claim = None
+            state.current_service_line = None
+
+        elif level_code == "23" and state.current_subscriber:  # Loop 2000C - Patient Level (if different from subscriber)
+            # Patient level - usually when patient is different from subscriber
+            state.current_subscriber["patient_info"] = {
+                "hierarchical_level": hl_data,
+                "hierarchical_id": hierarchical_id,
+                "parent_id": parent_id
+            }
+
+    def handle_nm1_segment(self, state, elements):
+        """Individual or Organizational Name, assigned to the entity of the current loop"""
+        if not state.current_transaction:
+            return
+
+        nm1_data = self.parse_nm1_segment(elements)
+        entity_code = nm1_data.get("entity_identifier_code", "")
+
+        if entity_code == "41":  # Loop 1000A - Submitter
+            state.current_transaction["submitter"] = nm1_data
+        elif entity_code == "40":  # Loop 1000B - Receiver
+            state.current_transaction["receiver"] = nm1_data
+        elif entity_code == "85" and state.current_billing_provider:  # Loop 2010AA - Billing Provider
+            state.current_billing_provider["provider_info"] = nm1_data
+        elif entity_code == "87" and state.current_billing_provider:  # Loop 2010AB - Pay-to Provider
+            state.current_billing_provider["pay_to_provider"] = nm1_data
+        elif entity_code == "IL" and state.current_subscriber:  # Loop 2010BA - Subscriber
+            # Check if this is for secondary payer
+            if state.current_subscriber["secondary_payers"] and len(state.current_subscriber["secondary_payers"]) > 0:
+                # This is for the most recent secondary payer
+                state.current_subscriber["secondary_payers"][-1]["subscriber_info"].update(nm1_data)
+            else:
+                # Primary subscriber
+                if "subscriber_info" not in state.current_subscriber:
+                    state.current_subscriber["subscriber_info"] = {}
+                state.current_subscriber["subscriber_info"].update(nm1_data)
+        elif entity_code == "PR" and state.current_subscriber:  # Loop 2010BB - Payer
+            # Check if this is for secondary payer
+            if state.current_subscriber["secondary_payers"] and len(state.current_subscriber["secondary_payers"]) > 0:
+                # This is for the most recent secondary payer
+                state.current_subscriber["secondary_payers"][-1]["payer_info"] = nm1_data
+            else:
+                # Primary payer
+                state.current_subscriber["payer_info"] = nm1_data
+        elif entity_code == "QC" and state.current_subscriber:  # Loop 2010BC - Patient (if different from subscriber)
+            if "patient_info" not in state.current_subscriber:
+                state.current_subscriber["patient_info"] = {}
+            state.current_subscriber["patient_info"]["patient_data"] = nm1_data
+        elif entity_code in ["DN", "82", "77", "DQ", "85"] and state.current_claim:  # Loop 2310 - Various provider types
+            provider_role_map = {
+                "DN": "REFERRING_PROVIDER",      # Loop 2310A - Referring Provider
+                "82": "RENDERING_PROVIDER",      # Loop 2310B - Rendering Provider
+                "77": "SERVICE_FACILITY", # Loop 2310C - Service Facility
+                "DQ": "SUPERVISING_PROVIDER",    # Loop 2310D - Supervising Provider
+                "85": "BILLING_PROVIDER"         # Loop 2310E - Billing Provider (if different)
+            }
+            provider_info = {
+                "provider_role": provider_role_map.get(entity_code, ""),
+                "provider_data": nm1_data,
+                "address": {},
+                "references": []
+            }
+            if "providers" not in state.current_claim:
+                state.current_claim["providers"] = []
+            state.current_claim["providers"].append(provider_info)
+
+    def handle_n3_segment(self, state, elements):
+        """Party Location of the most recent entity"""
+        n3_data = self.parse_n3_segment(elements)
+        # Add address to the most recent entity
+        if state.current_claim and "providers" in state.current_claim and state.current_claim["providers"]:
+            if "address" not in state.current_claim["providers"][-1]:
+                state.current_claim["providers"][-1]["address"] = {}
+            state.current_claim["providers"][-1]["address"].update(n3_data)
+        elif state.current_subscriber and "payer_info" in state.current_subscriber and state.current_subscriber["payer_info"] and "address" not in state.current_subscriber["payer_info"]:
+            state.current_subscriber["payer_info"]["address"] = n3_data
+        elif state.current_subscriber and "address" not in state.current_subscriber["subscriber_info"]:
+            state.current_subscriber["subscriber_info"]["address"] = n3_data
+        elif state.current_billing_provider and "address" not in state.current_billing_provider["provider_info"]:
+            state.current_billing_provider["provider_info"]["address"] = n3_data
+
+    def handle_n4_segment(self, state, elements):
+        """Geographic Location of the most recent entity"""
+        n4_data = self.parse_n4_segment(elements)
+        # Add geographic info to the most recent address
+        if state.current_claim and "providers" in state.current_claim and state.current_claim["providers"]:
+            if "address" not in state.current_claim["providers"][-1]:
+                state.current_claim["providers"][-1]["address"] = {}
+            state.current_claim["providers"][-1]["address"].update(n4_data)
+        elif state.current_subscriber and "payer_info" in state.current_subscriber and state.current_subscriber["payer_info"] and "address" in state.current_subscriber["payer_info"]:
+            state.current_subscriber["payer_info"]["address"].update(n4_data)
+        elif state.current_subscriber and "address" in state.current_subscriber["subscriber_info"]:
+            state.current_subscriber["subscriber_info"]["address"].update(n4_data)
+        elif state.current_billing_provider and "address" in state.current_billing_provider["provider_info"]:
+            state.current_billing_provider["provider_info"]["address"].update(n4_data)
+
+    def handle_ref_segment(self, state, elements):
+        """Reference Identification"""
+        ref_data = self.parse_ref_segment(elements)
+        # Add reference to appropriate entity
+        if state.current_claim and "providers" in state.current_claim and state.current_claim["providers"]:
+            if "references" not in state.current_claim["providers"][-1]:
+                state.current_claim["providers"][-1]["references"] = []
+            state.current_claim["providers"][-1]["references"].append(ref_data)
+        elif state.current_billing_provider and ref_data.get("reference_identification_qualifier") in self.TAX_ID_QUALIFIERS:
+            # Tax ID for billing provider
+            state.current_billing_provider["provider_info"]["tax_identification_number"] = ref_data.get("reference_identification", "")
+            state.current_billing_provider["provider_info"]["tax_identification_qualifier"] = ref_data.get("reference_identification_qualifier", "")
+        elif state.current_subscriber:
+            if "references" not in state.current_subscriber["subscriber_info"]:
+                state.current_subscriber["subscriber_info"]["references"] = []
+            state.current_subscriber["subscriber_info"]["references"].append(ref_data)
+
+    def handle_dmg_segment(self, state, elements):
+        """Subscriber Demographic Information"""
+        if not state.current_subscriber:
+            return
+
+        state.current_subscriber["subscriber_info"]["demographics"] = self.parse_dmg_segment(elements)
+
+    def handle_clm_segment(self, state, elements):
+        """Claim Information, opens Loop 2300"""
+        if not state.current_subscriber:
+            return
+
+        # Loop 2300 - Claim Information
+        state.current_claim = {
+            "claim_info": self.parse_clm_segment(elements),
+            "dates": [],
+            "diagnosis_codes": [],
+            "service_lines": [],
+            "providers": [],
+            "references": [],
+            "amounts": [],
+            "notes": [],
+            "adjustments": []
+        }
+        state.current_subscriber["claims"].append(state.current_claim)
+        state.current_service_line = None
+
+    def handle_dtp_segment(self, state, elements):
+        """Date or Time Period"""
+        dtp_data = self.parse_dtp_segment(elements)
+        if state.current_service_line:
+            # Service line level date
+            state.current_service_line["dates"].append(dtp_data)
+        elif state.current_claim:
+            # Claim level date
+            state.current_claim["dates"].append(dtp_data)
+        elif state.current_subscriber:
+            # Subscriber level date (rare)
+            if "dates" not in state.current_subscriber:
+                state.current_subscriber["dates"] = []
+            state.current_subscriber["dates"].append(dtp_data)
+
+    def handle_hi_segment(self, state, elements):
+        """Health Care Diagnosis Codes"""
+        if not state.current_claim:
+            return
+
+        state.current_claim["diagnosis_codes"].append(self.parse_hi_segment(elements))
+
+    def handle_lx_segment(self, state, elements):
+        """Service Line Number, opens Loop 2400"""
+        if not state.current_claim:
+            return
+
+        # Loop 2400 - Service Line Information
+        lx_data = self.parse_lx_segment(elements)
+        state.current_service_line = {
+            "line_number": lx_data.get("assigned_number", ""),
+            "service_info": {},
+            "dates": [],
+            "references": [],
+            "amounts": [],
+            "quantities": [],
+            "adjustments": [],
+            "notes": [],
+            "providers": []  # Line-level providers
+        }
+        state.current_claim["service_lines"].append(state.current_service_line)
+
+    def handle_sv1_segment(self, state, elements):
+        """Professional Service"""
+        if not state.current_service_line:
+            return
+
+        # Professional Service - core of Loop 2400
+        state.current_service_line["service_info"] = self.parse_sv1_segment(elements)
+
+    def handle_sv2_segment(self, state, elements):
+        """Institutional Service Line"""
+        if not state.current_service_line:
+            return
+
+        # Institutional Service Line
+        state.current_service_line["institutional_service_info"] = self.parse_sv2_segment(elements)
+
+    def handle_sv3_segment(self, state, elements):
+        """Dental Service"""
+        if not state.current_service_line:
+            return
+
+        # Dental Service
+        state.current_service_line["dental_service_info"] = self.parse_sv3_segment(elements)
+
+    def handle_prv_segment(self, state, elements):
+        """Provider Specialty Information"""
+        prv_data = self.parse_prv_segment(elements)
+        # Add provider specialty info to the most recent provider
+        if state.current_service_line and "providers" in state.current_service_line and state.current_service_line["providers"]:
+            # Line-level provider
+            state.current_service_line["providers"][-1]["provider_taxonomy"] = prv_data.get("reference_identification", "")
+        elif state.current_claim and "providers" in state.current_claim and state.current_claim["providers"]:
+            # Claim-level provider
+            state.current_claim["providers"][-1]["provider_taxonomy"] = prv_data.get("reference_identification", "")
+        elif state.current_billing_provider:
+            # Billing provider level
+            state.current_billing_provider["provider_info"]["provider_taxonomy"] = prv_data.get("reference_identification", "")
+
+    def handle_amt_segment(self, state, elements):
+        """Monetary Amount"""
+        amt_data = self.parse_amt_segment(elements)
+        if state.current_service_line:
+            # Service line level amount
+            state.current_service_line["amounts"].append(amt_data)
+        elif state.current_claim:
+            # Claim level amount
+            state.current_claim["amounts"].append(amt_data)
+
+    def handle_qty_segment(self, state, elements):
+        """Quantity Information"""
+        qty_data = self.parse_qty_segment(elements)
+        if state.current_service_line:
+            # Service line level quantity
+            state.current_service_line["quantities"].append(qty_data)
+        elif state.current_claim:
+            # Claim level quantity (rare)
+            if "quantities" not in state.current_claim:
+                state.current_claim["quantities"] = []
+            state.current_claim["quantities"].append(qty_data)
+
+    def handle_cas_segment(self, state, elements):
+        """Claim or Service Adjustment"""
+        cas_data = self.parse_cas_segment(elements)
+        if state.current_service_line:
+            # Service line level adjustment
+            state.current_service_line["adjustments"].extend(cas_data)
+        elif state.current_claim:
+            # Claim level adjustment
+            state.current_claim["adjustments"].extend(cas_data)
+
+    def handle_nte_segment(self, state, elements):
+        """Note/Special Instruction"""
+        nte_data = self.parse_nte_segment(elements)
+        if state.current_service_line:
+            # Service line level note
+            state.current_service_line["notes"].append(nte_data)
+        elif state.current_claim:
+            # Claim level note
+            state.current_claim["notes"].append(nte_data)
+
+    def handle_per_segment(self, state, elements):
+        """Administrative Communications Contact"""
+        per_data = self.parse_per_segment(elements)
+        # Add contact info to appropriate entity
+        if state.current_billing_provider:
+            state.current_billing_provider["provider_info"]["contact_info"] = per_data
+        elif state.current_transaction and "submitter" in state.current_transaction:
+            state.current_transaction["submitter"]["contact_info"] = per_data
+
+    def handle_sbr_segment(self, state, elements):
+        """Subscriber Information, primary or other payer"""
+        if not state.current_subscriber:
+            return
+
+        sbr_data = self.parse_sbr_segment(elements)
+        payer_sequence = sbr_data.get("payer_responsibility_sequence_number_code", "")
+
+        if payer_sequence == "P":  # Primary payer
+            state.current_subscriber["subscriber_info"].update(sbr_data)
+        else:  # Secondary, Tertiary, etc.
+            # Create secondary payer entry
+            secondary_payer = {
+                "payer_sequence": payer_sequence,
+                "subscriber_info": sbr_data,
+                "payer_info": {}
+            }
+            state.current_subscriber["secondary_payers"].append(secondary_payer)
+
 # Removed find_edi_directories() function - no longer needed with path-based configuration
 
+# Parser owned by each worker process, created once by the pool initializer
+_worker_parser = None
+
+
+def _init_worker():
+    """Build the lookup tables once per worker process instead of once per file"""
+    global _worker_parser
+    _worker_parser = EDI837BusinessParser()
+
+
+def _process_file_in_worker(file_path):
+    return process_edi_file(_worker_parser, file_path)
+
+
+def _process_content_in_worker(file_path, content):
+    return process_edi_file(_worker_parser, file_path, content)
+
+
+def _process_payload_in_worker(file_path, content):
+    return process_edi_file(_worker_parser, file_path, content, require_transaction_set=True)
+
+
+def process_edi_file(parser, file_path, content=None, require_transaction_set=False):
+    """Parse and convert a single EDI file, returning (claims, error) so one bad file never stops a batch
+
+    error is the exception the file failed with, None when it succeeded; test it with
+    `is not None`, an exception's message may be empty. With require_transaction_set a
+    file without an ST transaction set fails instead of having no claims.
+    """
+    try:
+        edi_data = parser.parse_edi_file(file_path, content=content)
+        if require_transaction_set and not (edi_data and edi_data["transaction_sets"]):
+            return [], ValueError("No ISA/ST transaction set found, not an X12 837")
+        if not edi_data:
+            return [], None
+
+        # Convert to business format (returns list of claims)
+        return parser.convert_to_business_format(edi_data) or [], None
+
+    except Exception as e:
+        return [], e
+
+
+def format_error(error):
+    """The message of an error returned by process_edi_file, never empty"""
+    return str(error) or type(error).__name__
+
+
+def read_edi_file(file_path):
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
+def iter_pipelined_files(edi_files, workers=1, queue_size=4):
+    """Yield (file_path, claims, error) like iter_processed_files from the asyncio pipeline
+
+    Files are read in threads, parsed and converted in a pool of WORKERS processes and
+    written by the caller, all at once, with at most queue_size files waiting between two
+    stages. Reads from slow storage then overlap with the parsing and the writing, and
+    memory stays flat however many files there are.
+    """
+    workers = workers or os.cpu_count() or 1
+    remaining = list(edi_files)
+    while remaining:
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            results = iter_pipeline(remaining, read_edi_file, _process_content_in_worker, executor, queue_size)
+            try:
+                for file_path, result, error in results:
+                    if isinstance(error, BrokenProcessPool):
+                        # like in iter_processed_files, only the file that kills a worker
+                        # fails: it is parsed again on its own and the pipeline restarts
+                        # on a new pool with the files after it
+                        results.close()
+                        terminate_broken_pool(executor)
+                        claims, error = process_edi_file_isolated(file_path)
+                        yield file_path, claims, error
+                        done += 1
+                        break
+
+                    if error is not None:
+                        yield file_path, [], error
+                    else:
+                        claims, error = result
+                        yield file_path, claims, error
+                    done += 1
+            finally:
+                results.close()
+        remaining = remaining[done:]
+
+
+def iter_processed_files(parser, edi_files, workers=1, pipeline_queue_size=None):
+    """Yield (file_path, claims, error) for each file in the order given, using a process pool when workers != 1
+
+    With pipeline_queue_size the files go through iter_pipelined_files instead.
+    """
+    if pipeline_queue_size:
+        yield from iter_pipelined_files(edi_files, workers, pipeline_queue_size)
+        return
+
+    if workers == 1 or len(edi_files) <= 1:
+        for file_path in edi_files:
+            claims, error = process_edi_file(parser, file_path)
+            yield file_path, claims, error
+        return
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, min(16, len(edi_files) // (workers * 4)))
+    remaining = list(edi_files)
+    while remaining:
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            # map returns results in submission order, keeping the merged output deterministic
+            results = executor.map(_process_file_in_worker, remaining, chunksize=chunksize)
+            try:
+                for file_path, (claims, error) in zip(remaining, results):
+                    yield file_path, claims, error
+                    done += 1
+            except BrokenProcessPool:
+                # a worker died (e.g. killed for memory) and took the files in flight down with
+                # it; the file whose result was due is parsed again on its own, so only the file
+                # that kills a worker fails, and the rest carry on in a new pool
+                terminate_broken_pool(executor)
+                file_path = remaining[done]
+                claims, error = process_edi_file_isolated(file_path)
+                yield file_path, claims, error
+                done += 1
+        remaining = remaining[done:]
+
+
+def terminate_broken_pool(executor):
+    """Kill the workers left in a pool one of its workers died in
+
+    Python before 3.12 does not stop them, and one blocked on the pool's queues can keep
+    the pool, and the interpreter at exit, from ever shutting down. They are killed rather
+    than terminated since workers can inherit a SIGTERM handler from the watch mode.
+    """
+    for process in list((executor._processes or {}).values()):
+        process.kill()
+    executor.shutdown(wait=False)
+
+
+def process_edi_file_isolated(file_path):
+    """process_edi_file in a worker process of its own, failing with BrokenProcessPool if the file kills it"""
+    with ProcessPoolExecutor(max_workers=1, initializer=_init_worker) as executor:
+        try:
+            return executor.submit(_process_file_in_worker, file_path).result()
+        except BrokenProcessPool as e:
+            terminate_broken_pool(executor)
+            return [], e
+
+
+def iter_manifest_files(parser, edi_files, manifest, workers=1, pipeline_queue_size=None):
+    """Yield (file_path, claims, error) like iter_processed_files, reusing the manifest's claims for unchanged files
+
+    Cached claims are read from the manifest as each file's turn comes, so a run holds one
+    file's claims at a time whether they were parsed or cached.
+    """
+    cached_files = set()
+    fingerprints = {}
+    for file_path in edi_files:
+        try:
+            cached, fingerprints[file_path] = manifest.check(file_path)
+        except OSError:
+            continue
+        if cached:
+            cached_files.add(file_path)
+
+    if cached_files:
+        print(f"Reusing cached claims for {len(cached_files)} unchanged files")
+
+    pending_files = [file_path for file_path in edi_files if file_path not in cached_files]
+    processed_files = iter_processed_files(parser, pending_files, workers, pipeline_queue_size)
+    for file_path in edi_files:
+        if file_path in cached_files:
+            claims = manifest.read_claims(fingerprints[file_path])
+            if claims is not None:
+                yield file_path, claims, None
+                continue
+
+            # the cached claims went missing since they were checked, parse the file here
+            claims, error = process_edi_file(parser, file_path)
+        else:
+            # pending files come back in the order given, interleave them with the cached ones
+            _, claims, error = next(processed_files)
+
+        if error is None and file_path in fingerprints:
+            manifest.record(fingerprints[file_path], claims)
+        yield file_path, claims, error
+
+    manifest.save()
+
+
+# Column layouts of the CSV/Parquet outputs. Record builders only fill the columns the
+# business format carries; every other column is written empty.
+# EDI_Claims_Output columns
+CLAIMS_COLUMNS = [
+    'ID', 'Filename', 'Version', 'ImageFilePath', 'ImageFilename', 'TradingPartnerIDType',
+    'TradingPartnerID', 'TransactionDate', 'TransactionTime', 'ReceiveDate', 'SubmitterName',
+    'SubmitterID', 'SubmitterContact', 'SubmitterTel', 'SubmitterTelExt', 'SubmitterFax',
+    'SubmitterEmail', 'ReceiverName', 'ReceiverID', 'TransactionType', 'OrigAppTransactionID',
+    'FedTaxIDQual', 'FedTaxID', 'BillProvIDType', 'BillProvID', 'BillProvNPI', 'BillProvLast',
+    'BillProvFirst', 'BillProvMiddle', 'BillProvSuffix', 'BillProvSpecialty', 'BillProvAddress',
+    'BillProvAddress2', 'BillProvCity', 'BillProvState', 'BillProvZip', 'BillProvCountry',
+    'BillProvSubdivision', 'BillProvContact', 'BillProvTel', 'BillProvTelExt', 'BillProvFax',
+    'BillProvEmail', 'BillProvOtherIDQual1', 'BillProvOtherID1', 'BillProvOtherIDQual2',
+    'BillProvOtherID2', 'BillProvOtherIDQual3', 'BillProvOtherID3', 'BillProvOtherIDQual4',
+    'BillProvOtherID4', 'BillProvOtherIDQual5', 'BillProvOtherID5', 'SubscriberLast',
+    'SubscriberFirst', 'SubscriberMiddle', 'SubscriberSuffix', 'SubscriberIDType', 'SubscriberID',
+    'SubscriberAddress', 'SubscriberAddress2', 'SubscriberCity', 'SubscriberState', 'SubscriberZip',
+    'SubscriberCountry', 'SubscriberLocation', 'SubscriberSubdivision', 'SubscriberDOB',
+    'SubscriberSex', 'SubscriberEthnicity', 'SubscriberMaritalStatus', 'SubscriberCollectionMethod',
+    'SubscriberSSN', 'SubscriberAgencyClaimNo', 'SubscriberMemberID', 'SubscriberPersonalID',
+    'SubscriberContact', 'SubscriberTel', 'SubscriberTelExt', 'SubscriberEmail', 'PayerName',
+    'PayerIDType', 'PayerID', 'PayerAddress', 'PayerAddress2', 'PayerCity', 'PayerState',
+    'PayerZip', 'PayerResponsibility', 'PayerOtherIDQual1', 'PayerOtherID1', 'PayerOtherIDQual2',
+    'PayerOtherID2', 'PayerOtherIDQual3', 'PayerOtherID3', 'GroupNo', 'GroupName', 'InsuranceType',
+    'FilingIndicator', 'COBIndicator', 'DataReceiverName', 'RendProvIDType', 'RendProvID',
+    'RendProvNPI', 'RendProvTaxID', 'RendProvLast', 'RendProvFirst', 'RendProvMiddle',
+    'RendProvSuffix', 'RendProvSpecialty', 'RendProvOtherIDQual1', 'RendProvOtherID1',
+    'RendProvOtherIDQual2', 'RendProvOtherID2', 'RendProvOtherIDQual3', 'RendProvOtherID3',
+    'FacilityType', 'FacilityIDType', 'FacilityID', 'FacilityNPI', 'FacilityTaxID',
+    'FacilityOtherIDQual1', 'FacilityOtherID1', 'FacilityOtherIDQual2', 'FacilityOtherID2',
+    'FacilityOtherIDQual3', 'FacilityOtherID3', 'FacilityName', 'FacilityAddress',
+    'FacilityAddress2', 'FacilityCity', 'FacilitySpecialty', 'FacilityState', 'FacilityZip',
+    'FacilityContact', 'FacilityTel', 'FacilityTelExt', 'RefProvLast', 'RefProvFirst',
+    'RefProvMiddle', 'RefProvSuffix', 'RefProvIDType', 'RefProvID', 'RefProvTaxID', 'RefProvNPI',
+    'RefProvOtherIDQual1', 'RefProvOtherID1', 'RefProvOtherIDQual2', 'RefProvOtherID2',
+    'RefProvOtherIDQual3', 'RefProvOtherID3', 'RefProvSpecialty', 'ClaimNo', 'Amount',
+    'EstimatedAmountDue', 'PatientEstimatedAmountDue', 'PlaceOfService', 'ClaimFrequency',
+    'SubmitReason', 'ProviderSignature', 'ProviderAcceptsAssignment', 'BenefitAssignment',
+    'InfoReleaseCode', 'PatientSignatureCode', 'RelatedCauses', 'RelatedCauses2',
+    'RelatedCausesState', 'RelatedCausesCountry', 'SpecialProgramCode', 'ProviderParticipation',
+    'EOBIndicator', 'DelayReasonCode', 'ServiceDateFrom', 'ServiceDateTo', 'OnsetDate',
+    'InitialTreatmentDate', 'LastSeenDate', 'AcuteManifestationDate', 'LastDateWorked',
+    'ReturnToWorkDate', 'SimilarSymptomsDate', 'DisabilityBegin', 'DisabilityEnd',
+    'HospitalizationBegin', 'HospitalizationEnd', 'AccidentDate', 'LastMenstrualPeriod',
+    'LastXRayDate', 'PrescriptionDate', 'AssumedCareDate', 'RelinquishedCareDate', 'FirstVisitDate',
+    'RepricerReceivedDate', 'AdmissionDate', 'AdmissionHour', 'AdmissionType', 'AdmissionSource',
+    'DischargeHour', 'PatientStatus', 'CoveredDays', 'NonCoveredDays', 'COBDays',
+    'LifeTimeReserveDays', 'PriorAuthorization', 'ClearingHouseID', 'MedicalRecordNumber',
+    'MothersMedicalRecordNumber', 'ServiceAuthorizationException', 'ReferralNumber',
+    'PayerClaimControlNumber', 'AdjustedRepricedClaimNumber', 'AutoAccidentState',
+    'MedicareCrossoverIndicator', 'MammographyCertID', 'CLIA', 'InvestDeviceExemptionNo',
+    'DemonstrationProjectID', 'CarePlanOversight', 'PROApprovalNo', 'PredeterminationID',
+    'ClaimType', 'TypeOfBill', 'Remark1', 'Remark2', 'Remark3', 'Remark4', 'K3_1', 'K3_2',
+    'OutsideLab', 'LabCharge', 'Test_Prod', 'ReportTypeCode1', 'ReportTransmissionCode1',
+    'AttachmentControlNumber1', 'ReportTypeCode2', 'ReportTransmissionCode2',
+    'AttachmentControlNumber2', 'ReportTypeCode3', 'ReportTransmissionCode3',
+    'AttachmentControlNumber3', 'ContractType', 'ContractAmount', 'ContractPercentage',
+    'ContractCode', 'TermsDiscountPercentage', 'ContractVersionID', 'Predetermination',
+    'OrthodonticTotal', 'OrthodonticRemaining', 'OrthodonticYesNo', 'ToothStatus',
+    'AppliancePlacementDate', 'AdmitDiagnosis', 'ECode', 'ECode2', 'ECode3', 'ECode4', 'ECode5',
+    'ECode6', 'ECode7', 'ECode8', 'ReasonForVisit', 'ReasonForVisit2', 'ReasonForVisit3',
+    'PrincipalDiagnosis', 'Diag2', 'Diag3', 'Diag4', 'Diag5', 'Diag6', 'Diag7', 'Diag8', 'Diag9',
+    'Diag10', 'DRG', 'PrincipalProcedure', 'PrincipalProcedureDate', 'Proc2', 'Proc2Date', 'Proc3',
+    'Proc3Date', 'Proc4', 'Proc4Date', 'Proc5', 'Proc5Date', 'Proc6', 'Proc6Date', 'Proc7',
+    'Proc7Date', 'Proc8', 'Proc8Date', 'Proc9', 'Proc9Date', 'Proc10', 'Proc10Date', 'ValueCode1',
+    'ValueAmount1', 'ValueCode2', 'ValueAmount2', 'ValueCode3', 'ValueAmount3', 'ValueCode4',
+    'ValueAmount4', 'ValueCode5', 'ValueAmount5', 'ValueCode6', 'ValueAmount6', 'ValueCode7',
+    'ValueAmount7', 'ValueCode8', 'ValueAmount8', 'ValueCode9', 'ValueAmount9', 'ValueCode10',
+    'ValueAmount10', 'ValueCode11', 'ValueAmount11', 'ValueCode12', 'ValueAmount12',
+    'ConditionCode1', 'ConditionCode2', 'ConditionCode3', 'ConditionCode4', 'ConditionCode5',
+    'ConditionCode6', 'ConditionCode7', 'ConditionCode8', 'ConditionCode9', 'ConditionCode10',
+    'OccurranceCode1', 'OccurranceDate1', 'OccurranceCode2', 'OccurranceDate2', 'OccurranceCode3',
+    'OccurranceDate3', 'OccurranceCode4', 'OccurranceDate4', 'OccurranceCode5', 'OccurranceDate5',
+    'OccurranceCode6', 'OccurranceDate6', 'OccurranceCode7', 'OccurranceDate7', 'OccurranceCode8',
+    'OccurranceDate8', 'OccurranceSpanCode1', 'OccurranceSpanFrom1', 'OccurranceSpanTo1',
+    'OccurranceSpanCode2', 'OccurranceSpanFrom2', 'OccurranceSpanTo2', 'OccurranceSpanCode3',
+    'OccurranceSpanFrom3', 'OccurranceSpanTo3', 'OccurranceSpanCode4', 'OccurranceSpanFrom4',
+    'OccurranceSpanTo4', 'PatientWeight', 'AmbulanceTransportCode', 'AmbulanceTransportReasonCode',
+    'TransportDistance', 'RoundTripPurposeDescription', 'StretcherPurposeDescription',
+    'SpinalManipulationPatCondCode', 'SpinalManipulationPatCondDesc1',
+    'SpinalManipulationPatCondDesc2', 'AmbulanceConditionIndicator', 'AmbulanceConditionCode1',
+    'AmbulanceConditionCode2', 'AmbulanceConditionCode3', 'AmbulanceConditionCode4',
+    'AmbulanceConditionCode5', 'SpectacleLensesCondIndicator', 'SpectacleLensesCondCode1',
+    'SpectacleLensesCondCode2', 'SpectacleLensesCondCode3', 'SpectacleLensesCondCode4',
+    'SpectacleLensesCondCode5', 'ContactLensesCondIndicator', 'ContactLensesCondCode1',
+    'ContactLensesCondCode2', 'ContactLensesCondCode3', 'ContactLensesCondCode4',
+    'ContactLensesCondCode5', 'SpectacleFramesCondIndicator', 'SpectacleFramesCondCode1',
+    'SpectacleFramesCondCode2', 'SpectacleFramesCondCode3', 'SpectacleFramesCondCode4',
+    'SpectacleFramesCondCode5', 'HomeboundConditionIndicator', 'EPSDTReferralCondIndicator',
+    'EPSDTReferralCondCode1', 'EPSDTReferralCondCode2', 'EPSDTReferralCondCode3',
+    'RepricedClaimNumber', 'RepricingMethodology', 'RepricedAmount', 'SavingsAmount', 'RepricerID',
+    'RepricingRate', 'APG_Code', 'APG_Amount', 'ApprovedRevenueCode', 'ApprovedProcedureCode',
+    'ApprovedUnitCode', 'ApprovedUnits', 'RejectReason', 'ComplianceCode', 'ExceptionCode'
+]
+
+# EDI_ClaimDetail_Output columns
+CLAIM_DETAIL_COLUMNS = [
+    'ID', 'ClaimID', 'LineNumber', 'ServiceDateFrom', 'ServiceDateTo', 'AssessmentDate',
+    'PrescriptionDate', 'RecertificationDate', 'BeginTherapyDate', 'LastCertificationDate',
+    'LastSeenDate', 'TestDateHemo', 'TestDateCreatine', 'ShippedDate', 'LastXrayDate',
+    'InitialTreatmentDate', 'FacilityCode', 'RevenueCode', 'ProcedureQual', 'ProcedureCode',
+    'Amount', 'Unit', 'Quantity', 'UnitRate', 'NonCovered', 'MEA', 'PlaceOfService', 'Modifier1',
+    'Modifier2', 'Modifier3', 'Modifier4', 'ProcedureDescription', 'OralCavityDesignation1',
+    'OralCavityDesignation2', 'OralCavityDesignation3', 'OralCavityDesignation4',
+    'OralCavityDesignation5', 'ProsthesisPlacementStatus', 'DiagPointer1', 'DiagPointer2',
+    'DiagPointer3', 'DiagPointer4', 'EmergencyIndicator', 'EPSDTIndicator',
+    'FamilyPlanningIndicator', 'CoPayStatus', 'DME_Days', 'DME_RentalPrice', 'DME_PurchasePrice',
+    'DME_FrequencyCode', 'ToothNumber', 'Surface', 'EstimatedPlacementDate', 'PriorPlacementDate',
+    'AppliancePlacementDate', 'ReplacementDate', 'TreatmentStartDate', 'TreatmentCompletionDate',
+    'ServiceTax', 'FacilityTax', 'SalesTax', 'Postage', 'ApprovedAmount', 'LineK3_01', 'LineK3_02',
+    'LineK3_03', 'LineK3_04', 'LineK3_05', 'LineK3_06', 'LineK3_07', 'LineK3_08', 'LineK3_09',
+    'LineK3_10', 'Remark', 'AmbulancePatientCount', 'LineID', 'PredeterminationOfBenefitsID',
+    'POB_OtherPayerID', 'PriorAuthNo', 'PriorAuthOtherPayerID', 'RepricedClaimNo',
+    'AdjustedRepricedClaimNo', 'ReferralNo', 'ReferralNoOtherPayerID', 'RepricedLineNo',
+    'AdjustedRepricedLineNo', 'MammographyCertNo', 'CLIANo', 'CLIAFacilityID',
+    'ImmunizationBatchNo', 'ContractType', 'CN1_RepricedAmount', 'ContractPercentage',
+    'ContractCode', 'TermsDiscountPercentage', 'ContractVersionID', 'ReportType',
+    'ReportTransmission', 'AttachmentControlNumber', 'ReportType2', 'ReportTransmission2',
+    'AttachmentControlNumber2', 'ReportType3', 'ReportTransmission3', 'AttachmentControlNumber3',
+    'RepricingMethodology', 'RepricedAmount', 'SavingsAmount', 'RepricerID', 'RepricingRate',
+    'APG_Code', 'APG_Amount', 'ApprovedRevenueCode', 'ApprovedProcedureCodeQual',
+    'ApprovedProcedureCode', 'ApprovedUnitCode', 'ApprovedUnits', 'RejectReason', 'ComplianceCode',
+    'ExceptionCode', 'DrugCodeQual', 'DrugCode', 'DrugUnitPrice', 'DrugUnitCode', 'DrugUnits',
+    'LinkSequenceNumber', 'PrescriptionNumber', 'PatientWeight', 'AmbulanceTransportCode',
+    'AmbulanceTransportReasonCode', 'TransportDistance', 'RoundTripPurposeDescription',
+    'StretcherPurposeDescription', 'DMECertificationType', 'DMEDuration',
+    'AmbulanceConditionIndicator', 'AmbulanceConditionCode1', 'AmbulanceConditionCode2',
+    'AmbulanceConditionCode3', 'AmbulanceConditionCode4', 'AmbulanceConditionCode5',
+    'HospiceEmployerCondIndicator', 'HospiceEmployerCondCode', 'DMERCConditionIndicator',
+    'DMERCConditionCode1', 'DMERCConditionCode2', 'AttendingProviderLast', 'AttendingProviderFirst',
+    'AttendingProviderMiddle', 'AttendingProviderSuffix', 'AttendingProviderIDQual',
+    'AttendingProviderID', 'AttendingProviderOtherIDQual', 'AttendingProviderOtherID',
+    'OperatingProviderLast', 'OperatingProviderFirst', 'OperatingProviderMiddle',
+    'OperatingProviderSuffix', 'OperatingProviderIDQual', 'OperatingProviderID',
+    'OperatingProviderOtherIDQual', 'OperatingProviderOtherID', 'OtherProviderLast',
+    'OtherProviderFirst', 'OtherProviderMiddle', 'OtherProviderSuffix', 'OtherProviderIDQual',
+    'OtherProviderID', 'OtherProviderOtherIDQual', 'OtherProviderOtherID', 'RenderingProviderLast',
+    'RenderingProviderFirst', 'RenderingProviderMiddle', 'RenderingProviderSuffix',
+    'RenderingProviderIDQual', 'RenderingProviderID', 'RenderingProviderOtherIDQual',
+    'RenderingProviderOtherID', 'RenderingProviderSpecialty', 'PurchasedServiceProviderLast',
+    'PurchasedServiceProviderFirst', 'PurchasedServiceProviderMiddle',
+    'PurchasedServiceProviderSuffix', 'PurchasedServiceProviderIDQual',
+    'PurchasedServiceProviderID', 'PurchasedServiceProviderOtherIDQual',
+    'PurchasedServiceProviderOtherID', 'PurchasedServiceProviderAmount', 'FacilityName',
+    'FacilityIDQual', 'FacilityID', 'FacilityAddress1', 'FacilityAddress2', 'FacilityCity',
+    'FacilityState', 'FacilityZip', 'FacilityOtherIDQual', 'FacilityOtherID',
+    'SupervisingProviderLast', 'SupervisingProviderFirst', 'SupervisingProviderMiddle',
+    'SupervisingProviderSuffix', 'SupervisingProviderIDQual', 'SupervisingProviderID',
+    'SupervisingProviderOtherIDQual', 'SupervisingProviderOtherID', 'OrderingProviderLast',
+    'OrderingProviderFirst', 'OrderingProviderMiddle', 'OrderingProviderSuffix',
+    'OrderingProviderIDQual', 'OrderingProviderID', 'OrderingProviderOtherIDQual',
+    'OrderingProviderOtherID', 'ReferringProviderLast', 'ReferringProviderFirst',
+    'ReferringProviderMiddle', 'ReferringProviderSuffix', 'ReferringProviderIDQual',
+    'ReferringProviderID', 'ReferringProviderOtherIDQual', 'ReferringProviderOtherID',
+    'OtherPayer1ID', 'OtherPayer1Paid', 'OtherPayer1PaidProcedure', 'OtherPayer1PaidRevenueCode',
+    'OtherPayer1PaidQuantity', 'OtherPayer1BundledLine', 'OtherPayer1AdjustmentReasonGroup1',
+    'OtherPayer1AdjustmentReason1', 'OtherPayer1AdjustmentAmount1',
+    'OtherPayer1AdjustmentQuantity1', 'OtherPayer1AdjustmentReasonGroup2',
+    'OtherPayer1AdjustmentReason2', 'OtherPayer1AdjustmentAmount2',
+    'OtherPayer1AdjustmentQuantity2', 'OtherPayer1AdjustmentReasonGroup3',
+    'OtherPayer1AdjustmentReason3', 'OtherPayer1AdjustmentAmount3',
+    'OtherPayer1AdjustmentQuantity3', 'OtherPayer1AdjustmentReasonGroup4',
+    'OtherPayer1AdjustmentReason4', 'OtherPayer1AdjustmentAmount4',
+    'OtherPayer1AdjustmentQuantity4', 'OtherPayer1PaidDate', 'OtherPayer1AmountOwed',
+    'OtherPayer2ID', 'OtherPayer2Paid', 'OtherPayer2PaidProcedure', 'OtherPayer2PaidRevenueCode',
+    'OtherPayer2PaidQuantity', 'OtherPayer2BundledLine', 'OtherPayer2AdjustmentReasonGroup1',
+    'OtherPayer2AdjustmentReason1', 'OtherPayer2AdjustmentAmount1',
+    'OtherPayer2AdjustmentQuantity1', 'OtherPayer2AdjustmentReasonGroup2',
+    'OtherPayer2AdjustmentReason2', 'OtherPayer2AdjustmentAmount2',
+    'OtherPayer2AdjustmentQuantity2', 'OtherPayer2AdjustmentReasonGroup3',
+    'OtherPayer2AdjustmentReason3', 'OtherPayer2AdjustmentAmount3',
+    'OtherPayer2AdjustmentQuantity3', 'OtherPayer2AdjustmentReasonGroup4',
+    'OtherPayer2AdjustmentReason4', 'OtherPayer2AdjustmentAmount4',
+    'OtherPayer2AdjustmentQuantity4', 'OtherPayer2PaidDate', 'OtherPayer2AmountOwed'
+]
+
+# COMPANY_SETUP_Output columns
+COMPANY_SETUP_COLUMNS = [
+    'ID', 'Name', 'Address1', 'Address2', 'City', 'State', 'Zip', 'Zip_4', 'SenderID',
+    'SenderIDQualifier', 'EdiNo', 'EIN', 'FileID', 'Contact', 'Tel', 'Ext', 'Fax', 'Email', 'Ack',
+    'TP', 'PayorID', 'PlanID', 'EntityType', 'EDIVersion', 'SourceEntityID', 'SourceName',
+    'SourceIDQual', 'SourceID', 'InsuranceType', 'BankName', 'RoutingNo', 'AccountNo'
+]
+
+# Columns holding integers, typed as int64 in the Parquet schema
+CLAIM_DETAIL_INTEGER_COLUMNS = ('ID', 'LineNumber', 'Quantity', 'DiagPointer1')
+COMPANY_SETUP_INTEGER_COLUMNS = ('ID',)
+
+
+def build_claims_record(parser, claim):
+    """Build the EDI_Claims row for one business format claim"""
+    # Get the actual claim ID from the JSON data
+    actual_claim_id = claim.get("id", "")
+    
+    transaction = claim.get("transaction", {})
+    billing_provider = claim.get("billingProvider", {})
+    subscriber = claim.get("subscriber", {}).get("person", {})
+    payer = claim.get("payer", {})
+    
+    # Extract all providers
+    referring_provider = {}
+    rendering_provider = {}
+    facility_provider = {}
+    
+    for provider in claim.get("providers", []):
+        if provider.get("entityRole") == parser.REFERRING_PROVIDER_ROLE:
+            referring_provider = provider
+        elif provider.get("entityRole") == parser.RENDERING_PROVIDER_ROLE:
+            rendering_provider = provider
+        elif provider.get("entityRole") == parser.SERVICE_FACILITY_ROLE:
+            facility_provider = provider
+    
+    return {
+        'ID': actual_claim_id,
+        'Filename': transaction.get("fileInfo", {}).get("fileName", ""),
+        'Version': transaction.get("implementationConventionReference", ""),
+        'TradingPartnerIDType': transaction.get("receiver", {}).get("identificationType", ""),
+        'TradingPartnerID': transaction.get("receiver", {}).get("identifier", ""),
+        'TransactionDate': transaction.get("creationDate", ""),
+        'TransactionTime': transaction.get("creationTime", ""),
+        'ReceiveDate': transaction.get("creationDate", ""),
+        'SubmitterName': transaction.get("sender", {}).get("lastNameOrOrgName", ""),
+        'SubmitterID': transaction.get("sender", {}).get("identifier", ""),
+        'SubmitterContact': transaction.get("sender", {}).get("contacts", [{}])[0].get("name", "") if transaction.get("sender", {}).get("contacts") else "",
+        'SubmitterTel': transaction.get("sender", {}).get("contacts", [{}])[0].get("contactNumbers", [{}])[0].get("number", "") if transaction.get("sender", {}).get("contacts") else "",
+        'ReceiverName': transaction.get("receiver", {}).get("lastNameOrOrgName", ""),
+        'ReceiverID': transaction.get("receiver", {}).get("identifier", ""),
+        'TransactionType': transaction.get("transactionType", ""),
+        'OrigAppTransactionID': transaction.get("originatorApplicationTransactionId", ""),
+        'FedTaxIDQual': billing_provider.get("taxIdQualifier", ""),
+        'FedTaxID': billing_provider.get("taxId", ""),
+        'BillProvIDType': billing_provider.get("identificationType", ""),
+        'BillProvID': billing_provider.get("identifier", ""),
+        'BillProvNPI': billing_provider.get("identifier", "") if billing_provider.get("identificationType") == parser.NPI_IDENTIFICATION_TYPE else "",
+        'BillProvLast': billing_provider.get("lastNameOrOrgName", ""),
+        'BillProvFirst': billing_provider.get("firstName", ""),
+        'BillProvMiddle': billing_provider.get("middleName", ""),
+        'BillProvSuffix': billing_provider.get("nameSuffix", ""),
+        'BillProvSpecialty': billing_provider.get("providerTaxonomy", {}).get("code", ""),
+        'BillProvAddress': billing_provider.get("address", {}).get("line", ""),
+        'BillProvAddress2': billing_provider.get("address", {}).get("line2", ""),
+        'BillProvCity': billing_provider.get("address", {}).get("city", ""),
+        'BillProvState': billing_provider.get("address", {}).get("stateCode", ""),
+        'BillProvZip': billing_provider.get("address", {}).get("zipCode", ""),
+
+        # Subscriber information
+        'SubscriberLast': subscriber.get("lastNameOrOrgName", ""),
+        'SubscriberFirst': subscriber.get("firstName", ""),
+        'SubscriberMiddle': subscriber.get("middleName", ""),
+        'SubscriberSuffix': subscriber.get("nameSuffix", ""),
+        'SubscriberIDType': subscriber.get("identificationType", ""),
+        'SubscriberID': subscriber.get("identifier", ""),
+        'SubscriberAddress': subscriber.get("address", {}).get("line", ""),
+        'SubscriberAddress2': subscriber.get("address", {}).get("line2", ""),
+        'SubscriberCity': subscriber.get("address", {}).get("city", ""),
+        'SubscriberState': subscriber.get("address", {}).get("stateCode", ""),
+        'SubscriberZip': subscriber.get("address", {}).get("zipCode", ""),
+        'SubscriberDOB': subscriber.get("birthDate", ""),
+        'SubscriberSex': subscriber.get("gender", ""),
+        'SubscriberMemberID': subscriber.get("identifier", ""),
+
+        # Payer information
+        'PayerName': payer.get("lastNameOrOrgName", ""),
+        'PayerIDType': payer.get("identificationType", ""),
+        'PayerID': payer.get("identifier", ""),
+        'PayerAddress': payer.get("address", {}).get("line", ""),
+        'PayerAddress2': payer.get("address", {}).get("line2", ""),
+        'PayerCity': payer.get("address", {}).get("city", ""),
+        'PayerState': payer.get("address", {}).get("stateCode", ""),
+        'PayerZip': payer.get("address", {}).get("zipCode", ""),
+        'PayerResponsibility': claim.get("subscriber", {}).get("payerResponsibilitySequence", ""),
+        'InsuranceType': claim.get("subscriber", {}).get("insurancePlanType", ""),
+        'FilingIndicator': claim.get("subscriber", {}).get("claimFilingIndicatorCode", ""),
+
+        # Rendering Provider
+        'RendProvIDType': rendering_provider.get("identificationType", ""),
+        'RendProvID': rendering_provider.get("identifier", ""),
+        'RendProvNPI': rendering_provider.get("identifier", "") if rendering_provider.get("identificationType") == parser.NPI_IDENTIFICATION_TYPE else "",
+        'RendProvLast': rendering_provider.get("lastNameOrOrgName", ""),
+        'RendProvFirst': rendering_provider.get("firstName", ""),
+        'RendProvMiddle': rendering_provider.get("middleName", ""),
+        'RendProvSpecialty': rendering_provider.get("providerTaxonomy", {}).get("code", ""),
+        'RendProvOtherIDQual1': rendering_provider.get("additionalIds", [{}])[0].get("qualifierCode", "") if rendering_provider.get("additionalIds") else "",
+        'RendProvOtherID1': rendering_provider.get("additionalIds", [{}])[0].get("identification", "") if rendering_provider.get("additionalIds") else "",
+
+        # Facility information
+        'FacilityType': facility_provider.get("entityType", ""),
+        'FacilityIDType': facility_provider.get("identificationType", ""),
+        'FacilityID': facility_provider.get("identifier", ""),
+        'FacilityNPI': facility_provider.get("identifier", "") if facility_provider.get("identificationType") == parser.NPI_IDENTIFICATION_TYPE else "",
+        'FacilityOtherIDQual1': facility_provider.get("additionalIds", [{}])[0].get("qualifierCode", "") if facility_provider.get("additionalIds") else "",
+        'FacilityOtherID1': facility_provider.get("additionalIds", [{}])[0].get("identification", "") if facility_provider.get("additionalIds") else "",
+        'FacilityOtherIDQual2': facility_provider.get("additionalIds", [{}])[1].get("qualifierCode", "") if len(facility_provider.get("additionalIds", [])) > 1 else "",
+        'FacilityOtherID2': facility_provider.get("additionalIds", [{}])[1].get("identification", "") if len(facility_provider.get("additionalIds", [])) > 1 else "",
+        'FacilityName': facility_provider.get("lastNameOrOrgName", ""),
+        'FacilityAddress': facility_provider.get("address", {}).get("line", ""),
+        'FacilityAddress2': facility_provider.get("address", {}).get("line2", ""),
+        'FacilityCity': facility_provider.get("address", {}).get("city", ""),
+        'FacilityState': facility_provider.get("address", {}).get("stateCode", ""),
+        'FacilityZip': facility_provider.get("address", {}).get("zipCode", ""),
+
+        # Referring Provider
+        'RefProvLast': referring_provider.get("lastNameOrOrgName", ""),
+        'RefProvFirst': referring_provider.get("firstName", ""),
+        'RefProvMiddle': referring_provider.get("middleName", ""),
+        'RefProvIDType': referring_provider.get("identificationType", ""),
+        'RefProvID': referring_provider.get("identifier", ""),
+        'RefProvNPI': referring_provider.get("identifier", "") if referring_provider.get("identificationType") == parser.NPI_IDENTIFICATION_TYPE else "",
+
+        # Claim information
+        'ClaimNo': claim.get("patientControlNumber", ""),
+        'Amount': claim.get("chargeAmount", ""),
+        'PlaceOfService': claim.get("facilityCode", {}).get("code", ""),
+        'ClaimFrequency': claim.get("frequencyCode", {}).get("code", ""),
+        'ProviderSignature': claim.get("providerSignatureIndicator", ""),
+        'ProviderAcceptsAssignment': claim.get("assignmentParticipationCode", ""),
+        'BenefitAssignment': claim.get("assignmentCertificationIndicator", ""),
+        'InfoReleaseCode': claim.get("releaseOfInformationCode", ""),
+        'ServiceDateFrom': claim.get("serviceDateFrom", ""),
+        'ServiceDateTo': claim.get("serviceDateTo", ""),
+
+        # Diagnosis codes
+        'PrincipalDiagnosis': claim.get("diags", [{}])[0].get("code", "") if claim.get("diags") else "",
+        'Diag2': claim.get("diags", [{}])[1].get("code", "") if len(claim.get("diags", [])) > 1 else "",
+        'Diag3': claim.get("diags", [{}])[2].get("code", "") if len(claim.get("diags", [])) > 2 else "",
+        'Diag4': claim.get("diags", [{}])[3].get("code", "") if len(claim.get("diags", [])) > 3 else "",
+        'Diag5': claim.get("diags", [{}])[4].get("code", "") if len(claim.get("diags", [])) > 4 else "",
+        'Diag6': claim.get("diags", [{}])[5].get("code", "") if len(claim.get("diags", [])) > 5 else "",
+        'Diag7': claim.get("diags", [{}])[6].get("code", "") if len(claim.get("diags", [])) > 6 else "",
+        'Diag8': claim.get("diags", [{}])[7].get("code", "") if len(claim.get("diags", [])) > 7 else "",
+        'Diag9': claim.get("diags", [{}])[8].get("code", "") if len(claim.get("diags", [])) > 8 else "",
+        'Diag10': claim.get("diags", [{}])[9].get("code", "") if len(claim.get("diags", [])) > 9 else ""
+    }
+
+
+def build_claim_detail_record(claim, service_line, detail_id):
+    """Build the EDI_ClaimDetail row for one service line of a business format claim"""
+    return {
+        'ID': detail_id,
+        'ClaimID': claim.get("id", ""),
+        'LineNumber': detail_id,
+        'ServiceDateFrom': service_line.get("serviceDateFrom", ""),
+        'ProcedureQual': service_line.get("procedure", {}).get("subType", ""),
+        'ProcedureCode': service_line.get("procedure", {}).get("code", ""),
+        'Amount': service_line.get("chargeAmount", ""),
+        'Unit': service_line.get("unitType", ""),
+        'Quantity': service_line.get("unitCount", ""),
+        'PlaceOfService': claim.get("facilityCode", {}).get("code", ""),
+        'ProcedureDescription': service_line.get("procedure", {}).get("desc", ""),
+        'DiagPointer1': service_line.get("diagPointers", [None])[0] if service_line.get("diagPointers") else None,
+        'LineID': service_line.get("sourceLineId", "")
+    }
+
+
+def get_company_key(claim):
+    """Unique key for a company (sender + receiver + billing provider)"""
+    transaction = claim.get("transaction", {})
+    billing_provider = claim.get("billingProvider", {})
+    return f"{transaction.get('sender', {}).get('identifier', '')}-{transaction.get('receiver', {}).get('identifier', '')}-{billing_provider.get('identifier', '')}"
+
+
+def build_company_setup_record(claim, company_id):
+    """Build the COMPANY_SETUP row for the company a business format claim was sent by"""
+    transaction = claim.get("transaction", {})
+    sender = transaction.get("sender", {})
+    receiver = transaction.get("receiver", {})
+    billing_provider = claim.get("billingProvider", {})
+    
+    # Extract company setup data from EDI transaction data
+    return {
+        'ID': company_id,
+        'Name': billing_provider.get("lastNameOrOrgName", ""),
+        'Address1': billing_provider.get("address", {}).get("line", ""),
+        'Address2': billing_provider.get("address", {}).get("line2", ""),
+        'City': billing_provider.get("address", {}).get("city", ""),
+        'State': billing_provider.get("address", {}).get("stateCode", ""),
+        'Zip': billing_provider.get("address", {}).get("zipCode", ""),
+        'SenderID': sender.get("identifier", ""),
+        'SenderIDQualifier': sender.get("identificationType", ""),
+        'EIN': billing_provider.get("taxId", ""),
+        'Contact': sender.get("contacts", [{}])[0].get("name", "") if sender.get("contacts") else "",
+        'Tel': sender.get("contacts", [{}])[0].get("contactNumbers", [{}])[0].get("number", "") if sender.get("contacts") and sender.get("contacts")[0].get("contactNumbers") else "",
+        'EntityType': billing_provider.get("entityType", ""),
+        'EDIVersion': transaction.get("implementationConventionReference", ""),
+        'SourceEntityID': receiver.get("identifier", ""),
+        'SourceName': receiver.get("lastNameOrOrgName", ""),
+        'SourceIDQual': receiver.get("identificationType", ""),
+        'SourceID': receiver.get("identifier", "")
+    }
+
+
+
+def open_record_writer(name, columns, integer_columns=()):
+    """Open <name>.csv, or <name>.parquet when OUTPUT_FORMAT is 'parquet', for records written one at a time"""
+    if OUTPUT_FORMAT == 'parquet':
+        return ParquetRecordWriter(f"{name}.parquet", columns, integer_columns, PARQUET_ROW_GROUP_SIZE)
+    return CSVRecordWriter(f"{name}.csv", columns)
+
+
+def open_business_writer():
+    """Open the business format output selected by BUSINESS_FORMAT_OUTPUT"""
+    if BUSINESS_FORMAT_OUTPUT == 'ndjson':
+        suffix = NDJSON_COMPRESSION_SUFFIXES.get(NDJSON_COMPRESSION, '')
+        return NDJSONWriter(f"edi_837_business_format.ndjson{suffix}", NDJSON_COMPRESSION, COMPACT_JSON)
+    return JSONArrayWriter("edi_837_business_format.json", COMPACT_JSON)
+
+
+class OutputSinks:
+    """The output files of a run, written as each file's claims arrive
+
+    A run holds one file's claims at a time however many files it processes. Each output
+    is opened by its first record, and an output whose writing fails is reported once and
+    left out of the rest of the run.
+    """
+
+    # output name -> (columns, integer columns), in the order the outputs are reported
+    RECORD_OUTPUTS = {
+        'EDI_Claims_Output': (CLAIMS_COLUMNS, ()),
+        'EDI_ClaimDetail_Output': (CLAIM_DETAIL_COLUMNS, CLAIM_DETAIL_INTEGER_COLUMNS),
+        'COMPANY_SETUP_Output': (COMPANY_SETUP_COLUMNS, COMPANY_SETUP_INTEGER_COLUMNS),
+    }
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.business_writer = None
+        self.business_failed = False
+        self.record_writers = {}
+        self.records_failed = False
+        self.detail_id = 1
+        self.company_keys = set()
+
+    def write_claims(self, claims):
+        if not self.business_failed:
+            try:
+                if self.business_writer is None:
+                    self.business_writer = self.open_business_writer()
+                self.business_writer.write_many(claims)
+            except Exception as e:
+                self.business_failed = True
+                print(f"Error saving business format JSON: {str(e)}")
+
+        if not self.records_failed:
+            try:
+                self._write_records(claims)
+            except Exception as e:
+                self.records_failed = True
+                print(f"Error creating comprehensive CSV exports: {str(e)}")
+
+    def _write_records(self, claims):
+        for claim in claims:
+            self._write('EDI_Claims_Output', build_claims_record(self.parser, claim))
+
+            # Create claim detail records for each service line
+            for service_line in claim.get("serviceLines", []):
+                self._write('EDI_ClaimDetail_Output', build_claim_detail_record(claim, service_line, self.detail_id))
+                self.detail_id += 1
+
+            # One company setup record per unique company
+            company_key = get_company_key(claim)
+            if company_key not in self.company_keys:
+                self.company_keys.add(company_key)
+                self._write('COMPANY_SETUP_Output', build_company_setup_record(claim, len(self.company_keys)))
+
+    def _write(self, name, record):
+        writer = self.record_writers.get(name)
+        if writer is None:
+            columns, integer_columns = self.RECORD_OUTPUTS[name]
+            writer = self.record_writers[name] = self.open_record_writer(name, columns, integer_columns)
+        writer.write(record)
+
+    def open_business_writer(self):
+        return open_business_writer()
+
+    def open_record_writer(self, name, columns, integer_columns):
+        return open_record_writer(name, columns, integer_columns)
+
+    def close(self):
+        writers = [self.business_writer, *self.record_writers.values()]
+        for writer in writers:
+            if writer is not None:
+                writer.close()
+
+    def report(self):
+        """Print what each output was saved with"""
+        if self.business_writer and not self.business_failed:
+            if BUSINESS_FORMAT_OUTPUT == 'ndjson':
+                print(f"✅ Business format data saved to: {self.business_writer.path} ({self.business_writer.records_written} claims)")
+            else:
+                print(f"✅ Business format data saved to: {self.business_writer.path}")
+
+        if self.records_failed:
+            return
+
+        for name in self.RECORD_OUTPUTS:
+            writer = self.record_writers.get(name)
+            if writer is not None:
+                print(f"✅ {writer.path} saved with {writer.rows_written} records")
+            elif name == 'COMPANY_SETUP_Output':
+                print("⚠️ No company setup records found")
+
+
 def main():
     """Main execution function"""
     parser = EDI837BusinessParser()
@@ -1596,7 +2533,6 @@ def main():
     
     print(f"✅ Found {len(edi_files)} EDI files in: {edi_directory}")
     
-    all_business_data = []
     total_claims_extracted = 0
     
     # Process files from the single configured directory
@@ -1611,29 +2547,38 @@ def main():
         print(f"Will process all {len(edi_files)} files")
     
     # Process each file
-    for i, file_path in enumerate(edi_files, 1):
+    if WORKERS != 1:
+        print(f"Using {WORKERS or os.cpu_count()} worker processes")
 
-            try:
-                print(f"Processing {os.path.basename(file_path)}... ({i}/{len(edi_files)})")
-                
-                # Parse EDI file
-                edi_data = parser.parse_edi_file(file_path)
-                
-                if edi_data:
-                    # Convert to business format (returns list of claims)
-                    claims = parser.convert_to_business_format(edi_data)
-                    
-                    if claims:
-                        all_business_data.extend(claims)
-                        total_claims_extracted += len(claims)
-                
-            except Exception as e:
-                print(f"Error processing {file_path}: {str(e)}")
+    pipeline_queue_size = PIPELINE_QUEUE_SIZE if ASYNC_PIPELINE else None
+    if pipeline_queue_size:
+        print(f"Reading, parsing and writing as a pipeline of {pipeline_queue_size} files per stage")
+
+    if MANIFEST_DIRECTORY:
+        manifest = ProcessingManifest(MANIFEST_DIRECTORY).load()
+        processed_files = iter_manifest_files(parser, edi_files, manifest, WORKERS, pipeline_queue_size)
+    else:
+        processed_files = iter_processed_files(parser, edi_files, WORKERS, pipeline_queue_size)
+
+    # Outputs are written as each file's claims arrive instead of after the run
+    sinks = OutputSinks(parser)
+    try:
+        for i, (file_path, claims, error) in enumerate(processed_files, 1):
+            print(f"Processed {os.path.basename(file_path)} ({i}/{len(edi_files)})")
+
+            if error is not None:
+                print(f"Error processing {file_path}: {format_error(error)}")
                 continue
+
+            if claims:
+                sinks.write_claims(claims)
+                total_claims_extracted += len(claims)
             
             # Progress update every 10 files
             if i % 10 == 0:
                 print(f"✅ Processed {i} files, extracted {total_claims_extracted} claims so far")
+    finally:
+        sinks.close()
         
     print(f"Completed processing {min(len(edi_files), max_files)} files")
     
@@ -1642,660 +2587,9 @@ def main():
         return
     
     print(f"\n📊 EXTRACTION SUMMARY:")
-    print(f"Total claims extracted: {len(all_business_data)}")
+    print(f"Total claims extracted: {total_claims_extracted}")
     
-    # Save business format JSON
-    business_output_file = "edi_837_business_format.json"
-    try:
-        with open(business_output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_business_data, f, indent=2, ensure_ascii=False)
-        print(f"✅ Business format data saved to: {business_output_file}")
-    except Exception as e:
-        print(f"Error saving business format JSON: {str(e)}")
-    
-    # Create the three CSV files matching the required structure
-    try:
-        # Generate EDI_Claims.csv
-        claims_records = []
-        company_setup_records = []
-        claim_detail_records = []
-        
-        detail_id_counter = 1
-        
-        for claim in all_business_data:
-            # Get the actual claim ID from the JSON data
-            actual_claim_id = claim.get("id", "")
-            
-            transaction = claim.get("transaction", {})
-            billing_provider = claim.get("billingProvider", {})
-            subscriber = claim.get("subscriber", {}).get("person", {})
-            payer = claim.get("payer", {})
-            
-            # Extract all providers
-            referring_provider = {}
-            rendering_provider = {}
-            facility_provider = {}
-            
-            for provider in claim.get("providers", []):
-                if provider.get("entityRole") == parser.REFERRING_PROVIDER_ROLE:
-                    referring_provider = provider
-                elif provider.get("entityRole") == parser.RENDERING_PROVIDER_ROLE:
-                    rendering_provider = provider
-                elif provider.get("entityRole") == parser.SERVICE_FACILITY_ROLE:
-                    facility_provider = provider
-            
-            # Build EDI_Claims record with all required fields
-            claims_record = {
-                'ID': actual_claim_id,
-                'Filename': transaction.get("fileInfo", {}).get("fileName", ""),
-                'Version': transaction.get("implementationConventionReference", ""),
-                'ImageFilePath': None,
-                'ImageFilename': None,
-                'TradingPartnerIDType': transaction.get("receiver", {}).get("identificationType", ""),
-                'TradingPartnerID': transaction.get("receiver", {}).get("identifier", ""),
-                'TransactionDate': transaction.get("creationDate", ""),
-                'TransactionTime': transaction.get("creationTime", ""),
-                'ReceiveDate': transaction.get("creationDate", ""),
-                'SubmitterName': transaction.get("sender", {}).get("lastNameOrOrgName", ""),
-                'SubmitterID': transaction.get("sender", {}).get("identifier", ""),
-                'SubmitterContact': transaction.get("sender", {}).get("contacts", [{}])[0].get("name", "") if transaction.get("sender", {}).get("contacts") else "",
-                'SubmitterTel': transaction.get("sender", {}).get("contacts", [{}])[0].get("contactNumbers", [{}])[0].get("number", "") if transaction.get("sender", {}).get("contacts") else "",
-                'SubmitterTelExt': None,
-                'SubmitterFax': None,
-                'SubmitterEmail': None,
-                'ReceiverName': transaction.get("receiver", {}).get("lastNameOrOrgName", ""),
-                'ReceiverID': transaction.get("receiver", {}).get("identifier", ""),
-                'TransactionType': transaction.get("transactionType", ""),
-                'OrigAppTransactionID': transaction.get("originatorApplicationTransactionId", ""),
-                'FedTaxIDQual': billing_provider.get("taxIdQualifier", ""),
-                'FedTaxID': billing_provider.get("taxId", ""),
-                'BillProvIDType': billing_provider.get("identificationType", ""),
-                'BillProvID': billing_provider.get("identifier", ""),
-                'BillProvNPI': billing_provider.get("identifier", "") if billing_provider.get("identificationType") == parser.NPI_IDENTIFICATION_TYPE else "",
-                'BillProvLast': billing_provider.get("lastNameOrOrgName", ""),
-                'BillProvFirst': billing_provider.get("firstName", ""),
-                'BillProvMiddle': billing_provider.get("middleName", ""),
-                'BillProvSuffix': billing_provider.get("nameSuffix", ""),
-                'BillProvSpecialty': billing_provider.get("providerTaxonomy", {}).get("code", ""),
-                'BillProvAddress': billing_provider.get("address", {}).get("line", ""),
-                'BillProvAddress2': billing_provider.get("address", {}).get("line2", ""),
-                'BillProvCity': billing_provider.get("address", {}).get("city", ""),
-                'BillProvState': billing_provider.get("address", {}).get("stateCode", ""),
-                'BillProvZip': billing_provider.get("address", {}).get("zipCode", ""),
-                'BillProvCountry': None,
-                'BillProvSubdivision': None,
-                'BillProvContact': None,
-                'BillProvTel': None,
-                'BillProvTelExt': None,
-                'BillProvFax': None,
-                'BillProvEmail': None,
-                'BillProvOtherIDQual1': None,
-                'BillProvOtherID1': None,
-                'BillProvOtherIDQual2': None,
-                'BillProvOtherID2': None,
-                'BillProvOtherIDQual3': None,
-                'BillProvOtherID3': None,
-                'BillProvOtherIDQual4': None,
-                'BillProvOtherID4': None,
-                'BillProvOtherIDQual5': None,
-                'BillProvOtherID5': None,
-                
-                # Subscriber information
-                'SubscriberLast': subscriber.get("lastNameOrOrgName", ""),
-                'SubscriberFirst': subscriber.get("firstName", ""),
-                'SubscriberMiddle': subscriber.get("middleName", ""),
-                'SubscriberSuffix': subscriber.get("nameSuffix", ""),
-                'SubscriberIDType': subscriber.get("identificationType", ""),
-                'SubscriberID': subscriber.get("identifier", ""),
-                'SubscriberAddress': subscriber.get("address", {}).get("line", ""),
-                'SubscriberAddress2': subscriber.get("address", {}).get("line2", ""),
-                'SubscriberCity': subscriber.get("address", {}).get("city", ""),
-                'SubscriberState': subscriber.get("address", {}).get("stateCode", ""),
-                'SubscriberZip': subscriber.get("address", {}).get("zipCode", ""),
-                'SubscriberCountry': None,
-                'SubscriberLocation': None,
-                'SubscriberSubdivision': None,
-                'SubscriberDOB': subscriber.get("birthDate", ""),
-                'SubscriberSex': subscriber.get("gender", ""),
-                'SubscriberEthnicity': None,
-                'SubscriberMaritalStatus': None,
-                'SubscriberCollectionMethod': None,
-                'SubscriberSSN': None,
-                'SubscriberAgencyClaimNo': None,
-                'SubscriberMemberID': subscriber.get("identifier", ""),
-                'SubscriberPersonalID': None,
-                'SubscriberContact': None,
-                'SubscriberTel': None,
-                'SubscriberTelExt': None,
-                'SubscriberEmail': None,
-                
-                # Payer information
-                'PayerName': payer.get("lastNameOrOrgName", ""),
-                'PayerIDType': payer.get("identificationType", ""),
-                'PayerID': payer.get("identifier", ""),
-                'PayerAddress': payer.get("address", {}).get("line", ""),
-                'PayerAddress2': payer.get("address", {}).get("line2", ""),
-                'PayerCity': payer.get("address", {}).get("city", ""),
-                'PayerState': payer.get("address", {}).get("stateCode", ""),
-                'PayerZip': payer.get("address", {}).get("zipCode", ""),
-                'PayerResponsibility': claim.get("subscriber", {}).get("payerResponsibilitySequence", ""),
-                'PayerOtherIDQual1': None,
-                'PayerOtherID1': None,
-                'PayerOtherIDQual2': None,
-                'PayerOtherID2': None,
-                'PayerOtherIDQual3': None,
-                'PayerOtherID3': None,
-                'GroupNo': None,
-                'GroupName': None,
-                'InsuranceType': claim.get("subscriber", {}).get("insurancePlanType", ""),
-                'FilingIndicator': claim.get("subscriber", {}).get("claimFilingIndicatorCode", ""),
-                'COBIndicator': None,
-                'DataReceiverName': None,
-                
-                # Rendering Provider
-                'RendProvIDType': rendering_provider.get("identificationType", ""),
-                'RendProvID': rendering_provider.get("identifier", ""),
-                'RendProvNPI': rendering_provider.get("identifier", "") if rendering_provider.get("identificationType") == parser.NPI_IDENTIFICATION_TYPE else "",
-                'RendProvTaxID': None,
-                'RendProvLast': rendering_provider.get("lastNameOrOrgName", ""),
-                'RendProvFirst': rendering_provider.get("firstName", ""),
-                'RendProvMiddle': rendering_provider.get("middleName", ""),
-                'RendProvSuffix': None,
-                'RendProvSpecialty': rendering_provider.get("providerTaxonomy", {}).get("code", ""),
-                'RendProvOtherIDQual1': rendering_provider.get("additionalIds", [{}])[0].get("qualifierCode", "") if rendering_provider.get("additionalIds") else "",
-                'RendProvOtherID1': rendering_provider.get("additionalIds", [{}])[0].get("identification", "") if rendering_provider.get("additionalIds") else "",
-                'RendProvOtherIDQual2': None,
-                'RendProvOtherID2': None,
-                'RendProvOtherIDQual3': None,
-                'RendProvOtherID3': None,
-                
-                # Facility information
-                'FacilityType': facility_provider.get("entityType", ""),
-                'FacilityIDType': facility_provider.get("identificationType", ""),
-                'FacilityID': facility_provider.get("identifier", ""),
-                'FacilityNPI': facility_provider.get("identifier", "") if facility_provider.get("identificationType") == parser.NPI_IDENTIFICATION_TYPE else "",
-                'FacilityTaxID': None,
-                'FacilityOtherIDQual1': facility_provider.get("additionalIds", [{}])[0].get("qualifierCode", "") if facility_provider.get("additionalIds") else "",
-                'FacilityOtherID1': facility_provider.get("additionalIds", [{}])[0].get("identification", "") if facility_provider.get("additionalIds") else "",
-                'FacilityOtherIDQual2': facility_provider.get("additionalIds", [{}])[1].get("qualifierCode", "") if len(facility_provider.get("additionalIds", [])) > 1 else "",
-                'FacilityOtherID2': facility_provider.get("additionalIds", [{}])[1].get("identification", "") if len(facility_provider.get("additionalIds", [])) > 1 else "",
-                'FacilityOtherIDQual3': None,
-                'FacilityOtherID3': None,
-                'FacilityName': facility_provider.get("lastNameOrOrgName", ""),
-                'FacilityAddress': facility_provider.get("address", {}).get("line", ""),
-                'FacilityAddress2': facility_provider.get("address", {}).get("line2", ""),
-                'FacilityCity': facility_provider.get("address", {}).get("city", ""),
-                'FacilitySpecialty': None,
-                'FacilityState': facility_provider.get("address", {}).get("stateCode", ""),
-                'FacilityZip': facility_provider.get("address", {}).get("zipCode", ""),
-                'FacilityContact': None,
-                'FacilityTel': None,
-                'FacilityTelExt': None,
-                
-                # Referring Provider
-                'RefProvLast': referring_provider.get("lastNameOrOrgName", ""),
-                'RefProvFirst': referring_provider.get("firstName", ""),
-                'RefProvMiddle': referring_provider.get("middleName", ""),
-                'RefProvSuffix': None,
-                'RefProvIDType': referring_provider.get("identificationType", ""),
-                'RefProvID': referring_provider.get("identifier", ""),
-                'RefProvTaxID': None,
-                'RefProvNPI': referring_provider.get("identifier", "") if referring_provider.get("identificationType") == parser.NPI_IDENTIFICATION_TYPE else "",
-                'RefProvOtherIDQual1': None,
-                'RefProvOtherID1': None,
-                'RefProvOtherIDQual2': None,
-                'RefProvOtherID2': None,
-                'RefProvOtherIDQual3': None,
-                'RefProvOtherID3': None,
-                'RefProvSpecialty': None,
-                
-                # Claim information
-                'ClaimNo': claim.get("patientControlNumber", ""),
-                'Amount': claim.get("chargeAmount", ""),
-                'EstimatedAmountDue': None,
-                'PatientEstimatedAmountDue': None,
-                'PlaceOfService': claim.get("facilityCode", {}).get("code", ""),
-                'ClaimFrequency': claim.get("frequencyCode", {}).get("code", ""),
-                'SubmitReason': None,
-                'ProviderSignature': claim.get("providerSignatureIndicator", ""),
-                'ProviderAcceptsAssignment': claim.get("assignmentParticipationCode", ""),
-                'BenefitAssignment': claim.get("assignmentCertificationIndicator", ""),
-                'InfoReleaseCode': claim.get("releaseOfInformationCode", ""),
-                'PatientSignatureCode': None,
-                'RelatedCauses': None,
-                'RelatedCauses2': None,
-                'RelatedCausesState': None,
-                'RelatedCausesCountry': None,
-                'SpecialProgramCode': None,
-                'ProviderParticipation': None,
-                'EOBIndicator': None,
-                'DelayReasonCode': None,
-                'ServiceDateFrom': claim.get("serviceDateFrom", ""),
-                'ServiceDateTo': claim.get("serviceDateTo", ""),
-                'OnsetDate': None,
-                'InitialTreatmentDate': None,
-                'LastSeenDate': None,
-                'AcuteManifestationDate': None,
-                'LastDateWorked': None,
-                'ReturnToWorkDate': None,
-                'SimilarSymptomsDate': None,
-                'DisabilityBegin': None,
-                'DisabilityEnd': None,
-                'HospitalizationBegin': None,
-                'HospitalizationEnd': None,
-                'AccidentDate': None,
-                'LastMenstrualPeriod': None,
-                'LastXRayDate': None,
-                'PrescriptionDate': None,
-                'AssumedCareDate': None,
-                'RelinquishedCareDate': None,
-                'FirstVisitDate': None,
-                'RepricerReceivedDate': None,
-                'AdmissionDate': None,
-                'AdmissionHour': None,
-                'AdmissionType': None,
-                'AdmissionSource': None,
-                'DischargeHour': None,
-                'PatientStatus': None,
-                'CoveredDays': None,
-                'NonCoveredDays': None,
-                'COBDays': None,
-                'LifeTimeReserveDays': None,
-                'PriorAuthorization': None,
-                'ClearingHouseID': None,
-                'MedicalRecordNumber': None,
-                'MothersMedicalRecordNumber': None,
-                'ServiceAuthorizationException': None,
-                'ReferralNumber': None,
-                'PayerClaimControlNumber': None,
-                'AdjustedRepricedClaimNumber': None,
-                'AutoAccidentState': None,
-                'MedicareCrossoverIndicator': None,
-                'MammographyCertID': None,
-                'CLIA': None,
-                'InvestDeviceExemptionNo': None,
-                'DemonstrationProjectID': None,
-                'CarePlanOversight': None,
-                'PROApprovalNo': None,
-                'PredeterminationID': None,
-                'ClaimType': None,
-                'TypeOfBill': None,
-                'Remark1': None,
-                'Remark2': None,
-                'Remark3': None,
-                'Remark4': None,
-                'K3_1': None,
-                'K3_2': None,
-                'OutsideLab': None,
-                'LabCharge': None,
-                'Test_Prod': None,
-                'ReportTypeCode1': None,
-                'ReportTransmissionCode1': None,
-                'AttachmentControlNumber1': None,
-                'ReportTypeCode2': None,
-                'ReportTransmissionCode2': None,
-                'AttachmentControlNumber2': None,
-                'ReportTypeCode3': None,
-                'ReportTransmissionCode3': None,
-                'AttachmentControlNumber3': None,
-                'ContractType': None,
-                'ContractAmount': None,
-                'ContractPercentage': None,
-                'ContractCode': None,
-                'TermsDiscountPercentage': None,
-                'ContractVersionID': None,
-                'Predetermination': None,
-                'OrthodonticTotal': None,
-                'OrthodonticRemaining': None,
-                'OrthodonticYesNo': None,
-                'ToothStatus': None,
-                'AppliancePlacementDate': None,
-                'AdmitDiagnosis': None,
-                'ECode': None,
-                'ECode2': None,
-                'ECode3': None,
-                'ECode4': None,
-                'ECode5': None,
-                'ECode6': None,
-                'ECode7': None,
-                'ECode8': None,
-                'ReasonForVisit': None,
-                'ReasonForVisit2': None,
-                'ReasonForVisit3': None,
-                
-                # Diagnosis codes
-                'PrincipalDiagnosis': claim.get("diags", [{}])[0].get("code", "") if claim.get("diags") else "",
-                'Diag2': claim.get("diags", [{}])[1].get("code", "") if len(claim.get("diags", [])) > 1 else "",
-                'Diag3': claim.get("diags", [{}])[2].get("code", "") if len(claim.get("diags", [])) > 2 else "",
-                'Diag4': claim.get("diags", [{}])[3].get("code", "") if len(claim.get("diags", [])) > 3 else "",
-                'Diag5': claim.get("diags", [{}])[4].get("code", "") if len(claim.get("diags", [])) > 4 else "",
-                'Diag6': claim.get("diags", [{}])[5].get("code", "") if len(claim.get("diags", [])) > 5 else "",
-                'Diag7': claim.get("diags", [{}])[6].get("code", "") if len(claim.get("diags", [])) > 6 else "",
-                'Diag8': claim.get("diags", [{}])[7].get("code", "") if len(claim.get("diags", [])) > 7 else "",
-                'Diag9': claim.get("diags", [{}])[8].get("code", "") if len(claim.get("diags", [])) > 8 else "",
-                'Diag10': claim.get("diags", [{}])[9].get("code", "") if len(claim.get("diags", [])) > 9 else "",
-                'DRG': None,
-                'PrincipalProcedure': None,
-                'PrincipalProcedureDate': None,
-                'Proc2': None,
-                'Proc2Date': None,
-                'Proc3': None,
-                'Proc3Date': None,
-                'Proc4': None,
-                'Proc4Date': None,
-                'Proc5': None,
-                'Proc5Date': None,
-                'Proc6': None,
-                'Proc6Date': None,
-                'Proc7': None,
-                'Proc7Date': None,
-                'Proc8': None,
-                'Proc8Date': None,
-                'Proc9': None,
-                'Proc9Date': None,
-                'Proc10': None,
-                'Proc10Date': None
-            }
-            
-            # Add remaining fields with None values to match the CSV structure
-            remaining_fields = [
-                'ValueCode1', 'ValueAmount1', 'ValueCode2', 'ValueAmount2', 'ValueCode3', 'ValueAmount3',
-                'ValueCode4', 'ValueAmount4', 'ValueCode5', 'ValueAmount5', 'ValueCode6', 'ValueAmount6',
-                'ValueCode7', 'ValueAmount7', 'ValueCode8', 'ValueAmount8', 'ValueCode9', 'ValueAmount9',
-                'ValueCode10', 'ValueAmount10', 'ValueCode11', 'ValueAmount11', 'ValueCode12', 'ValueAmount12',
-                'ConditionCode1', 'ConditionCode2', 'ConditionCode3', 'ConditionCode4', 'ConditionCode5',
-                'ConditionCode6', 'ConditionCode7', 'ConditionCode8', 'ConditionCode9', 'ConditionCode10',
-                'OccurranceCode1', 'OccurranceDate1', 'OccurranceCode2', 'OccurranceDate2', 'OccurranceCode3',
-                'OccurranceDate3', 'OccurranceCode4', 'OccurranceDate4', 'OccurranceCode5', 'OccurranceDate5',
-                'OccurranceCode6', 'OccurranceDate6', 'OccurranceCode7', 'OccurranceDate7', 'OccurranceCode8',
-                'OccurranceDate8', 'OccurranceSpanCode1', 'OccurranceSpanFrom1', 'OccurranceSpanTo1',
-                'OccurranceSpanCode2', 'OccurranceSpanFrom2', 'OccurranceSpanTo2', 'OccurranceSpanCode3',
-                'OccurranceSpanFrom3', 'OccurranceSpanTo3', 'OccurranceSpanCode4', 'OccurranceSpanFrom4',
-                'OccurranceSpanTo4', 'PatientWeight', 'AmbulanceTransportCode', 'AmbulanceTransportReasonCode',
-                'TransportDistance', 'RoundTripPurposeDescription', 'StretcherPurposeDescription',
-                'SpinalManipulationPatCondCode', 'SpinalManipulationPatCondDesc1', 'SpinalManipulationPatCondDesc2',
-                'AmbulanceConditionIndicator', 'AmbulanceConditionCode1', 'AmbulanceConditionCode2',
-                'AmbulanceConditionCode3', 'AmbulanceConditionCode4', 'AmbulanceConditionCode5',
-                'SpectacleLensesCondIndicator', 'SpectacleLensesCondCode1', 'SpectacleLensesCondCode2',
-                'SpectacleLensesCondCode3', 'SpectacleLensesCondCode4', 'SpectacleLensesCondCode5',
-                'ContactLensesCondIndicator', 'ContactLensesCondCode1', 'ContactLensesCondCode2',
-                'ContactLensesCondCode3', 'ContactLensesCondCode4', 'ContactLensesCondCode5',
-                'SpectacleFramesCondIndicator', 'SpectacleFramesCondCode1', 'SpectacleFramesCondCode2',
-                'SpectacleFramesCondCode3', 'SpectacleFramesCondCode4', 'SpectacleFramesCondCode5',
-                'HomeboundConditionIndicator', 'EPSDTReferralCondIndicator', 'EPSDTReferralCondCode1',
-                'EPSDTReferralCondCode2', 'EPSDTReferralCondCode3', 'RepricedClaimNumber', 'RepricingMethodology',
-                'RepricedAmount', 'SavingsAmount', 'RepricerID', 'RepricingRate', 'APG_Code', 'APG_Amount',
-                'ApprovedRevenueCode', 'ApprovedProcedureCode', 'ApprovedUnitCode', 'ApprovedUnits',
-                'RejectReason', 'ComplianceCode', 'ExceptionCode'
-            ]
-            
-            for field in remaining_fields:
-                claims_record[field] = None
-            
-            claims_records.append(claims_record)
-            
-            # Create claim detail records for each service line
-            for service_line in claim.get("serviceLines", []):
-                detail_record = {
-                    'ID': detail_id_counter,
-                    'ClaimID': actual_claim_id,
-                    'LineNumber': detail_id_counter,
-                    'ServiceDateFrom': service_line.get("serviceDateFrom", ""),
-                    'ServiceDateTo': None,
-                    'AssessmentDate': None,
-                    'PrescriptionDate': None,
-                    'RecertificationDate': None,
-                    'BeginTherapyDate': None,
-                    'LastCertificationDate': None,
-                    'LastSeenDate': None,
-                    'TestDateHemo': None,
-                    'TestDateCreatine': None,
-                    'ShippedDate': None,
-                    'LastXrayDate': None,
-                    'InitialTreatmentDate': None,
-                    'FacilityCode': None,
-                    'RevenueCode': None,
-                    'ProcedureQual': service_line.get("procedure", {}).get("subType", ""),
-                    'ProcedureCode': service_line.get("procedure", {}).get("code", ""),
-                    'Amount': service_line.get("chargeAmount", ""),
-                    'Unit': service_line.get("unitType", ""),
-                    'Quantity': service_line.get("unitCount", ""),
-                    'UnitRate': None,
-                    'NonCovered': None,
-                    'MEA': None,
-                    'PlaceOfService': claim.get("facilityCode", {}).get("code", ""),
-                    'Modifier1': None,
-                    'Modifier2': None,
-                    'Modifier3': None,
-                    'Modifier4': None,
-                    'ProcedureDescription': service_line.get("procedure", {}).get("desc", ""),
-                    'OralCavityDesignation1': None,
-                    'OralCavityDesignation2': None,
-                    'OralCavityDesignation3': None,
-                    'OralCavityDesignation4': None,
-                    'OralCavityDesignation5': None,
-                    'ProsthesisPlacementStatus': None,
-                    'DiagPointer1': service_line.get("diagPointers", [None])[0] if service_line.get("diagPointers") else None,
-                    'DiagPointer2': None,
-                    'DiagPointer3': None,
-                    'DiagPointer4': None,
-                    'EmergencyIndicator': None,
-                    'EPSDTIndicator': None,
-                    'FamilyPlanningIndicator': None,
-                    'CoPayStatus': None,
-                    'DME_Days': None,
-                    'DME_RentalPrice': None,
-                    'DME_PurchasePrice': None,
-                    'DME_FrequencyCode': None,
-                    'ToothNumber': None,
-                    'Surface': None,
-                    'EstimatedPlacementDate': None,
-                    'PriorPlacementDate': None,
-                    'AppliancePlacementDate': None,
-                    'ReplacementDate': None,
-                    'TreatmentStartDate': None,
-                    'TreatmentCompletionDate': None,
-                    'ServiceTax': None,
-                    'FacilityTax': None,
-                    'SalesTax': None,
-                    'Postage': None,
-                    'ApprovedAmount': None,
-                    'LineK3_01': None,
-                    'LineK3_02': None,
-                    'LineK3_03': None,
-                    'LineK3_04': None,
-                    'LineK3_05': None,
-                    'LineK3_06': None,
-                    'LineK3_07': None,
-                    'LineK3_08': None,
-                    'LineK3_09': None,
-                    'LineK3_10': None,
-                    'Remark': None,
-                    'AmbulancePatientCount': None,
-                    'LineID': service_line.get("sourceLineId", ""),
-                    'PredeterminationOfBenefitsID': None,
-                    'POB_OtherPayerID': None,
-                    'PriorAuthNo': None,
-                    'PriorAuthOtherPayerID': None,
-                    'RepricedClaimNo': None,
-                    'AdjustedRepricedClaimNo': None,
-                    'ReferralNo': None,
-                    'ReferralNoOtherPayerID': None,
-                    'RepricedLineNo': None,
-                    'AdjustedRepricedLineNo': None,
-                    'MammographyCertNo': None,
-                    'CLIANo': None,
-                    'CLIAFacilityID': None,
-                    'ImmunizationBatchNo': None,
-                    'ContractType': None,
-                    'CN1_RepricedAmount': None,
-                    'ContractPercentage': None,
-                    'ContractCode': None,
-                    'TermsDiscountPercentage': None,
-                    'ContractVersionID': None,
-                    'ReportType': None,
-                    'ReportTransmission': None,
-                    'AttachmentControlNumber': None,
-                    'ReportType2': None,
-                    'ReportTransmission2': None,
-                    'AttachmentControlNumber2': None,
-                    'ReportType3': None,
-                    'ReportTransmission3': None,
-                    'AttachmentControlNumber3': None,
-                    'RepricingMethodology': None,
-                    'RepricedAmount': None,
-                    'SavingsAmount': None,
-                    'RepricerID': None,
-                    'RepricingRate': None,
-                    'APG_Code': None,
-                    'APG_Amount': None,
-                    'ApprovedRevenueCode': None,
-                    'ApprovedProcedureCodeQual': None,
-                    'ApprovedProcedureCode': None,
-                    'ApprovedUnitCode': None,
-                    'ApprovedUnits': None,
-                    'RejectReason': None,
-                    'ComplianceCode': None,
-                    'ExceptionCode': None
-                }
-                
-                # Add remaining fields with None values
-                detail_remaining_fields = [
-                    'DrugCodeQual', 'DrugCode', 'DrugUnitPrice', 'DrugUnitCode', 'DrugUnits', 'LinkSequenceNumber',
-                    'PrescriptionNumber', 'PatientWeight', 'AmbulanceTransportCode', 'AmbulanceTransportReasonCode',
-                    'TransportDistance', 'RoundTripPurposeDescription', 'StretcherPurposeDescription',
-                    'DMECertificationType', 'DMEDuration', 'AmbulanceConditionIndicator', 'AmbulanceConditionCode1',
-                    'AmbulanceConditionCode2', 'AmbulanceConditionCode3', 'AmbulanceConditionCode4',
-                    'AmbulanceConditionCode5', 'HospiceEmployerCondIndicator', 'HospiceEmployerCondCode',
-                    'DMERCConditionIndicator', 'DMERCConditionCode1', 'DMERCConditionCode2',
-                    'AttendingProviderLast', 'AttendingProviderFirst', 'AttendingProviderMiddle',
-                    'AttendingProviderSuffix', 'AttendingProviderIDQual', 'AttendingProviderID',
-                    'AttendingProviderOtherIDQual', 'AttendingProviderOtherID', 'OperatingProviderLast',
-                    'OperatingProviderFirst', 'OperatingProviderMiddle', 'OperatingProviderSuffix',
-                    'OperatingProviderIDQual', 'OperatingProviderID', 'OperatingProviderOtherIDQual',
-                    'OperatingProviderOtherID', 'OtherProviderLast', 'OtherProviderFirst', 'OtherProviderMiddle',
-                    'OtherProviderSuffix', 'OtherProviderIDQual', 'OtherProviderID', 'OtherProviderOtherIDQual',
-                    'OtherProviderOtherID', 'RenderingProviderLast', 'RenderingProviderFirst',
-                    'RenderingProviderMiddle', 'RenderingProviderSuffix', 'RenderingProviderIDQual',
-                    'RenderingProviderID', 'RenderingProviderOtherIDQual', 'RenderingProviderOtherID',
-                    'RenderingProviderSpecialty', 'PurchasedServiceProviderLast', 'PurchasedServiceProviderFirst',
-                    'PurchasedServiceProviderMiddle', 'PurchasedServiceProviderSuffix',
-                    'PurchasedServiceProviderIDQual', 'PurchasedServiceProviderID',
-                    'PurchasedServiceProviderOtherIDQual', 'PurchasedServiceProviderOtherID',
-                    'PurchasedServiceProviderAmount', 'FacilityName', 'FacilityIDQual', 'FacilityID',
-                    'FacilityAddress1', 'FacilityAddress2', 'FacilityCity', 'FacilityState', 'FacilityZip',
-                    'FacilityOtherIDQual', 'FacilityOtherID', 'SupervisingProviderLast', 'SupervisingProviderFirst',
-                    'SupervisingProviderMiddle', 'SupervisingProviderSuffix', 'SupervisingProviderIDQual',
-                    'SupervisingProviderID', 'SupervisingProviderOtherIDQual', 'SupervisingProviderOtherID',
-                    'OrderingProviderLast', 'OrderingProviderFirst', 'OrderingProviderMiddle',
-                    'OrderingProviderSuffix', 'OrderingProviderIDQual', 'OrderingProviderID',
-                    'OrderingProviderOtherIDQual', 'OrderingProviderOtherID', 'ReferringProviderLast',
-                    'ReferringProviderFirst', 'ReferringProviderMiddle', 'ReferringProviderSuffix',
-                    'ReferringProviderIDQual', 'ReferringProviderID', 'ReferringProviderOtherIDQual',
-                    'ReferringProviderOtherID', 'OtherPayer1ID', 'OtherPayer1Paid', 'OtherPayer1PaidProcedure',
-                    'OtherPayer1PaidRevenueCode', 'OtherPayer1PaidQuantity', 'OtherPayer1BundledLine',
-                    'OtherPayer1AdjustmentReasonGroup1', 'OtherPayer1AdjustmentReason1',
-                    'OtherPayer1AdjustmentAmount1', 'OtherPayer1AdjustmentQuantity1',
-                    'OtherPayer1AdjustmentReasonGroup2', 'OtherPayer1AdjustmentReason2',
-                    'OtherPayer1AdjustmentAmount2', 'OtherPayer1AdjustmentQuantity2',
-                    'OtherPayer1AdjustmentReasonGroup3', 'OtherPayer1AdjustmentReason3',
-                    'OtherPayer1AdjustmentAmount3', 'OtherPayer1AdjustmentQuantity3',
-                    'OtherPayer1AdjustmentReasonGroup4', 'OtherPayer1AdjustmentReason4',
-                    'OtherPayer1AdjustmentAmount4', 'OtherPayer1AdjustmentQuantity4', 'OtherPayer1PaidDate',
-                    'OtherPayer1AmountOwed', 'OtherPayer2ID', 'OtherPayer2Paid', 'OtherPayer2PaidProcedure',
-                    'OtherPayer2PaidRevenueCode', 'OtherPayer2PaidQuantity', 'OtherPayer2BundledLine',
-                    'OtherPayer2AdjustmentReasonGroup1', 'OtherPayer2AdjustmentReason1',
-                    'OtherPayer2AdjustmentAmount1', 'OtherPayer2AdjustmentQuantity1',
-                    'OtherPayer2AdjustmentReasonGroup2', 'OtherPayer2AdjustmentReason2',
-                    'OtherPayer2AdjustmentAmount2', 'OtherPayer2AdjustmentQuantity2',
-                    'OtherPayer2AdjustmentReasonGroup3', 'OtherPayer2AdjustmentReason3',
-                    'OtherPayer2AdjustmentAmount3', 'OtherPayer2AdjustmentQuantity3',
-                    'OtherPayer2AdjustmentReasonGroup4', 'OtherPayer2AdjustmentReason4',
-                    'OtherPayer2AdjustmentAmount4', 'OtherPayer2AdjustmentQuantity4', 'OtherPayer2PaidDate',
-                    'OtherPayer2AmountOwed'
-                ]
-                
-                for field in detail_remaining_fields:
-                    detail_record[field] = None
-                
-                claim_detail_records.append(detail_record)
-                detail_id_counter += 1
-        
-        # Save the three CSV files
-        if claims_records:
-            claims_df = pd.DataFrame(claims_records)
-            claims_df.to_csv('EDI_Claims_Output.csv', index=False, encoding='utf-8')
-            print(f"✅ EDI_Claims_Output.csv saved with {len(claims_records)} records")
-        
-        if claim_detail_records:
-            details_df = pd.DataFrame(claim_detail_records)
-            details_df.to_csv('EDI_ClaimDetail_Output.csv', index=False, encoding='utf-8')
-            print(f"✅ EDI_ClaimDetail_Output.csv saved with {len(claim_detail_records)} records")
-        
-        # Extract unique company setup records from all claims
-        company_setup_records = []
-        unique_companies = {}
-        company_id_counter = 1
-        
-        for claim in all_business_data:
-            transaction = claim.get("transaction", {})
-            sender = transaction.get("sender", {})
-            receiver = transaction.get("receiver", {})
-            billing_provider = claim.get("billingProvider", {})
-            
-            # Create unique key for company (sender + receiver + billing provider)
-            company_key = f"{sender.get('identifier', '')}-{receiver.get('identifier', '')}-{billing_provider.get('identifier', '')}"
-            
-            if company_key not in unique_companies:
-                # Extract company setup data from EDI transaction data
-                company_record = {
-                    'ID': company_id_counter,
-                    'Name': billing_provider.get("lastNameOrOrgName", ""),
-                    'Address1': billing_provider.get("address", {}).get("line", ""),
-                    'Address2': billing_provider.get("address", {}).get("line2", ""),
-                    'City': billing_provider.get("address", {}).get("city", ""),
-                    'State': billing_provider.get("address", {}).get("stateCode", ""),
-                    'Zip': billing_provider.get("address", {}).get("zipCode", ""),
-                    'Zip_4': None,
-                    'SenderID': sender.get("identifier", ""),
-                    'SenderIDQualifier': sender.get("identificationType", ""),
-                    'EdiNo': None,
-                    'EIN': billing_provider.get("taxId", ""),
-                    'FileID': None,
-                    'Contact': sender.get("contacts", [{}])[0].get("name", "") if sender.get("contacts") else "",
-                    'Tel': sender.get("contacts", [{}])[0].get("contactNumbers", [{}])[0].get("number", "") if sender.get("contacts") and sender.get("contacts")[0].get("contactNumbers") else "",
-                    'Ext': None,
-                    'Fax': None,
-                    'Email': None,
-                    'Ack': None,
-                    'TP': None,
-                    'PayorID': None,
-                    'PlanID': None,
-                    'EntityType': billing_provider.get("entityType", ""),
-                    'EDIVersion': transaction.get("implementationConventionReference", ""),
-                    'SourceEntityID': receiver.get("identifier", ""),
-                    'SourceName': receiver.get("lastNameOrOrgName", ""),
-                    'SourceIDQual': receiver.get("identificationType", ""),
-                    'SourceID': receiver.get("identifier", ""),
-                    'InsuranceType': None,
-                    'BankName': None,
-                    'RoutingNo': None,
-                    'AccountNo': None
-                }
-                
-                unique_companies[company_key] = company_record
-                company_setup_records.append(company_record)
-                company_id_counter += 1
-        
-        if company_setup_records:
-            company_df = pd.DataFrame(company_setup_records)
-            company_df.to_csv('COMPANY_SETUP_Output.csv', index=False, encoding='utf-8')
-            print(f"✅ COMPANY_SETUP_Output.csv saved with {len(company_setup_records)} records")
-        else:
-            print("⚠️ No company setup records found")
-        
-    except Exception as e:
-        print(f"Error creating comprehensive CSV exports: {str(e)}")
+    sinks.report()
     
     print(f"\n🎉 EDI 837 business format extraction completed successfully!")
 
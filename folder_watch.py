@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Watch a directory for files that are completely written, with inotify or by polling
+"""
+
+import os
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+
+# inotify_init1 flags and the event masks read from <sys/inotify.h>
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+
+# struct inotify_event: wd, mask, cookie and the length of the name that follows
+EVENT_HEADER = struct.Struct('iIII')
+EVENT_BUFFER_SIZE = 64 * 1024
+
+WATCH_METHODS = ('auto', 'inotify', 'poll')
+
+
+class InotifyEvents:
+    """Names of the files closed after writing in, or moved into, a directory (Linux only)
+
+    Raises OSError where inotify is not available, so callers can fall back to polling.
+    """
+
+    def __init__(self, directory):
+        libc_name = ctypes.util.find_library('c')
+        libc = ctypes.CDLL(libc_name, use_errno=True) if libc_name else None
+        if libc is None or not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available on this platform")
+
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, os.strerror(error), directory)
+
+    def read(self, timeout):
+        """Names written since the last read, waiting up to timeout seconds; None when events were lost"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        try:
+            data = os.read(self._fd, EVENT_BUFFER_SIZE)
+        except BlockingIOError:
+            return set()
+
+        names = set()
+        overflow = False
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+            elif length:
+                names.add(os.fsdecode(data[offset:offset + length].rstrip(b'\0')))
+            offset += length
+
+        return None if overflow else names
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class FolderWatcher:
+    """Report the files of a directory once they are completely written
+
+    With inotify a file is ready when the process writing it closes it or renames it
+    into the directory. Files found by scanning, all of them when polling and those
+    present at start-up otherwise, are ready once their size and mtime have not changed
+    for settle_seconds. A file is reported again only after it changes. method is
+    'inotify', 'poll' or 'auto', which uses inotify where the platform has it; inotify
+    does not see writes made by other hosts to a network mount, poll there. With inotify
+    the directory is still scanned every rescan_seconds in case an event was missed.
+    """
+
+    def __init__(self, directory, extensions, method='auto', poll_seconds=5.0, settle_seconds=2.0, rescan_seconds=300.0):
+        if method not in WATCH_METHODS:
+            raise ValueError(f"Unknown watch method {method!r}, expected one of {WATCH_METHODS}")
+
+        self.directory = directory
+        self.extensions = tuple(extensions)
+        self.poll_seconds = poll_seconds
+        self.settle_seconds = settle_seconds
+        self.rescan_seconds = rescan_seconds
+        self._events = None
+        if method != 'poll':
+            try:
+                self._events = InotifyEvents(directory)
+            except OSError:
+                if method == 'inotify':
+                    raise
+        self.method = 'inotify' if self._events is not None else 'poll'
+
+        # path -> (size, mtime_ns, monotonic seconds since which that stat was seen)
+        self._candidates = {}
+        # path -> (size, mtime_ns) it was last reported with
+        self._reported = {}
+        self._scanned_at = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def wait(self):
+        """Block until files are ready or poll_seconds have passed, returning the ready paths in name order"""
+        rescan = self._scanned_at is None
+        closed = set()
+        if self._events is not None:
+            # files still settling are checked again sooner than poll_seconds
+            timeout = min(self.poll_seconds, self.settle_seconds) if self._candidates else self.poll_seconds
+            names = self._events.read(0 if rescan else timeout)
+            if names is None or (not rescan and time.monotonic() - self._scanned_at >= self.rescan_seconds):
+                rescan = True
+            else:
+                closed = {os.path.join(self.directory, name) for name in names if name.endswith(self.extensions)}
+        elif not rescan:
+            time.sleep(self.poll_seconds)
+            rescan = True
+
+        if rescan:
+            self._scan()
+            self._scanned_at = time.monotonic()
+
+        return self._ready(closed)
+
+    def _scan(self):
+        now = time.monotonic()
+        present = set()
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(self.extensions) or not entry.is_file():
+                    continue
+
+                stat = entry.stat()
+                key = (stat.st_size, stat.st_mtime_ns)
+                present.add(entry.path)
+                candidate = self._candidates.get(entry.path)
+                if self._reported.get(entry.path) != key and (candidate is None or candidate[:2] != key):
+                    self._candidates[entry.path] = (*key, now)
+
+        # forget files that were moved away, a long running watch would otherwise grow without bound
+        self._reported = {path: key for path, key in self._reported.items() if path in present}
+
+    def _ready(self, closed):
+        now = time.monotonic()
+        ready = []
+        for path in closed | set(self._candidates):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self._candidates.pop(path, None)
+                continue
+
+            key = (stat.st_size, stat.st_mtime_ns)
+            if path not in closed:
+                size, mtime_ns, since = self._candidates[path]
+                if (size, mtime_ns) != key:
+                    self._candidates[path] = (*key, now)
+                    continue
+                if now - since < self.settle_seconds:
+                    continue
+
+            if self._reported.get(path) == key:
+                self._candidates.pop(path, None)
+                continue
+
+            self._candidates.pop(path, None)
+            self._reported[path] = key
+            ready.append(path)
+
+        return sorted(ready)
+
+    def close(self):
+        if self._events is not None:
+            self._events.close()
+            self._events = None
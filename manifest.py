@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Persistent processing manifest so unchanged EDI files are not parsed again
+
+The manifest directory holds an index keyed by file path recording each file's size,
+mtime and content hash, and one JSON file of extracted claims per content hash.
+"""
+
+import os
+import json
+import hashlib
+from collections import namedtuple
+
+# Bump when the business format changes so older cached claims are parsed again
+# 2: D8/RD8 dates go through the shared date parsing
+# 3: amounts are formatted by Money
+MANIFEST_VERSION = 3
+
+INDEX_FILENAME = 'manifest.json'
+CLAIMS_DIRECTORY = 'claims'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+FileFingerprint = namedtuple('FileFingerprint', 'path size mtime_ns sha256')
+
+
+def hash_file(file_path):
+    """sha256 of a file's content, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ProcessingManifest:
+    """Cache of extracted claims keyed by path, size, mtime and content hash
+
+    A file whose size and mtime match its entry is trusted without reading it. When
+    either changed the content is hashed, so a file that was only touched or copied
+    still reuses its claims while an edited file is parsed again.
+    """
+
+    def __init__(self, directory, version=MANIFEST_VERSION):
+        self.directory = directory
+        self.version = version
+        self.entries = {}
+        self._claims_directory = os.path.join(directory, CLAIMS_DIRECTORY)
+        self._index_path = os.path.join(directory, INDEX_FILENAME)
+        self._dirty = False
+
+    def load(self):
+        """Read the index, starting empty when it is missing, unreadable or from another version"""
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return self
+
+        if index.get('version') == self.version:
+            self.entries = index.get('files', {})
+        return self
+
+    def lookup(self, file_path):
+        """Return (claims, fingerprint); claims is None when the file has to be parsed"""
+        cached, fingerprint = self.check(file_path)
+        return (self.read_claims(fingerprint) if cached else None), fingerprint
+
+    def check(self, file_path):
+        """Return (cached, fingerprint) without reading the claims; cached is False when the file has to be parsed"""
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            fingerprint = FileFingerprint(path, stat.st_size, stat.st_mtime_ns, entry['sha256'])
+        else:
+            fingerprint = FileFingerprint(path, stat.st_size, stat.st_mtime_ns, hash_file(path))
+
+        if not entry or entry['sha256'] != fingerprint.sha256:
+            return False, fingerprint
+
+        if not os.path.exists(self._claims_path(fingerprint.sha256)):
+            return False, fingerprint
+
+        if entry['size'] != fingerprint.size or entry['mtime_ns'] != fingerprint.mtime_ns:
+            self._set_entry(fingerprint, entry['claims'])
+        return True, fingerprint
+
+    def read_claims(self, fingerprint):
+        """The cached claims of a file check() found cached, None when they can no longer be read"""
+        return self._read_claims(fingerprint.sha256)
+
+    def record(self, fingerprint, claims):
+        """Store the claims extracted from the file the fingerprint was taken of"""
+        os.makedirs(self._claims_directory, exist_ok=True)
+        _write_json(self._claims_path(fingerprint.sha256), claims)
+        self._set_entry(fingerprint, len(claims))
+
+    def save(self):
+        """Write the index, dropping files that no longer exist and claims no file refers to"""
+        self.entries = {path: entry for path, entry in self.entries.items() if os.path.exists(path)}
+
+        if self._dirty:
+            os.makedirs(self.directory, exist_ok=True)
+            _write_json(self._index_path, {'version': self.version, 'files': self.entries})
+            self._dirty = False
+
+        referenced = {entry['sha256'] + '.json' for entry in self.entries.values()}
+        if os.path.isdir(self._claims_directory):
+            for file_name in os.listdir(self._claims_directory):
+                if file_name not in referenced:
+                    os.remove(os.path.join(self._claims_directory, file_name))
+
+    def _set_entry(self, fingerprint, claim_count):
+        self.entries[fingerprint.path] = {
+            'size': fingerprint.size,
+            'mtime_ns': fingerprint.mtime_ns,
+            'sha256': fingerprint.sha256,
+            'claims': claim_count,
+        }
+        self._dirty = True
+
+    def _claims_path(self, sha256):
+        return os.path.join(self._claims_directory, sha256 + '.json')
+
+    def _read_claims(self, sha256):
+        try:
+            with open(self._claims_path(sha256), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+
+def _write_json(path, data):
+    # write to a temporary file first so an interrupted run never leaves a truncated file
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temp_path, path)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Writers for the EDI 837 business format output files
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+
+# file name suffix of each NDJSON compression
+NDJSON_COMPRESSION_SUFFIXES = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+
+class NDJSONWriter:
+    """Write business format claims to a newline delimited JSON file, one claim per line
+
+    Each claim is encoded and written when it is handed over, so a run never holds the
+    whole JSON document in memory. compression is None, 'gzip' or 'zstd' (zstd needs the
+    zstandard package); compact drops the spaces after the JSON separators. With append
+    the claims are added to an existing file, a compressed file then gets another gzip
+    member or zstd frame, which readers decompress as one stream.
+    """
+
+    def __init__(self, path, compression=None, compact=False, append=False):
+        if compression not in NDJSON_COMPRESSION_SUFFIXES:
+            raise ValueError(
+                f"Unknown NDJSON compression {compression!r}, expected one of "
+                f"{sorted(str(c) for c in NDJSON_COMPRESSION_SUFFIXES)}"
+            )
+
+        self.path = path
+        self.records_written = 0
+        self._encoder = json.JSONEncoder(
+            ensure_ascii=False,
+            separators=(',', ':') if compact else (', ', ': '),
+        )
+        self._file = _open_text(path, compression, append)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, record):
+        self._file.write(self._encoder.encode(record))
+        self._file.write('\n')
+        self.records_written += 1
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        self._file.flush()
+
+    def sync(self):
+        """Flush, then have the OS write the file through to disk"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is None:
+            return
+
+        self._file.close()
+        self._file = None
+
+
+class JSONArrayWriter:
+    """Write business format claims to a JSON file holding one array, a claim at a time
+
+    The file reads the same as json.dump of the whole list with indent=2 (or with compact
+    separators), without the list ever being built.
+    """
+
+    def __init__(self, path, compact=False):
+        self.path = path
+        self.compact = compact
+        self.records_written = 0
+        if compact:
+            self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        else:
+            self._encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, record):
+        text = self._encoder.encode(record)
+        if self.compact:
+            self._file.write(',' if self.records_written else '[')
+        else:
+            # nest the claim one level into the array; JSON strings never hold a raw newline
+            self._file.write(',\n  ' if self.records_written else '[\n  ')
+            text = text.replace('\n', '\n  ')
+        self._file.write(text)
+        self.records_written += 1
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        if self._file is None:
+            return
+
+        if not self.records_written:
+            self._file.write('[]')
+        else:
+            self._file.write(']' if self.compact else '\n]')
+        self._file.close()
+        self._file = None
+
+
+class CSVRecordWriter:
+    """Write dict records to a CSV file as they are built
+
+    Each row starts as a copy of a precomputed template of empty cells and only the
+    columns a record fills are set, through a column -> position map built once. Keys
+    that are not columns are dropped and None is written empty, as DataFrame.to_csv does.
+    With append, rows are added to an existing file and the header is only written to a
+    new or empty one.
+    """
+
+    def __init__(self, path, columns, append=False):
+        self.path = path
+        self.rows_written = 0
+        self._positions = {column: position for position, column in enumerate(columns)}
+        self._template = [''] * len(columns)
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file, lineterminator=os.linesep)
+        if self._file.tell() == 0:
+            self._writer.writerow(columns)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, record):
+        row = self._template.copy()
+        positions = self._positions
+        for column, value in record.items():
+            if value is not None and column in positions:
+                row[positions[column]] = value
+        self._writer.writerow(row)
+        self.rows_written += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def sync(self):
+        """Flush, then have the OS write the file through to disk"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is None:
+            return
+
+        self._file.close()
+        self._file = None
+
+
+class ParquetRecordWriter:
+    """Write dict records to a Parquet file one row group at a time
+
+    The schema is fixed by the column layout: integer columns are int64 and every
+    other column is a string. Columns that no record of a row group fills are written
+    as null arrays, so the hundreds of always-empty columns never exist as Python Nones.
+    """
+
+    def __init__(self, path, columns, integer_columns=(), row_group_size=50000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from e
+
+        self._pa = pa
+        self.path = path
+        self.row_group_size = row_group_size
+        self.schema = pa.schema([
+            pa.field(column, pa.int64() if column in integer_columns else pa.string())
+            for column in columns
+        ])
+        self.rows_written = 0
+        self._rows = []
+        self._writer = pq.ParquetWriter(path, self.schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, record):
+        """Buffer a record, writing a row group once row_group_size records are buffered"""
+        self._rows.append(record)
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records as one row group"""
+        if not self._rows:
+            return
+
+        pa = self._pa
+        rows = self._rows
+        filled_columns = set()
+        for row in rows:
+            filled_columns.update(row)
+
+        arrays = []
+        for field in self.schema:
+            if field.name in filled_columns:
+                convert = _to_integer if pa.types.is_integer(field.type) else _to_string
+                arrays.append(pa.array([convert(row.get(field.name)) for row in rows], type=field.type))
+            else:
+                arrays.append(pa.nulls(len(rows), type=field.type))
+
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self.rows_written += len(rows)
+        self._rows = []
+
+    def close(self):
+        if self._writer is None:
+            return
+
+        self.flush()
+        self._writer.close()
+        self._writer = None
+
+
+def _open_text(path, compression, append=False):
+    if compression == 'gzip':
+        return gzip.open(path, 'at' if append else 'wt', encoding='utf-8', newline='')
+
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("zstd compressed NDJSON output requires zstandard: pip install zstandard") from e
+
+        stream = zstandard.ZstdCompressor().stream_writer(open(path, 'ab' if append else 'wb'))
+        return io.TextIOWrapper(stream, encoding='utf-8', newline='')
+
+    return open(path, 'a' if append else 'w', encoding='utf-8', newline='')
+
+
+def _to_string(value):
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def _to_integer(value):
+    if value is None or value == "":
+        return None
+    return int(value)
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Local HTTP/JSON service converting raw X12 837 payloads to business format claims
+
+POST /parse with the X12 as the request body returns the claims convert_to_business_format
+builds, as a JSON array. GET /metrics returns request counts and latencies, GET /health
+the pool's state. Payloads are parsed in a pool of worker processes started, with their
+lookup tables built, before the first request is accepted.
+"""
+
+import os
+import json
+import time
+import signal
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import config
+from extract_edi_837_business_format import format_error, terminate_broken_pool, _init_worker, _process_payload_in_worker
+
+PARSE_SERVICE_HOST = config.PARSE_SERVICE_HOST
+PARSE_SERVICE_PORT = config.PARSE_SERVICE_PORT
+PARSE_SERVICE_WORKERS = config.PARSE_SERVICE_WORKERS
+PARSE_SERVICE_MAX_CONCURRENT = config.PARSE_SERVICE_MAX_CONCURRENT
+PARSE_SERVICE_MAX_BODY_BYTES = config.PARSE_SERVICE_MAX_BODY_BYTES
+
+# Requests whose latencies the metrics percentiles are taken over
+LATENCY_WINDOW = 1024
+DEFAULT_FILE_NAME = 'request.x12'
+DRAIN_CHUNK_SIZE = 64 * 1024
+
+
+def _worker_pid():
+    return os.getpid()
+
+
+class LatencyMetrics:
+    """Request counts per status and the latencies of the last window requests"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.started = time.time()
+        self.requests = 0
+        self.statuses = {}
+        self.in_flight = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def begin(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self, status, seconds):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self._latencies.append(seconds)
+
+    def snapshot(self):
+        """The counters and the mean, percentile and max latencies in milliseconds, as a JSON-ready dict"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            snapshot = {
+                'uptimeSeconds': round(time.time() - self.started, 3),
+                'requests': self.requests,
+                'inFlight': self.in_flight,
+                'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            }
+
+        if latencies:
+            snapshot['latencyMs'] = {
+                'window': len(latencies),
+                'mean': round(sum(latencies) / len(latencies) * 1000, 3),
+                'p50': _percentile_ms(latencies, 0.50),
+                'p95': _percentile_ms(latencies, 0.95),
+                'p99': _percentile_ms(latencies, 0.99),
+                'max': round(latencies[-1] * 1000, 3),
+            }
+        return snapshot
+
+
+def _percentile_ms(latencies, fraction):
+    # nearest rank on the sorted latencies
+    index = min(len(latencies) - 1, max(0, int(round(fraction * len(latencies))) - 1))
+    return round(latencies[index] * 1000, 3)
+
+
+class ParseService:
+    """A warm pool of parser processes behind a limit on the requests parsed at once
+
+    Requests over max_concurrent are turned away instead of queued, so a burst cannot
+    pile up unbounded work and memory. A pool whose worker died is replaced.
+    """
+
+    def __init__(self, workers=None, max_concurrent=8, max_body_bytes=50 * 1024 * 1024):
+        self.workers = workers or os.cpu_count()
+        self.max_concurrent = max_concurrent
+        self.max_body_bytes = max_body_bytes
+        self.metrics = LatencyMetrics()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def start(self):
+        """Start the worker processes and build their lookup tables before requests arrive"""
+        with self._executor_lock:
+            self._executor = self._start_executor()
+        return self
+
+    def _start_executor(self):
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        for future in [executor.submit(_worker_pid) for _ in range(self.workers)]:
+            future.result()
+        return executor
+
+    def try_acquire(self):
+        """Take a slot for a request, False when max_concurrent requests are already being parsed"""
+        return self._slots.acquire(blocking=False)
+
+    def release(self):
+        self._slots.release()
+
+    def parse(self, content, file_name=DEFAULT_FILE_NAME):
+        """Return (claims, error) for the X12 content, like process_edi_file
+
+        Content without an ST transaction set is an error rather than a payload with no
+        claims. Raises BrokenProcessPool when a worker died while parsing it.
+        """
+        executor = self._executor
+        try:
+            future = executor.submit(_process_payload_in_worker, file_name, content)
+        except BrokenProcessPool:
+            # the pool broke before this payload reached it, retry it on a new pool
+            executor = self._replace_executor(executor)
+            future = executor.submit(_process_payload_in_worker, file_name, content)
+
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            # a worker was killed, e.g. by the OOM killer, possibly by this payload
+            self._replace_executor(executor)
+            raise
+
+    def _replace_executor(self, broken):
+        with self._executor_lock:
+            if self._executor is broken:
+                terminate_broken_pool(broken)
+                self._executor = self._start_executor()
+            return self._executor
+
+    def health(self):
+        return {
+            'status': 'ok' if self._executor is not None else 'stopped',
+            'workers': self.workers,
+            'maxConcurrent': self.max_concurrent,
+        }
+
+    def close(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+class ParseRequestHandler(BaseHTTPRequestHandler):
+    """Routes /parse, /metrics and /health to the server's ParseService"""
+
+    server_version = 'EDI837ParseService/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/parse':
+            self._send_json(404, {'error': f"Unknown path {url.path}"})
+            return
+
+        service = self.server.service
+        started = time.perf_counter()
+        service.metrics.begin()
+        status = 500
+        try:
+            status = self._parse(service, url)
+        finally:
+            service.metrics.end(status, time.perf_counter() - started)
+
+    def _parse(self, service, url):
+        length = self._content_length()
+        if length is None:
+            # the end of the body is unknown, so the connection cannot be reused
+            self.close_connection = True
+            return self._send_json(411, {'error': "Content-Length is required"})
+
+        if length > service.max_body_bytes:
+            self.close_connection = True
+            return self._send_json(413, {'error': f"Payload larger than {service.max_body_bytes} bytes"})
+
+        # the slot is taken before the body is read, and a rejected body is discarded in
+        # chunks, so requests over the limit hold no memory
+        if not service.try_acquire():
+            self._drain(length)
+            return self._send_json(503, {'error': "Too many requests being parsed, retry later"}, {'Retry-After': '1'})
+
+        try:
+            content = self.rfile.read(length)
+            file_name = parse_qs(url.query).get('file_name', [DEFAULT_FILE_NAME])[0]
+            claims, error = service.parse(content, os.path.basename(file_name))
+        except BrokenProcessPool:
+            return self._send_json(500, {'error': "Worker process died while parsing"})
+        finally:
+            service.release()
+
+        if error is not None:
+            return self._send_json(422, {'error': format_error(error)})
+        return self._send_json(200, claims)
+
+    def handle_expect_100(self):
+        # clients sending Expect: 100-continue learn about an oversized body before sending it
+        length = self._content_length()
+        if length is not None and length > self.server.service.max_body_bytes:
+            self.close_connection = True
+            self._send_json(413, {'error': f"Payload larger than {self.server.service.max_body_bytes} bytes"})
+            return False
+        return super().handle_expect_100()
+
+    def _content_length(self):
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            return None
+        return length if length >= 0 else None
+
+    def _drain(self, length):
+        while length > 0:
+            chunk = self.rfile.read(min(length, DRAIN_CHUNK_SIZE))
+            if not chunk:
+                break
+            length -= len(chunk)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == '/metrics':
+            self._send_json(200, self.server.service.metrics.snapshot())
+        elif path == '/health':
+            self._send_json(200, self.server.service.health())
+        else:
+            self._send_json(404, {'error': f"Unknown path {path}"})
+
+    def _send_json(self, status, data, headers=None):
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        return status
+
+
+def make_server(service, host='127.0.0.1', port=0):
+    """An HTTP server for the service, handling each connection in a thread; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), ParseRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main():
+    """Serve until interrupted"""
+    service = ParseService(PARSE_SERVICE_WORKERS, PARSE_SERVICE_MAX_CONCURRENT, PARSE_SERVICE_MAX_BODY_BYTES).start()
+    server = make_server(service, PARSE_SERVICE_HOST, PARSE_SERVICE_PORT)
+    host, port = server.server_address[:2]
+    print(f"🚀 Parse service listening on http://{host}:{port} ({service.workers} workers, {service.max_concurrent} concurrent requests)")
+
+    # stop the same way on SIGTERM as on Ctrl+C, shutting the workers down
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+    print("🛑 Parse service stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+asyncio pipeline that reads and processes files in bounded, overlapping stages
+"""
+
+import asyncio
+import queue
+import threading
+
+# Seconds between checks of the stop flag while the consumer is not taking results
+HANDOFF_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+class _Failure:
+    """An error of the pipeline itself, raised to the consumer"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def iter_pipeline(items, read, process, executor, queue_size=4):
+    """Yield (item, result, error) for each item in the order given
+
+    The stages run concurrently and are connected by queues of at most queue_size items:
+    read(item) runs in threads, so reads from slow or network storage overlap each
+    other and the parsing; process(item, data) runs in executor; and the code consuming
+    this generator, typically the output writers, is the last stage. A full queue holds
+    up the stage feeding it, so about three times queue_size items are held however many
+    are given. error is the exception read or process raised, with result None.
+    """
+    handoff = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    pipeline = _run(iter(items), read, process, executor, queue_size, handoff, stop)
+    thread = threading.Thread(target=asyncio.run, args=(pipeline,), name='edi-837-pipeline', daemon=True)
+    thread.start()
+    try:
+        while True:
+            entry = handoff.get()
+            if entry is _DONE:
+                break
+            if isinstance(entry, _Failure):
+                raise entry.error
+            yield entry
+    finally:
+        # also reached when the consumer stops early, the stages then wind down
+        stop.set()
+        thread.join()
+
+
+async def _run(items, read, process, executor, queue_size, handoff, stop):
+    reads = asyncio.Queue(maxsize=queue_size)
+    processed = asyncio.Queue(maxsize=queue_size)
+    stages = [
+        asyncio.create_task(_read_stage(items, read, reads)),
+        asyncio.create_task(_process_stage(reads, process, executor, processed)),
+    ]
+    try:
+        await _handoff_stage(processed, handoff, stop)
+    except Exception as e:
+        await asyncio.to_thread(_put_unless_stopped, handoff, _Failure(e), stop)
+    finally:
+        for stage in stages:
+            stage.cancel()
+        await asyncio.gather(*stages, return_exceptions=True)
+        # results nobody will take any more, so a failed one is not logged as never retrieved
+        while not processed.empty():
+            entry = processed.get_nowait()
+            if isinstance(entry, tuple) and isinstance(entry[1], asyncio.Future):
+                _discard(entry[1])
+
+
+async def _read_stage(items, read, reads):
+    try:
+        for item in items:
+            reading = asyncio.ensure_future(asyncio.to_thread(read, item))
+            await reads.put((item, reading))
+    except Exception as e:
+        await reads.put(_Failure(e))
+        return
+
+    await reads.put(_DONE)
+
+
+async def _process_stage(reads, process, executor, processed):
+    loop = asyncio.get_running_loop()
+    while True:
+        entry = await reads.get()
+        if entry is _DONE or isinstance(entry, _Failure):
+            await processed.put(entry)
+            return
+
+        # reads finish in any order, they are taken in the order the items were given
+        item, reading = entry
+        try:
+            data = await reading
+        except Exception as e:
+            await processed.put((item, e))
+            continue
+
+        try:
+            pending = loop.run_in_executor(executor, process, item, data)
+        except Exception as e:
+            # e.g. BrokenProcessPool once a worker died, raised when submitting rather than
+            # by the future; it ends up as the item's error like any other
+            pending = e
+        await processed.put((item, pending))
+
+
+async def _handoff_stage(processed, handoff, stop):
+    while True:
+        entry = await processed.get()
+        if entry is _DONE or isinstance(entry, _Failure):
+            await asyncio.to_thread(_put_unless_stopped, handoff, entry, stop)
+            return
+
+        item, pending = entry
+        if isinstance(pending, Exception):
+            result, error = None, pending
+        else:
+            try:
+                result, error = await pending, None
+            except Exception as e:
+                result, error = None, e
+
+        if not await asyncio.to_thread(_put_unless_stopped, handoff, (item, result, error), stop):
+            return
+
+
+def _discard(pending):
+    if not pending.cancel() and not pending.cancelled():
+        # already finished
+        pending.exception()
+
+
+def _put_unless_stopped(handoff, entry, stop):
+    while not stop.is_set():
+        try:
+            handoff.put(entry, timeout=HANDOFF_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
@@ -0,0 +1,44 @@
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import iter_pipeline
+
+CRASHING_ITEM = 1
+TIMEOUT_SECONDS = 60
+
+
+def _read(item):
+    return item
+
+
+def _process(item, data):
+    if item == CRASHING_ITEM:
+        # a worker killed mid-file, e.g. by the OOM killer
+        os._exit(1)
+    return data * 10
+
+
+def test_crashing_worker_fails_its_items_instead_of_hanging():
+    results = []
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        consumer = threading.Thread(
+            target=lambda: results.extend(iter_pipeline(range(6), _read, _process, executor, queue_size=2)),
+            daemon=True,
+        )
+        consumer.start()
+        consumer.join(TIMEOUT_SECONDS)
+        assert not consumer.is_alive(), "iter_pipeline hung after a worker died"
+
+    assert [item for item, _, _ in results] == list(range(6))
+    for item, result, error in results:
+        if error is None:
+            assert result == item * 10
+        else:
+            assert result is None
+            assert isinstance(error, BrokenProcessPool)
+    assert isinstance(results[CRASHING_ITEM][2], BrokenProcessPool)
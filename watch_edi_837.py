@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Watch-folder mode: convert EDI 837 files as they land in EDI_DIRECTORY
+
+The parser and its lookup tables are built once and stay in memory, each file is
+processed as soon as it is completely written and its claims are appended to outputs
+that roll over every WATCH_ROLL_FORMAT period. Processed files are checkpointed, so a
+restarted watch picks up where it stopped.
+"""
+
+import os
+import json
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+import config
+from folder_watch import FolderWatcher
+from output_writers import NDJSON_COMPRESSION_SUFFIXES, CSVRecordWriter, NDJSONWriter
+from extract_edi_837_business_format import (
+    EDI837BusinessParser, OutputSinks, process_edi_file, process_edi_file_isolated, terminate_broken_pool, format_error,
+    _init_worker, _process_file_in_worker,
+)
+
+EDI_DIRECTORY = config.EDI_DIRECTORY
+EDI_FILE_EXTENSIONS = config.EDI_FILE_EXTENSIONS
+WORKERS = config.WORKERS
+OUTPUT_FORMAT = config.OUTPUT_FORMAT
+BUSINESS_FORMAT_OUTPUT = config.BUSINESS_FORMAT_OUTPUT
+NDJSON_COMPRESSION = config.NDJSON_COMPRESSION
+COMPACT_JSON = config.COMPACT_JSON
+WATCH_OUTPUT_DIRECTORY = config.WATCH_OUTPUT_DIRECTORY
+WATCH_METHOD = config.WATCH_METHOD
+WATCH_POLL_SECONDS = config.WATCH_POLL_SECONDS
+WATCH_SETTLE_SECONDS = config.WATCH_SETTLE_SECONDS
+WATCH_ROLL_FORMAT = config.WATCH_ROLL_FORMAT
+
+CHECKPOINT_FILENAME = 'watch_checkpoint.jsonl'
+
+
+class WatchCheckpoint:
+    """Files a watch has processed and the ids its outputs continue from
+
+    Each processed file appends one line with its size and mtime, the next claim detail
+    id and the companies it added, so recording a file costs one small write however
+    many were processed before. load() keeps the last line per file, drops files that
+    no longer exist and rewrites the log compacted.
+
+    A file is recorded after its claims are on disk, so a watch stopped by a crash between
+    the two converts the file again on restart and appends its claims a second time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.files = {}
+        self.detail_id = 1
+        self.company_keys = set()
+        self._file = None
+
+    def load(self):
+        """Read the log, starting empty when it is missing, then reopen it compacted for appending"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # the last line of a watch that was killed while writing it
+                        continue
+                    self._apply(entry)
+        except OSError:
+            pass
+
+        self.files = {path: entry for path, entry in self.files.items() if os.path.exists(path)}
+
+        # write to a temporary file first so an interrupted compaction never loses the log
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'detail_id': self.detail_id, 'companies': sorted(self.company_keys)}) + '\n')
+            for path, entry in self.files.items():
+                f.write(json.dumps({'path': path, **entry}) + '\n')
+        os.replace(temp_path, self.path)
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return self
+
+    def is_processed(self, file_path):
+        """True when the file was processed and has not changed since"""
+        entry = self.files.get(os.path.abspath(file_path))
+        if entry is None:
+            return False
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+
+    def record(self, stat, file_path, claims, error, detail_id, company_keys):
+        """Append a processed file with the stat it was read with and the ids after its claims"""
+        entry = {
+            'path': os.path.abspath(file_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'claims': len(claims),
+            'error': None if error is None else format_error(error),
+            'detail_id': detail_id,
+            'companies': sorted(company_keys - self.company_keys),
+        }
+        self._apply(entry)
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _apply(self, entry):
+        self.detail_id = entry.get('detail_id', self.detail_id)
+        self.company_keys.update(entry.get('companies', ()))
+        path = entry.get('path')
+        if path:
+            self.files[path] = {key: entry[key] for key in ('size', 'mtime_ns', 'claims', 'error')}
+
+
+class RollingOutputSinks(OutputSinks):
+    """OutputSinks appending to one set of outputs per period of the roll format
+
+    A file's claims go to the outputs named after the period they are written in, for
+    example EDI_Claims_Output_20250131.csv with the default '%Y%m%d', and outputs of a
+    period that already has files are appended to. Only appendable formats are rolled:
+    the business format is always NDJSON and the records always CSV. Claim detail and
+    company setup ids carry on across periods.
+    """
+
+    def __init__(self, parser, directory, roll_format):
+        super().__init__(parser)
+        self.directory = directory
+        self.roll_format = roll_format
+        self.period = None
+
+    def write_claims(self, claims):
+        period = datetime.now().strftime(self.roll_format)
+        if period != self.period:
+            self.close()
+            self.business_writer = None
+            self.business_failed = False
+            self.record_writers = {}
+            self.records_failed = False
+            self.period = period
+
+        super().write_claims(claims)
+
+    def open_business_writer(self):
+        suffix = NDJSON_COMPRESSION_SUFFIXES.get(NDJSON_COMPRESSION, '')
+        path = os.path.join(self.directory, f"edi_837_business_format_{self.period}.ndjson{suffix}")
+        return NDJSONWriter(path, NDJSON_COMPRESSION, COMPACT_JSON, append=True)
+
+    def open_record_writer(self, name, columns, integer_columns):
+        return CSVRecordWriter(os.path.join(self.directory, f"{name}_{self.period}.csv"), columns, append=True)
+
+    def sync(self):
+        """Write what was written so far through to disk, before the files are checkpointed
+
+        The checkpoint is fsynced, so outputs that were only flushed could be lost to a
+        power loss or host crash while the checkpoint says their file was processed.
+        """
+        writers = [self.business_writer, *self.record_writers.values()]
+        for writer in writers:
+            if writer is not None:
+                writer.sync()
+
+
+class _StopRequested:
+    """Set by SIGTERM, so the watch stops between files instead of in the middle of one"""
+
+    def __init__(self):
+        self.requested = False
+
+    def __call__(self, signum, frame):
+        self.requested = True
+
+
+def iter_watched_files(watcher, checkpoint, stop):
+    """Yield lists of the ready files that were not processed yet, until a stop is requested"""
+    while not stop.requested:
+        ready = [file_path for file_path in watcher.wait() if not checkpoint.is_processed(file_path)]
+        if ready:
+            yield ready
+
+
+def write_file_claims(sinks, checkpoint, stat, file_path, claims, error):
+    """Append a processed file's claims to the outputs and checkpoint it, returning the claims written"""
+    if error is not None:
+        print(f"❌ Error processing {file_path}: {format_error(error)}")
+    elif claims:
+        sinks.write_claims(claims)
+        sinks.sync()
+
+    checkpoint.record(stat, file_path, claims, error, sinks.detail_id, sinks.company_keys)
+    if error is None:
+        print(f"✅ {os.path.basename(file_path)}: {len(claims)} claims")
+    return len(claims)
+
+
+def main():
+    """Watch EDI_DIRECTORY until interrupted"""
+    edi_directory = EDI_DIRECTORY
+    if not edi_directory or not os.path.isdir(edi_directory):
+        print(f"❌ EDI directory not found: {edi_directory}")
+        print("Please update EDI_DIRECTORY in config.py with the directory to watch")
+        return
+
+    if OUTPUT_FORMAT != 'csv' or BUSINESS_FORMAT_OUTPUT != 'ndjson':
+        print("ℹ️ Watch mode appends to rolling CSV and NDJSON outputs, OUTPUT_FORMAT and BUSINESS_FORMAT_OUTPUT are not used")
+
+    os.makedirs(WATCH_OUTPUT_DIRECTORY, exist_ok=True)
+    checkpoint = WatchCheckpoint(os.path.join(WATCH_OUTPUT_DIRECTORY, CHECKPOINT_FILENAME)).load()
+
+    # built once, the lookup tables stay warm for every file the watch converts
+    parser = EDI837BusinessParser()
+    sinks = RollingOutputSinks(parser, WATCH_OUTPUT_DIRECTORY, WATCH_ROLL_FORMAT)
+    sinks.detail_id = checkpoint.detail_id
+    sinks.company_keys = set(checkpoint.company_keys)
+
+    executor = None
+    if WORKERS != 1:
+        executor = ProcessPoolExecutor(max_workers=WORKERS, initializer=_init_worker)
+        print(f"Using {WORKERS or os.cpu_count()} worker processes")
+
+    stop = _StopRequested()
+    signal.signal(signal.SIGTERM, stop)
+
+    watcher = FolderWatcher(edi_directory, EDI_FILE_EXTENSIONS, WATCH_METHOD, WATCH_POLL_SECONDS, WATCH_SETTLE_SECONDS)
+    print(f"👀 Watching {edi_directory} ({watcher.method}), writing to {WATCH_OUTPUT_DIRECTORY}")
+    print(f"✅ {len(checkpoint.files)} files already processed")
+
+    total_files = 0
+    total_claims = 0
+    try:
+        for edi_files in iter_watched_files(watcher, checkpoint, stop):
+            # the stat the checkpoint records is the one taken before the file is read
+            stats = {}
+            for file_path in edi_files:
+                try:
+                    stats[file_path] = os.stat(file_path)
+                except OSError:
+                    continue
+            edi_files = [file_path for file_path in edi_files if file_path in stats]
+
+            remaining = edi_files
+            while remaining and not stop.requested:
+                if executor is not None:
+                    results = executor.map(_process_file_in_worker, remaining)
+                else:
+                    results = (process_edi_file(parser, file_path) for file_path in remaining)
+
+                done = 0
+                try:
+                    for file_path, (claims, error) in zip(remaining, results):
+                        total_claims += write_file_claims(sinks, checkpoint, stats[file_path], file_path, claims, error)
+                        total_files += 1
+                        done += 1
+                        if stop.requested:
+                            break
+                except BrokenProcessPool:
+                    # a worker died (e.g. killed for memory); the file whose result was due is
+                    # parsed again on its own and the rest of the batch goes to a new pool
+                    terminate_broken_pool(executor)
+                    file_path = remaining[done]
+                    claims, error = process_edi_file_isolated(file_path)
+                    total_claims += write_file_claims(sinks, checkpoint, stats[file_path], file_path, claims, error)
+                    total_files += 1
+                    done += 1
+                    executor = ProcessPoolExecutor(max_workers=WORKERS, initializer=_init_worker)
+                remaining = remaining[done:]
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sinks.close()
+        checkpoint.close()
+        watcher.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    print(f"\n🛑 Watch stopped after {total_files} files, {total_claims} claims")
+
+
+if __name__ == "__main__":
+    main()